@@ -0,0 +1,30 @@
+"""
+Refresh the account_access territory closure.
+
+Runs by itself once a sync of accounts, users or roles commits
+(apps/accounts/signals.py). Run it by hand to rebuild, or after changing
+those tables outside the sync:
+
+    python manage.py refresh_account_access
+    python manage.py refresh_account_access --full
+"""
+from django.core.management.base import BaseCommand
+
+from apps.accounts.services import AccountAccessService
+
+
+class Command(BaseCommand):
+    help = 'Update account_access (user -> accessible accounts) from ownership and the role hierarchy'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--full',
+            action='store_true',
+            help='Rebuild every row instead of only those touched since the last refresh',
+        )
+
+    def handle(self, *args, **options):
+        stats = AccountAccessService.refresh(full=options['full'])
+        self.stdout.write(self.style.SUCCESS(
+            ', '.join(f'{key}={value}' for key, value in stats.items())
+        ))
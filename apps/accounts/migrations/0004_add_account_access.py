@@ -0,0 +1,31 @@
+# Generated by Django 6.0.2 on 2026-10-19 03:57
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_remove_accountplan_and_update_models'),
+        ('users', '0005_add_user_role_parent'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AccountAccess',
+            fields=[
+                ('aa_id', models.BigAutoField(db_column='aa_id', primary_key=True, serialize=False, verbose_name='ID')),
+                ('aa_depth', models.SmallIntegerField(db_column='aa_depth', verbose_name='Role Levels Above Owner')),
+                ('aa_account_id', models.ForeignKey(db_column='aa_account_id', db_constraint=False, db_index=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='access', to='accounts.account', verbose_name='Account')),
+                ('aa_user_id', models.ForeignKey(db_column='aa_user_id', db_constraint=False, db_index=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='account_access', to='users.user', verbose_name='User')),
+            ],
+            options={
+                'verbose_name': 'Account Access',
+                'verbose_name_plural': 'Account Access',
+                'db_table': 'account_access',
+                'indexes': [models.Index(fields=['aa_account_id'], name='idx_account_access_account')],
+                'constraints': [models.UniqueConstraint(fields=('aa_user_id', 'aa_account_id'), name='uq_account_access_user_account')],
+            },
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 6.0.2 on 2026-10-19 04:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_add_account_access'),
+        ('users', '0006_add_keyset_pagination_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='account',
+            index=models.Index(fields=['acc_name', 'acc_sf_id'], name='idx_accounts_name_id'),
+        ),
+        migrations.AddIndex(
+            model_name='account',
+            index=models.Index(fields=['acc_owner_id', 'acc_name', 'acc_sf_id'], name='idx_accounts_owner_name'),
+        ),
+    ]
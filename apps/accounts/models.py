@@ -91,12 +91,72 @@ class Account(models.Model):
         indexes = [
             models.Index(fields=['acc_owner_id'], name='idx_accounts_owner'),
             models.Index(fields=['acc_active'], name='idx_accounts_active'),
+            models.Index(fields=['acc_name', 'acc_sf_id'], name='idx_accounts_name_id'),
+            models.Index(fields=['acc_owner_id', 'acc_name', 'acc_sf_id'], name='idx_accounts_owner_name'),
         ]
 
     def __str__(self):
         return self.acc_name
 
 
+class AccountAccess(models.Model):
+    """
+    Territory closure - every account a user can see.
+
+    One row per (user, account): the owner at depth 0 plus each active user
+    in a role above the owner's role, at the number of role levels between
+    them. Maintained by AccountAccessService.refresh(); rows are derived
+    data, so there are no FK constraints to block sync deletes.
+    """
+    aa_id = models.BigAutoField(
+        primary_key=True,
+        db_column='aa_id',
+        verbose_name='ID'
+    )
+    aa_user_id = models.ForeignKey(
+        'users.User',
+        to_field='usr_sf_id',
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        db_index=False,
+        db_column='aa_user_id',
+        related_name='account_access',
+        verbose_name='User'
+    )
+    aa_account_id = models.ForeignKey(
+        'accounts.Account',
+        to_field='acc_sf_id',
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        db_index=False,
+        db_column='aa_account_id',
+        related_name='access',
+        verbose_name='Account'
+    )
+    aa_depth = models.SmallIntegerField(
+        db_column='aa_depth',
+        verbose_name='Role Levels Above Owner'
+    )
+
+    class Meta:
+        db_table = 'account_access'
+        verbose_name = 'Account Access'
+        verbose_name_plural = 'Account Access'
+        constraints = [
+            # Also the index for "accounts of user X" joins
+            models.UniqueConstraint(
+                fields=['aa_user_id', 'aa_account_id'],
+                name='uq_account_access_user_account'
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['aa_account_id'], name='idx_account_access_account'),
+        ]
+
+    def __str__(self):
+        return f"{self.aa_user_id_id} -> {self.aa_account_id_id}"
+
+
 
 
 
@@ -3,10 +3,11 @@ Account API serializers.
 """
 from rest_framework import serializers
 
+from core.api.serializers import CompiledSerializer, SparseFieldsetMixin
 from .models import Account
 
 
-class AccountListSerializer(serializers.ModelSerializer):
+class AccountListSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Account in list responses."""
     id = serializers.CharField(source='acc_sf_id', read_only=True)
     name = serializers.CharField(source='acc_name', read_only=True)
@@ -28,3 +29,11 @@ class AccountListSerializer(serializers.ModelSerializer):
     def get_owner_id(self, obj):
         # Access the raw FK value without triggering object load
         return getattr(obj, 'acc_owner_id_id', None)
+
+
+# Fast path for list endpoints: AccountListSerializer compiled to a
+# values_list() row -> item function, without building model instances
+ACCOUNT_LIST_COMPILED = CompiledSerializer(
+    AccountListSerializer,
+    columns={'owner_id': 'acc_owner_id'},
+)
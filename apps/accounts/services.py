@@ -0,0 +1,318 @@
+"""
+Account Service Layer.
+"""
+from datetime import date, timedelta
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from apps.campaigns.services import get_account_campaigns
+from apps.cases.services import get_case_summary
+from apps.products.models import ArfRollingForecast
+from apps.products.rfc_services import default_month_range, get_rfc_by_month
+from apps.products.services import ProductPerformanceService, get_quarterly_performance
+from apps.sync.models import SyncLog
+from .models import AccountAccess
+from core.services.concurrent_sections import run_sections
+
+# Sections of the account overview, in response order
+OVERVIEW_SECTIONS = ('achievement', 'deviation', 'cases', 'campaigns', 'rfc')
+
+
+def _forecast_product_ids(account_id: str, from_date: date, to_date: date) -> List[str]:
+    """Products with an active rolling forecast for the account in the range."""
+    return list(
+        ArfRollingForecast.objects.filter(
+            arf_account_id=account_id,
+            arf_forecast_date__range=[from_date, to_date],
+            arf_active=1,
+        )
+        .order_by('arf_product_id')
+        .values_list('arf_product_id', flat=True)
+        .distinct()
+    )
+
+
+class AccountOverviewService:
+    """Service for the combined account 360 overview."""
+
+    @staticmethod
+    def get_overview(
+        account_id: str,
+        sections: Sequence[str],
+        year: int,
+        from_date: str,
+        to_date: str,
+        rfc_from: Optional[date] = None,
+        rfc_to: Optional[date] = None,
+        product_ids: Optional[List[str]] = None,
+        timeout: Optional[float] = None,
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Run the requested overview sections concurrently.
+
+        Each section calls the same service function as its standalone
+        endpoint, in a pool thread with its own DB connection.
+
+        Args:
+            account_id: Salesforce Account ID
+            sections: Names from OVERVIEW_SECTIONS to compute
+            year: Year for quarterly achievement
+            from_date: Deviation range start (YYYY-MM-DD)
+            to_date: Deviation range end (YYYY-MM-DD)
+            rfc_from: RFC range start; with rfc_to, defaults to the RFC
+                endpoint's window (this month through the same month next year)
+            rfc_to: RFC range end
+            product_ids: RFC products; defaults to products forecast in the range
+            timeout: Seconds to wait for all sections (default
+                settings.ACCOUNT_OVERVIEW_TIMEOUT)
+
+        Returns:
+            Section name -> {"status", "data", "duration_ms"}
+        """
+        if rfc_from is None or rfc_to is None:
+            rfc_from, rfc_to = default_month_range()
+
+        def rfc():
+            ids = product_ids or _forecast_product_ids(account_id, rfc_from, rfc_to)
+            return get_rfc_by_month(account_id, ids, rfc_from, rfc_to)
+
+        available: Dict[str, Callable[[], Any]] = {
+            'achievement': lambda: get_quarterly_performance(account_id, year),
+            'deviation': lambda: ProductPerformanceService.get_product_performance(
+                from_date, to_date, account_id
+            ),
+            'cases': lambda: get_case_summary(account_id),
+            'campaigns': lambda: get_account_campaigns(account_id),
+            'rfc': rfc,
+        }
+        if timeout is None:
+            timeout = settings.ACCOUNT_OVERVIEW_TIMEOUT
+        return run_sections(
+            {name: available[name] for name in OVERVIEW_SECTIONS if name in sections},
+            timeout=timeout,
+        )
+
+
+# Every (role, ancestor role) pair of the active role tree with the number of
+# levels between them; the path array stops the walk on cyclic parent links
+ROLE_ANCESTORS_CTE = """
+WITH RECURSIVE role_ancestors AS (
+    SELECT
+        r.ur_sf_id AS role_id,
+        r.ur_parent_role_id AS ancestor_role_id,
+        1 AS depth,
+        ARRAY[r.ur_sf_id]::varchar[] AS path
+    FROM
+        user_roles r
+    WHERE
+        r.ur_active = 1
+        AND r.ur_parent_role_id IS NOT NULL
+        AND r.ur_parent_role_id <> r.ur_sf_id
+    UNION ALL
+    SELECT
+        ra.role_id,
+        p.ur_parent_role_id,
+        ra.depth + 1,
+        ra.path || p.ur_sf_id::varchar
+    FROM
+        role_ancestors ra
+    INNER JOIN
+        user_roles p ON p.ur_sf_id = ra.ancestor_role_id
+    WHERE
+        p.ur_active = 1
+        AND p.ur_parent_role_id IS NOT NULL
+        AND NOT p.ur_parent_role_id = ANY(ra.path || p.ur_sf_id::varchar)
+)
+"""
+
+# Re-read rows changed shortly before the previous refresh started, so sync
+# transactions that committed after that refresh's snapshot are not missed
+ACCESS_REFRESH_OVERLAP = timedelta(minutes=10)
+
+ACCESS_REFRESH_JOB = 'account_access_refresh'
+
+
+def accessible_account_ids(user_id: str):
+    """
+    Subquery of the accounts ``user_id`` can see (owned or below their role).
+
+    For permission filtering, e.g. ``Case.objects.filter(
+    cs_account_id__in=accessible_account_ids(user_id))``; resolves to one
+    index range scan on uq_account_access_user_account.
+    """
+    return AccountAccess.objects.filter(aa_user_id=user_id).values('aa_account_id')
+
+
+class AccountAccessService:
+    """Service maintaining the account_access territory closure."""
+
+    @staticmethod
+    def _insert_rows(
+        cursor,
+        account_ids: Optional[List[str]] = None,
+        viewer_ids: Optional[List[str]] = None,
+    ) -> int:
+        """
+        Insert closure rows, limited to ``account_ids`` and/or to hierarchy
+        rows of ``viewer_ids`` (owner rows are skipped when viewers are given).
+        Existing (user, account) pairs are left as they are.
+        """
+        account_filter = 'a.acc_sf_id = ANY(%(account_ids)s)' if account_ids is not None else 'TRUE'
+        viewer_filter = 'u.usr_sf_id = ANY(%(viewer_ids)s)' if viewer_ids is not None else 'TRUE'
+        owner_rows = '' if viewer_ids is not None else f"""
+            SELECT
+                a.acc_owner_id,
+                a.acc_sf_id,
+                0
+            FROM
+                accounts a
+            WHERE
+                {account_filter}
+            UNION ALL
+        """
+        query = f"""
+        {ROLE_ANCESTORS_CTE}
+        INSERT INTO account_access (aa_user_id, aa_account_id, aa_depth)
+        {owner_rows}
+        SELECT
+            u.usr_sf_id,
+            a.acc_sf_id,
+            ra.depth
+        FROM
+            accounts a
+        INNER JOIN
+            users o ON o.usr_sf_id = a.acc_owner_id
+        INNER JOIN
+            role_ancestors ra ON ra.role_id = o.usr_user_role_id
+        INNER JOIN
+            users u ON u.usr_user_role_id = ra.ancestor_role_id
+        WHERE
+            {account_filter}
+            AND {viewer_filter}
+            AND u.usr_is_active
+            AND u.usr_active = 1
+        ON CONFLICT (aa_user_id, aa_account_id) DO NOTHING
+        """
+        cursor.execute(query, {'account_ids': account_ids, 'viewer_ids': viewer_ids})
+        return cursor.rowcount
+
+    @staticmethod
+    def refresh(full: bool = False) -> Dict[str, Any]:
+        """
+        Bring account_access up to date with ownership and the role tree.
+
+        Run after each Salesforce sync. Incremental by default, using the
+        *_updated_at columns since the last successful refresh:
+
+        - changed accounts (and accounts of changed users) get all their
+          rows recomputed, so ownership moves are picked up;
+        - changed users get their hierarchy rows recomputed, so role moves
+          and deactivations are picked up;
+        - any role change, or no previous refresh, triggers a full rebuild.
+
+        Runs in one transaction, so readers never see a half-built closure.
+        Each run is recorded in sync_log (job "account_access_refresh").
+
+        Args:
+            full: Rebuild every row regardless of what changed
+
+        Returns:
+            Dictionary with mode ("full" or "incremental") and row counts
+        """
+        last_run = (
+            SyncLog.objects.filter(sl_job_name=ACCESS_REFRESH_JOB, sl_status='success')
+            .order_by('-sl_started_at')
+            .values_list('sl_hwm_after', flat=True)
+            .first()
+        )
+        log = SyncLog.objects.create(
+            sl_job_name=ACCESS_REFRESH_JOB,
+            sl_direction='internal',
+            sl_object_name='account_access',
+            sl_hwm_before=last_run,
+        )
+        try:
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.execute('SELECT now()')
+                started = cursor.fetchone()[0]
+                since = last_run - ACCESS_REFRESH_OVERLAP if last_run else None
+
+                if not full and since is not None:
+                    cursor.execute(
+                        'SELECT EXISTS (SELECT 1 FROM user_roles WHERE ur_updated_at >= %s)',
+                        [since],
+                    )
+                    full = cursor.fetchone()[0]
+                else:
+                    full = True
+
+                if full:
+                    cursor.execute('DELETE FROM account_access')
+                    deleted = cursor.rowcount
+                    inserted = AccountAccessService._insert_rows(cursor)
+                    stats = {'mode': 'full', 'deleted': deleted, 'inserted': inserted}
+                else:
+                    stats = AccountAccessService._refresh_changed(cursor, since)
+        except Exception as e:
+            log.sl_status = 'failed'
+            log.sl_error_message = str(e)
+            log.sl_completed_at = timezone.now()
+            log.save()
+            raise
+
+        log.sl_status = 'success'
+        log.sl_hwm_after = started
+        log.sl_records_inserted = stats['inserted']
+        log.sl_records_deleted = stats['deleted']
+        log.sl_completed_at = timezone.now()
+        log.save()
+        return stats
+
+    @staticmethod
+    def _refresh_changed(cursor, since) -> Dict[str, Any]:
+        """Recompute rows touched by accounts and users changed since ``since``."""
+        cursor.execute('SELECT usr_sf_id FROM users WHERE usr_updated_at >= %s', [since])
+        user_ids = [row[0] for row in cursor.fetchall()]
+        cursor.execute(
+            """
+            SELECT acc_sf_id FROM accounts
+            WHERE acc_updated_at >= %s OR acc_owner_id = ANY(%s)
+            """,
+            [since, user_ids],
+        )
+        account_ids = [row[0] for row in cursor.fetchall()]
+
+        # Accounts or users removed by the sync
+        cursor.execute(
+            """
+            DELETE FROM account_access aa
+            WHERE NOT EXISTS (SELECT 1 FROM accounts a WHERE a.acc_sf_id = aa.aa_account_id)
+               OR NOT EXISTS (SELECT 1 FROM users u WHERE u.usr_sf_id = aa.aa_user_id)
+            """
+        )
+        deleted = cursor.rowcount
+        cursor.execute(
+            """
+            DELETE FROM account_access
+            WHERE aa_account_id = ANY(%s)
+               OR (aa_user_id = ANY(%s) AND aa_depth > 0)
+            """,
+            [account_ids, user_ids],
+        )
+        deleted += cursor.rowcount
+
+        inserted = 0
+        if account_ids:
+            inserted += AccountAccessService._insert_rows(cursor, account_ids=account_ids)
+        if user_ids:
+            inserted += AccountAccessService._insert_rows(cursor, viewer_ids=user_ids)
+        return {
+            'mode': 'incremental',
+            'deleted': deleted,
+            'inserted': inserted,
+            'changed_accounts': len(account_ids),
+            'changed_users': len(user_ids),
+        }
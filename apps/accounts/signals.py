@@ -0,0 +1,40 @@
+"""
+Account signal handlers.
+"""
+import logging
+
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from apps.sync.models import SyncLog
+from .services import AccountAccessService
+
+logger = logging.getLogger(__name__)
+
+# Salesforce objects whose sync changes account_access
+ACCESS_SOURCE_OBJECTS = frozenset({'Account', 'User', 'UserRole'})
+
+# sync_log statuses of a finished sync run that wrote rows
+SYNC_FINISHED_STATUSES = frozenset({'success', 'partial'})
+
+
+def _refresh_account_access():
+    stats = AccountAccessService.refresh()
+    logger.info(f'account_access refreshed after sync: {stats}')
+
+
+@receiver(post_save, sender=SyncLog)
+def refresh_access_after_sync(sender, instance: SyncLog, **kwargs):
+    """
+    Refresh account_access (incrementally) once a sync of accounts, users
+    or roles has committed.
+
+    A failed refresh is logged and recorded in sync_log; it does not fail
+    the sync, and the next refresh picks up its changes.
+    """
+    if (
+        instance.sl_sf_object_api in ACCESS_SOURCE_OBJECTS
+        and instance.sl_status in SYNC_FINISHED_STATUSES
+    ):
+        transaction.on_commit(_refresh_account_access, robust=True)
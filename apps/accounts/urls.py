@@ -10,4 +10,5 @@ app_name = 'accounts'
 urlpatterns = [
     path('', views.AccountListAPIView.as_view(), name='list'),
     path('user/<str:user_id>/', views.AccountsByUserAPIView.as_view(), name='by-user'),
+    path('<str:account_id>/overview/', views.AccountOverviewAPIView.as_view(), name='overview'),
 ]
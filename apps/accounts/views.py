@@ -1,16 +1,70 @@
 """
 Account API views.
 """
+from datetime import date
+
 from drf_spectacular.utils import OpenApiParameter, extend_schema
 from rest_framework.permissions import AllowAny
 from rest_framework.views import APIView
 
 from core.api.responses import APIResponse, ErrorResponse
-from core.api.utils.pagination import StandardPagination
-from core.api.constants import ErrorMessages, SuccessMessages, ErrorCodes, FieldNames
+from core.api.serializers import requested_fields
+from core.api.utils.pagination import CursorPagination, StandardPagination, is_cursor_requested
+from core.api.utils.streaming import is_stream_requested
+from core.api.constants import (
+    ErrorMessages, SuccessMessages, ErrorCodes, FieldNames, ValidationConstants
+)
+from core.db import read_only_requests
+from core.services.concurrent_sections import SECTION_OK
+from apps.products.services import ProductPerformanceService
 
 from .models import Account
-from .serializers import AccountListSerializer
+from .serializers import ACCOUNT_LIST_COMPILED, AccountListSerializer
+from .services import OVERVIEW_SECTIONS, AccountOverviewService, accessible_account_ids
+
+# scope values of GET /api/accounts/user/{user_id}/
+ACCOUNT_SCOPES = ('owned', 'territory')
+
+# Keyset ordering of the account lists in cursor mode (acc_name is not unique)
+ACCOUNT_CURSOR_ORDERING = ('acc_name', 'acc_sf_id')
+
+
+def _account_list_response(request, qs, cursor_ordering):
+    """Cursor page, numbered page, stream or full list of accounts, by query params."""
+    # Sparse fieldset: only the requested keys are built and their columns selected
+    compiled = ACCOUNT_LIST_COMPILED.project(requested_fields(request, AccountListSerializer))
+
+    # Cursor pagination: keyset on cursor_ordering, no COUNT(*) or OFFSET
+    if is_cursor_requested(request):
+        paginator = CursorPagination(ordering=cursor_ordering)
+        rows = compiled.values(qs, *paginator.columns)
+        page = paginator.paginate_queryset(rows, request)
+        return paginator.get_paginated_response(compiled.serialize(page))
+
+    qs = qs.order_by(*cursor_ordering)
+
+    # Check if pagination parameters are provided
+    page_param = request.query_params.get('page')
+    page_size_param = request.query_params.get('page_size')
+
+    # If either pagination parameter is provided, use pagination
+    if page_param is not None or page_size_param is not None:
+        paginator = StandardPagination()
+        page = paginator.paginate_queryset(compiled.values(qs), request)
+        return paginator.get_paginated_response(compiled.serialize(page))
+
+    # Streaming mode: rows written as they are fetched
+    if is_stream_requested(request):
+        return APIResponse.streamed(
+            compiled.iter(qs),
+            message=SuccessMessages.DATA_RETRIEVED
+        )
+
+    # Otherwise, return all data without pagination
+    return APIResponse.success(
+        data=compiled.data(qs),
+        message=SuccessMessages.DATA_RETRIEVED
+    )
 
 
 @extend_schema(
@@ -29,33 +83,41 @@ from .serializers import AccountListSerializer
             description='Page size (max 100, if provided, enables pagination)',
             required=False,
         ),
+        OpenApiParameter(
+            name='cursor',
+            type=str,
+            location=OpenApiParameter.QUERY,
+            description=(
+                'Opaque cursor from meta.pagination (empty for the first page); '
+                'enables cursor pagination instead of page numbers'
+            ),
+            required=False,
+        ),
+        OpenApiParameter(
+            name='fields',
+            type=str,
+            location=OpenApiParameter.QUERY,
+            description='Comma-separated fields to return, e.g. id,name (default: all)',
+            required=False,
+        ),
+        OpenApiParameter(
+            name='stream',
+            type=bool,
+            location=OpenApiParameter.QUERY,
+            description='Stream the unpaginated list with constant memory (ignored when paginating)',
+            required=False,
+        ),
     ],
 )
+@read_only_requests
 class AccountListAPIView(APIView):
-    """GET /api/accounts/ - list all accounts (paginated if page/page_size provided)."""
+    """GET /api/accounts/ - list all accounts (paginated if cursor or page/page_size provided)."""
     permission_classes = [AllowAny]
+    query_budget = 3
+    cursor_ordering = ACCOUNT_CURSOR_ORDERING
 
     def get(self, request):
-        qs = Account.objects.all()
-        qs = qs.order_by('acc_name')
-
-        # Check if pagination parameters are provided
-        page_param = request.query_params.get('page')
-        page_size_param = request.query_params.get('page_size')
-
-        # If either pagination parameter is provided, use pagination
-        if page_param is not None or page_size_param is not None:
-            paginator = StandardPagination()
-            page = paginator.paginate_queryset(qs, request)
-            serializer = AccountListSerializer(page, many=True)
-            return paginator.get_paginated_response(serializer.data)
-        
-        # Otherwise, return all data without pagination
-        serializer = AccountListSerializer(qs, many=True)
-        return APIResponse.success(
-            data=serializer.data,
-            message=SuccessMessages.DATA_RETRIEVED
-        )
+        return _account_list_response(request, Account.objects.all(), self.cursor_ordering)
 
 
 @extend_schema(
@@ -74,11 +136,48 @@ class AccountListAPIView(APIView):
             description='Page size (max 100, if provided, enables pagination)',
             required=False,
         ),
+        OpenApiParameter(
+            name='cursor',
+            type=str,
+            location=OpenApiParameter.QUERY,
+            description=(
+                'Opaque cursor from meta.pagination (empty for the first page); '
+                'enables cursor pagination instead of page numbers'
+            ),
+            required=False,
+        ),
+        OpenApiParameter(
+            name='fields',
+            type=str,
+            location=OpenApiParameter.QUERY,
+            description='Comma-separated fields to return, e.g. id,name (default: all)',
+            required=False,
+        ),
+        OpenApiParameter(
+            name='stream',
+            type=bool,
+            location=OpenApiParameter.QUERY,
+            description='Stream the unpaginated list with constant memory (ignored when paginating)',
+            required=False,
+        ),
+        OpenApiParameter(
+            name='scope',
+            type=str,
+            location=OpenApiParameter.QUERY,
+            description=(
+                'owned (default): accounts the user owns; territory: also accounts '
+                'owned by users in roles below the user\'s role'
+            ),
+            required=False,
+        ),
     ],
 )
+@read_only_requests
 class AccountsByUserAPIView(APIView):
-    """GET /api/accounts/user/{user_id}/ - list accounts by user (paginated if page/page_size provided)."""
+    """GET /api/accounts/user/{user_id}/ - list accounts by user (paginated if cursor or page/page_size provided)."""
     permission_classes = [AllowAny]
+    query_budget = 3
+    cursor_ordering = ACCOUNT_CURSOR_ORDERING
 
     def get(self, request, user_id):
         # Validate user_id is provided
@@ -91,23 +190,162 @@ class AccountsByUserAPIView(APIView):
 
         user_id = user_id.strip()
 
-        qs = Account.objects.filter(acc_owner_id=user_id)
-        qs = qs.order_by('acc_name')
-
-        # Check if pagination parameters are provided
-        page_param = request.query_params.get('page')
-        page_size_param = request.query_params.get('page_size')
-
-        # If either pagination parameter is provided, use pagination
-        if page_param is not None or page_size_param is not None:
-            paginator = StandardPagination()
-            page = paginator.paginate_queryset(qs, request)
-            serializer = AccountListSerializer(page, many=True)
-            return paginator.get_paginated_response(serializer.data)
-        
-        # Otherwise, return all data without pagination
-        serializer = AccountListSerializer(qs, many=True)
-        return APIResponse.success(
-            data=serializer.data,
-            message=SuccessMessages.DATA_RETRIEVED
+        scope = request.query_params.get('scope', 'owned').strip().lower()
+        if scope not in ACCOUNT_SCOPES:
+            return ErrorResponse.validation_error(
+                message=ErrorMessages.INVALID_QUERY_PARAMS,
+                errors=[{
+                    "field": FieldNames.SCOPE,
+                    "message": ErrorMessages.INVALID_SCOPE.format(allowed=', '.join(ACCOUNT_SCOPES)),
+                }],
+            )
+
+        if scope == 'territory':
+            # Single join against the account_access closure
+            qs = Account.objects.filter(acc_sf_id__in=accessible_account_ids(user_id))
+        else:
+            qs = Account.objects.filter(acc_owner_id=user_id)
+        return _account_list_response(request, qs, self.cursor_ordering)
+
+
+@extend_schema(
+    parameters=[
+        OpenApiParameter(
+            name='include',
+            type=str,
+            location=OpenApiParameter.QUERY,
+            description=(
+                'Comma-separated sections: achievement, deviation, cases, campaigns, rfc '
+                '(default: all)'
+            ),
+            required=False,
+        ),
+        OpenApiParameter(
+            name='year',
+            type=int,
+            location=OpenApiParameter.QUERY,
+            description='Year for quarterly achievement (default: current year)',
+            required=False,
+        ),
+        OpenApiParameter(
+            name='from',
+            type=str,
+            location=OpenApiParameter.QUERY,
+            description='Deviation start month YYYY-MM (default: January of the current year)',
+            required=False,
+        ),
+        OpenApiParameter(
+            name='to',
+            type=str,
+            location=OpenApiParameter.QUERY,
+            description='Deviation end month YYYY-MM (default: current month)',
+            required=False,
+        ),
+        OpenApiParameter(
+            name='product_ids',
+            type=str,
+            location=OpenApiParameter.QUERY,
+            description='Comma-separated RFC products (default: products forecast for the account)',
+            required=False,
+        ),
+    ],
+)
+@read_only_requests
+class AccountOverviewAPIView(APIView):
+    """
+    GET /api/accounts/{account_id}/overview/ - account 360 landing payload.
+
+    Runs the achievement, deviation, case summary, campaigns and RFC services
+    concurrently and returns them in one response. meta.sections reports each
+    section's status and duration; sections that fail or miss the deadline
+    come back as null with the rest of the payload.
+    """
+    permission_classes = [AllowAny]
+    query_budget = 1
+
+    def get(self, request, account_id):
+        params = request.query_params
+        today = date.today()
+
+        include_param = params.get('include')
+        if include_param is None:
+            sections = list(OVERVIEW_SECTIONS)
+        else:
+            sections = [part.strip().lower() for part in include_param.split(',') if part.strip()]
+            if set(sections) - set(OVERVIEW_SECTIONS):
+                return ErrorResponse.validation_error(
+                    message=ErrorMessages.INVALID_QUERY_PARAMS,
+                    errors=[{
+                        "field": FieldNames.INCLUDE,
+                        "message": ErrorMessages.INVALID_INCLUDE.format(allowed=', '.join(OVERVIEW_SECTIONS)),
+                    }],
+                )
+
+        year_param = params.get('year')
+        try:
+            year = int(year_param) if year_param else today.year
+        except (ValueError, TypeError):
+            return ErrorResponse.validation_error(
+                message=ErrorMessages.INVALID_QUERY_PARAMS,
+                errors=[{"field": FieldNames.YEAR, "message": ErrorMessages.YEAR_INVALID_FORMAT}],
+            )
+        if year < ValidationConstants.MIN_YEAR or year > ValidationConstants.MAX_YEAR:
+            return ErrorResponse.validation_error(
+                message=ErrorMessages.INVALID_QUERY_PARAMS,
+                errors=[{"field": FieldNames.YEAR, "message": ErrorMessages.YEAR_OUT_OF_RANGE}],
+            )
+
+        from_month = (params.get('from') or f'{today.year}-01').strip()
+        to_month = (params.get('to') or f'{today.year}-{today.month:02d}').strip()
+        try:
+            from_date, to_date = ProductPerformanceService.parse_month_range(from_month, to_month)
+        except ValueError:
+            return ErrorResponse.validation_error(
+                message=ErrorMessages.INVALID_DATE_FORMAT,
+                errors=[{"field": FieldNames.FROM_TO, "message": ErrorMessages.MONTH_FORMAT_INVALID}],
+            )
+        if from_date > to_date:
+            return ErrorResponse.validation_error(
+                message=ErrorMessages.INVALID_DATE_RANGE,
+                errors=[{"field": FieldNames.TO, "message": ErrorMessages.END_MONTH_BEFORE_START}],
+            )
+        product_ids = [
+            p.strip() for p in (params.get('product_ids') or '').split(',') if p.strip()
+        ]
+
+        # Fetched here so a missing account is a 404 rather than empty sections
+        account = ACCOUNT_LIST_COMPILED.values(Account.objects.filter(acc_sf_id=account_id)).first()
+        if account is None:
+            return ErrorResponse.not_found(message=ErrorMessages.ACCOUNT_NOT_FOUND)
+
+        results = AccountOverviewService.get_overview(
+            account_id=account_id,
+            sections=sections,
+            year=year,
+            from_date=from_date,
+            to_date=to_date,
+            product_ids=product_ids,
+        )
+
+        data = {'account': ACCOUNT_LIST_COMPILED.to_item(account)}
+        section_meta = {}
+        for name, result in results.items():
+            data[name] = result['data']
+            section_meta[name] = {
+                'status': result['status'],
+                'duration_ms': result['duration_ms'],
+            }
+        partial = any(result['status'] != SECTION_OK for result in results.values())
+
+        response = APIResponse.success(
+            data=data,
+            message=(
+                SuccessMessages.ACCOUNT_OVERVIEW_PARTIAL if partial
+                else SuccessMessages.ACCOUNT_OVERVIEW_RETRIEVED
+            ),
+            meta={'sections': section_meta, 'partial': partial},
+        )
+        response['Server-Timing'] = ', '.join(
+            f"{name};dur={meta['duration_ms']}" for name, meta in section_meta.items()
         )
+        return response
@@ -0,0 +1,18 @@
+# Generated by Django 6.0.2 on 2026-10-19 03:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('campaigns', '0005_remove_task_extra_fields'),
+        ('users', '0004_update_models_align_with_ddl'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['tsk_what_id', 'tsk_activity_date', 'tsk_subject', 'tsk_sf_id'], name='idx_tasks_campaign_activity'),
+        ),
+    ]
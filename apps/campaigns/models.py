@@ -264,6 +264,11 @@ class Task(models.Model):
             models.Index(fields=['tsk_owner_id'], name='idx_tasks_owner'),
             models.Index(fields=['tsk_status'], name='idx_tasks_status'),
             models.Index(fields=['tsk_what_id'], name='idx_tasks_campaign'),
+            # Per-campaign task ordering (embedded first N tasks, task list pages)
+            models.Index(
+                fields=['tsk_what_id', 'tsk_activity_date', 'tsk_subject', 'tsk_sf_id'],
+                name='idx_tasks_campaign_activity',
+            ),
         ]
 
     def __str__(self):
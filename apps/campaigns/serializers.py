@@ -3,6 +3,7 @@ Campaign & Task API serializers.
 """
 from rest_framework import serializers
 
+from core.api.serializers import CompiledSerializer, SparseFieldsetMixin
 from .models import Campaign, Task
 
 
@@ -39,7 +40,7 @@ class TaskListSerializer(serializers.ModelSerializer):
         return getattr(obj, 'tsk_owner_id_id', None)
 
 
-class CampaignWithTasksSerializer(serializers.ModelSerializer):
+class CampaignWithTasksSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Campaign representation including mapped tasks."""
 
     id = serializers.CharField(source="cmp_sf_id", read_only=True)
@@ -58,6 +59,7 @@ class CampaignWithTasksSerializer(serializers.ModelSerializer):
     account_id = serializers.SerializerMethodField()
     is_active = serializers.BooleanField(source="cmp_is_active", read_only=True)
     tasks = serializers.SerializerMethodField()
+    task_counts = serializers.SerializerMethodField()
 
     class Meta:
         model = Campaign
@@ -72,6 +74,7 @@ class CampaignWithTasksSerializer(serializers.ModelSerializer):
             "account_id",
             "is_active",
             "tasks",
+            "task_counts",
         ]
 
     def get_owner_id(self, obj):
@@ -94,3 +97,26 @@ class CampaignWithTasksSerializer(serializers.ModelSerializer):
         serializer = TaskListSerializer(campaign_tasks, many=True)
         return serializer.data
 
+    def get_task_counts(self, obj):
+        """
+        Return task totals and per-status counts for this campaign.
+
+        Counts cover every matching task, also when ``tasks`` is truncated by
+        ``tasks_limit``; the view provides them as ``task_counts`` in context.
+        """
+        task_counts = self.context.get("task_counts", {})
+        return task_counts.get(obj.cmp_sf_id, {"total": 0, "by_status": {}})
+
+
+# Fast path for list endpoints: serializers compiled to values_list() row ->
+# item functions, without building model instances. Campaign items take their
+# already-mapped tasks and task counts as arguments.
+TASK_LIST_COMPILED = CompiledSerializer(
+    TaskListSerializer,
+    columns={"owner_id": "tsk_owner_id"},
+)
+CAMPAIGN_WITH_TASKS_COMPILED = CompiledSerializer(
+    CampaignWithTasksSerializer,
+    columns={"owner_id": "cmp_owner_id", "account_id": "cmp_account_id"},
+    context_fields=("tasks", "task_counts"),
+)
@@ -0,0 +1,255 @@
+"""
+Campaign Service Layer.
+"""
+from typing import Dict, List, Optional
+
+from django.db import connections
+from django.db.models import Count
+
+from core.db_router import read_alias
+
+from .models import Campaign, Task
+from .serializers import CAMPAIGN_WITH_TASKS_COMPILED
+
+# Figures rolled up from every campaign in a subtree
+ROLLUP_FIELDS = (
+    'budgeted_cost',
+    'actual_cost',
+    'available_budget',
+    'used_quantity',
+)
+
+
+def task_counts_by_campaign(tasks_qs) -> Dict[str, Dict]:
+    """
+    Task totals and per-status counts for each campaign.
+
+    One grouped query over ``tasks_qs`` (GROUP BY tsk_what_id, tsk_status).
+    """
+    rows = (
+        tasks_qs.order_by()
+        .values('tsk_what_id', 'tsk_status')
+        .annotate(count=Count('*'))
+    )
+    counts: Dict[str, Dict] = {}
+    for row in rows:
+        entry = counts.setdefault(row['tsk_what_id'], {'total': 0, 'by_status': {}})
+        entry['total'] += row['count']
+        entry['by_status'][row['tsk_status']] = row['count']
+    return counts
+
+
+def get_account_campaigns(account_id: str) -> List[Dict]:
+    """
+    Active campaigns of an account with task counts and no embedded tasks.
+
+    Same items as GET /api/campaigns/?tasks_limit=0, in two queries.
+    """
+    campaigns = list(CAMPAIGN_WITH_TASKS_COMPILED.values(
+        Campaign.objects.filter(cmp_account_id=account_id, cmp_active=1).order_by('cmp_name')
+    ))
+    id_index = CAMPAIGN_WITH_TASKS_COMPILED.index('cmp_sf_id')
+    task_counts = task_counts_by_campaign(
+        Task.objects.filter(
+            tsk_what_id__in=[row[id_index] for row in campaigns],
+            tsk_active=1,
+        )
+    )
+    to_item = CAMPAIGN_WITH_TASKS_COMPILED.to_item
+    return [
+        to_item(row, [], task_counts.get(row[id_index]) or {'total': 0, 'by_status': {}})
+        for row in campaigns
+    ]
+
+
+class CampaignHierarchyService:
+    """Service for campaign parent/child trees."""
+
+    @staticmethod
+    def get_hierarchy(
+        campaign_id: Optional[str] = None,
+        account_id: Optional[str] = None,
+    ) -> List[Dict]:
+        """
+        Get campaign trees with budgets and task counts rolled up per subtree.
+
+        Trees start at ``campaign_id``, or at every root campaign of
+        ``account_id`` (no active parent). A single recursive CTE walks
+        cmp_parent_id at any depth; rollups are computed in SQL by expanding each campaign's
+        ancestor path, so the query cost grows with nodes x depth rather than
+        with request round trips. Cycles in the parent links are cut.
+
+        Args:
+            campaign_id: Root campaign Salesforce ID
+            account_id: Salesforce Account ID whose root campaigns to return
+
+        Returns:
+            List of root nodes; each node has ``children`` nested recursively.
+            Empty when the campaign does not exist or is inactive.
+        """
+        if campaign_id:
+            root_filter = "c.cmp_sf_id = %s"
+            params = [campaign_id]
+        else:
+            root_filter = """
+                c.cmp_account_id = %s
+                AND NOT EXISTS (
+                    SELECT 1 FROM campaigns p
+                    WHERE p.cmp_sf_id = c.cmp_parent_id
+                      AND p.cmp_active = 1
+                )
+            """
+            params = [account_id]
+
+        query = f"""
+        WITH RECURSIVE tree AS (
+            SELECT
+                c.cmp_sf_id,
+                c.cmp_parent_id,
+                0 AS depth,
+                ARRAY[c.cmp_sf_id]::varchar[] AS path
+            FROM
+                campaigns c
+            WHERE
+                c.cmp_active = 1
+                AND {root_filter}
+            UNION ALL
+            SELECT
+                c.cmp_sf_id,
+                c.cmp_parent_id,
+                t.depth + 1,
+                t.path || c.cmp_sf_id::varchar
+            FROM
+                campaigns c
+            INNER JOIN
+                tree t ON c.cmp_parent_id = t.cmp_sf_id
+            WHERE
+                c.cmp_active = 1
+                AND NOT c.cmp_sf_id = ANY(t.path)
+        ),
+        task_counts AS (
+            SELECT
+                tk.tsk_what_id,
+                COUNT(*) AS task_count,
+                COUNT(*) FILTER (
+                    WHERE tk.tsk_status ILIKE '%%Completed%%' OR tk.tsk_status ILIKE '%%Closed%%'
+                ) AS completed_task_count
+            FROM
+                tasks tk
+            WHERE
+                tk.tsk_what_id IN (SELECT cmp_sf_id FROM tree)
+                AND tk.tsk_active = 1
+            GROUP BY
+                tk.tsk_what_id
+        ),
+        nodes AS (
+            SELECT
+                t.cmp_sf_id,
+                t.cmp_parent_id,
+                t.depth,
+                t.path,
+                c.cmp_name,
+                c.cmp_status,
+                c.cmp_type,
+                c.cmp_start_date,
+                c.cmp_end_date,
+                c.cmp_account_id,
+                c.cmp_budgeted_cost AS budgeted_cost,
+                c.cmp_actual_cost AS actual_cost,
+                c.cmp_available_budget AS available_budget,
+                c.cmp_used_quantity AS used_quantity,
+                COALESCE(tc.task_count, 0) AS task_count,
+                COALESCE(tc.completed_task_count, 0) AS completed_task_count
+            FROM
+                tree t
+            INNER JOIN
+                campaigns c ON c.cmp_sf_id = t.cmp_sf_id
+            LEFT JOIN
+                task_counts tc ON tc.tsk_what_id = t.cmp_sf_id
+        ),
+        rollups AS (
+            SELECT
+                a.ancestor_id,
+                COUNT(*) - 1 AS descendant_count,
+                COALESCE(SUM(a.budgeted_cost), 0) AS rollup_budgeted_cost,
+                COALESCE(SUM(a.actual_cost), 0) AS rollup_actual_cost,
+                COALESCE(SUM(a.available_budget), 0) AS rollup_available_budget,
+                COALESCE(SUM(a.used_quantity), 0) AS rollup_used_quantity,
+                SUM(a.task_count) AS rollup_task_count,
+                SUM(a.completed_task_count) AS rollup_completed_task_count
+            FROM (
+                SELECT
+                    UNNEST(n.path) AS ancestor_id,
+                    n.budgeted_cost,
+                    n.actual_cost,
+                    n.available_budget,
+                    n.used_quantity,
+                    n.task_count,
+                    n.completed_task_count
+                FROM
+                    nodes n
+            ) a
+            GROUP BY
+                a.ancestor_id
+        )
+        SELECT
+            n.*,
+            r.descendant_count,
+            r.rollup_budgeted_cost,
+            r.rollup_actual_cost,
+            r.rollup_available_budget,
+            r.rollup_used_quantity,
+            r.rollup_task_count,
+            r.rollup_completed_task_count
+        FROM
+            nodes n
+        INNER JOIN
+            rollups r ON r.ancestor_id = n.cmp_sf_id
+        ORDER BY
+            n.depth,
+            n.cmp_name,
+            n.cmp_sf_id
+        """
+
+        with connections[read_alias()].cursor() as cursor:
+            cursor.execute(query, params)
+            columns = [col[0] for col in cursor.description]
+            results = [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+        return CampaignHierarchyService._build_tree(results)
+
+    @staticmethod
+    def _build_tree(rows: List[Dict]) -> List[Dict]:
+        """Nest flat hierarchy rows (ordered by depth) under their parents."""
+        nodes: Dict[str, Dict] = {}
+        roots: List[Dict] = []
+        for row in rows:
+            node = {
+                'id': row['cmp_sf_id'],
+                'parent_id': row['cmp_parent_id'],
+                'name': row['cmp_name'],
+                'status': row['cmp_status'],
+                'type': row['cmp_type'],
+                'start_date': row['cmp_start_date'],
+                'end_date': row['cmp_end_date'],
+                'account_id': row['cmp_account_id'],
+                'depth': row['depth'],
+                'task_count': row['task_count'],
+                'completed_task_count': row['completed_task_count'],
+                'rollup': {
+                    'descendant_count': row['descendant_count'],
+                    'task_count': int(row['rollup_task_count']),
+                    'completed_task_count': int(row['rollup_completed_task_count']),
+                },
+                'children': [],
+            }
+            for field in ROLLUP_FIELDS:
+                node[field] = float(row[field]) if row[field] is not None else None
+                node['rollup'][field] = float(row[f'rollup_{field}'])
+            nodes[node['id']] = node
+            parent = nodes.get(row['cmp_parent_id']) if row['depth'] else None
+            if parent is not None:
+                parent['children'].append(node)
+            else:
+                roots.append(node)
+        return roots
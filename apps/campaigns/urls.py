@@ -18,5 +18,10 @@ urlpatterns = [
         views.TaskListByCampaignAPIView.as_view(),
         name="tasks-by-campaign",
     ),
+    path(
+        "hierarchy/",
+        views.CampaignHierarchyAPIView.as_view(),
+        name="hierarchy",
+    ),
 ]
 
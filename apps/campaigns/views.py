@@ -4,18 +4,120 @@ Campaign & Task API views.
 from datetime import datetime, timedelta
 from typing import Dict, List
 
-from django.db.models import Q
+from django.db.models import F, Q, Window
+from django.db.models.functions import RowNumber
 from drf_spectacular.utils import OpenApiParameter, OpenApiTypes, extend_schema
 from rest_framework.permissions import AllowAny
 from rest_framework.views import APIView
 
-from core.api.responses import ErrorResponse
+from core.api.responses import APIResponse, ErrorResponse
+from core.api.serializers import requested_fields
 from core.api.utils.pagination import StandardPagination
+from core.api.utils.streaming import STREAM_CHUNK_SIZE, batched, is_stream_requested
+from core.db import read_only_requests
+from core.db_router import replica_reads
 
 from .models import Campaign, Task
-from .serializers import CampaignWithTasksSerializer, TaskListSerializer
+from .serializers import (
+    CAMPAIGN_WITH_TASKS_COMPILED,
+    TASK_LIST_COMPILED,
+    CampaignWithTasksSerializer,
+    TaskListSerializer,
+)
+from .services import CampaignHierarchyService, task_counts_by_campaign
+
+# Order of tasks within a campaign; tsk_sf_id keeps pages stable on ties
+TASK_ORDERING = ("tsk_activity_date", "tsk_subject", "tsk_sf_id")
+MAX_TASKS_LIMIT = 100
+# Campaigns whose tasks are fetched together in streaming mode
+CAMPAIGN_STREAM_BATCH = 100
+
+
+def _first_tasks(tasks_qs, limit: int):
+    """
+    First ``limit`` tasks (in TASK_ORDERING) of each campaign.
+
+    ROW_NUMBER() partitioned by campaign, filtered in SQL, so at most
+    ``limit`` rows per campaign leave the database.
+    """
+    return (
+        tasks_qs.annotate(
+            row_number=Window(
+                RowNumber(),
+                partition_by=[F("tsk_what_id")],
+                order_by=list(TASK_ORDERING),
+            )
+        )
+        .filter(row_number__lte=limit)
+        .order_by("tsk_what_id", "row_number")
+    )
+
+
+def _embedded_tasks(tasks_qs, tasks_limit):
+    """Tasks to embed per ``tasks_limit`` (None = all, 0 = none), ordered per campaign."""
+    if tasks_limit is None:
+        return tasks_qs.order_by(*TASK_ORDERING)
+    if tasks_limit == 0:
+        return tasks_qs.none()
+    return _first_tasks(tasks_qs, tasks_limit)
+
+
+def _campaign_rows(compiled, campaigns_qs):
+    """``compiled`` rows of ``campaigns_qs``, with cmp_sf_id selected to map tasks."""
+    return compiled.values(campaigns_qs, "cmp_sf_id")
+
+
+def _campaign_items(compiled, campaign_rows, tasks_qs, tasks_limit) -> List[Dict]:
+    """
+    Campaign items (with tasks and task_counts) for fetched campaign rows.
 
+    ``campaign_rows`` come from ``_campaign_rows(compiled, ...)``, where
+    ``compiled`` is CAMPAIGN_WITH_TASKS_COMPILED or a sparse projection of it.
+    Tasks and per-status counts are fetched in one query each, and only
+    when the fieldset includes them.
+    """
+    campaign_index = compiled.index("cmp_sf_id", "cmp_sf_id")
+    campaign_ids = [row[campaign_index] for row in campaign_rows]
+    campaign_tasks = tasks_qs.filter(tsk_what_id__in=campaign_ids)
+
+    task_counts = {}
+    if compiled.fields is None or "task_counts" in compiled.fields:
+        task_counts = task_counts_by_campaign(campaign_tasks)
+
+    tasks_by_campaign: Dict[str, List[Dict]] = {}
+    if compiled.fields is None or "tasks" in compiled.fields:
+        what_index = TASK_LIST_COMPILED.index("tsk_what_id")
+        to_task = TASK_LIST_COMPILED.to_item
+        task_rows = TASK_LIST_COMPILED.values(_embedded_tasks(campaign_tasks, tasks_limit))
+        for task in task_rows.iterator(chunk_size=STREAM_CHUNK_SIZE):
+            tasks_by_campaign.setdefault(task[what_index], []).append(to_task(task))
+
+    to_item = compiled.to_item
+    return [
+        to_item(
+            row,
+            tasks_by_campaign.get(campaign_id, []),
+            task_counts.get(campaign_id) or {"total": 0, "by_status": {}},
+        )
+        for row, campaign_id in zip(campaign_rows, campaign_ids)
+    ]
+
+
+def _iter_campaigns_with_tasks(compiled, campaigns_qs, tasks_qs, tasks_limit):
+    """
+    Yield campaign items (with tasks and task_counts) for streaming mode.
+
+    Campaign rows come from a server-side cursor; tasks and counts are
+    fetched per CAMPAIGN_STREAM_BATCH campaigns, so memory is bounded by one
+    batch rather than the whole account.
+    """
+    rows = _campaign_rows(compiled, campaigns_qs).iterator(chunk_size=STREAM_CHUNK_SIZE)
+    for batch in batched(rows, CAMPAIGN_STREAM_BATCH):
+        yield from _campaign_items(compiled, batch, tasks_qs, tasks_limit)
 
+
+@replica_reads
+@read_only_requests
 class CampaignListWithTasksAPIView(APIView):
     """
     GET /api/campaigns/ - list campaigns with tasks.
@@ -26,9 +128,13 @@ class CampaignListWithTasksAPIView(APIView):
     - type (optional): "all" | "my"
         * all (default): campaigns for the account with all tasks mapped
         * my: campaigns for the account with only tasks assigned to that user
+    - tasks_limit (optional): embed only the first N tasks per campaign
+      (0-100); without it every task is embedded
+    - stream (optional): "true" streams the unpaginated list
     """
 
     permission_classes = [AllowAny]
+    query_budget = 5
 
     @extend_schema(
         tags=["Campaigns"],
@@ -41,8 +147,12 @@ class CampaignListWithTasksAPIView(APIView):
             "- overdue: Campaigns with end_date < today\n"
             "- next_month: Campaigns with end_date in the next 30 days\n"
             "- closed: Campaigns with status containing 'Completed' or 'Closed'\n\n"
+            "Each campaign carries task_counts (total and by status). Use tasks_limit "
+            "to embed only the first N tasks per campaign and page through the rest "
+            "with /api/campaigns/tasks/.\n\n"
             "Pagination is optional. If page or page_size parameters are provided, "
-            "the response will be paginated. Otherwise, all data is returned."
+            "the response will be paginated. Otherwise, all data is returned; "
+            "stream=true writes it incrementally with constant memory."
         ),
         parameters=[
             OpenApiParameter(
@@ -76,6 +186,30 @@ class CampaignListWithTasksAPIView(APIView):
                 required=False,
                 description="Campaign filter: 'overdue', 'next_month', or 'closed'",
             ),
+            OpenApiParameter(
+                name="tasks_limit",
+                type=OpenApiTypes.INT,
+                location=OpenApiParameter.QUERY,
+                required=False,
+                description=(
+                    "Embed only the first N tasks per campaign (0-100). "
+                    "Omit to embed all tasks."
+                ),
+            ),
+            OpenApiParameter(
+                name="fields",
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                required=False,
+                description="Comma-separated fields to return, e.g. id,name,status (default: all)",
+            ),
+            OpenApiParameter(
+                name="stream",
+                type=OpenApiTypes.BOOL,
+                location=OpenApiParameter.QUERY,
+                required=False,
+                description="Stream the unpaginated list (ignored when paginating)",
+            ),
             OpenApiParameter(
                 name='page',
                 type=int,
@@ -98,6 +232,7 @@ class CampaignListWithTasksAPIView(APIView):
         user_id = (request.query_params.get("user_id") or "").strip()
         type_param = (request.query_params.get("type") or "all").strip().lower()
         filter_param = (request.query_params.get("filter") or "").strip().lower()
+        tasks_limit_param = (request.query_params.get("tasks_limit") or "").strip()
 
         errors: List[Dict] = []
 
@@ -133,12 +268,31 @@ class CampaignListWithTasksAPIView(APIView):
                 }
             )
 
+        tasks_limit = None
+        if tasks_limit_param:
+            try:
+                tasks_limit = int(tasks_limit_param)
+            except ValueError:
+                tasks_limit = -1
+            if not 0 <= tasks_limit <= MAX_TASKS_LIMIT:
+                errors.append(
+                    {
+                        "field": "tasks_limit",
+                        "message": f"tasks_limit must be an integer between 0 and {MAX_TASKS_LIMIT}",
+                    }
+                )
+
         if errors:
             return ErrorResponse.validation_error(
                 message="Invalid query parameters",
                 errors=errors,
             )
 
+        # Sparse fieldset: tasks/task_counts are only queried when requested
+        compiled = CAMPAIGN_WITH_TASKS_COMPILED.project(
+            requested_fields(request, CampaignWithTasksSerializer)
+        )
+
         campaigns_qs = Campaign.objects.filter(
             cmp_account_id=account_id,
             cmp_active=1,
@@ -171,52 +325,36 @@ class CampaignListWithTasksAPIView(APIView):
         page_param = request.query_params.get('page')
         page_size_param = request.query_params.get('page_size')
 
-        # If either pagination parameter is provided, use pagination
-        if page_param is not None or page_size_param is not None:
-            paginator = StandardPagination()
-            page = paginator.paginate_queryset(campaigns_qs, request)
-            campaign_ids = [campaign.cmp_sf_id for campaign in page]
-        else:
-            # Return all data without pagination
-            page = list(campaigns_qs)
-            campaign_ids = [campaign.cmp_sf_id for campaign in page]
-
-        tasks_qs = Task.objects.filter(
-            tsk_what_id__in=campaign_ids,
-            tsk_active=1,
-        )
+        tasks_qs = Task.objects.filter(tsk_active=1)
 
         if type_param == "my":
             tasks_qs = tasks_qs.filter(tsk_owner_id=user_id)
 
-        tasks_by_campaign: Dict[str, List[Task]] = {}
-        for task in tasks_qs:
-            cid = task.tsk_what_id
-            if cid:
-                tasks_by_campaign.setdefault(cid, []).append(task)
-
-        serializer_context = {
-            "request": request,
-            "tasks_by_campaign": tasks_by_campaign,
-        }
-
-        serializer = CampaignWithTasksSerializer(
-            page,
-            many=True,
-            context=serializer_context,
-        )
-        
-        # Return paginated or non-paginated response
+        # If either pagination parameter is provided, use pagination
         if page_param is not None or page_size_param is not None:
-            return paginator.get_paginated_response(serializer.data)
-        else:
-            from core.api.responses import APIResponse
-            return APIResponse.success(
-                data=serializer.data,
+            paginator = StandardPagination()
+            page = paginator.paginate_queryset(_campaign_rows(compiled, campaigns_qs), request)
+            return paginator.get_paginated_response(
+                _campaign_items(compiled, page, tasks_qs, tasks_limit)
+            )
+
+        # Streaming mode: constant memory for very large lists
+        if is_stream_requested(request):
+            return APIResponse.streamed(
+                _iter_campaigns_with_tasks(compiled, campaigns_qs, tasks_qs, tasks_limit),
                 message='Data retrieved successfully'
             )
 
+        # Return all data without pagination
+        campaign_rows = list(_campaign_rows(compiled, campaigns_qs))
+        return APIResponse.success(
+            data=_campaign_items(compiled, campaign_rows, tasks_qs, tasks_limit),
+            message='Data retrieved successfully'
+        )
+
 
+@replica_reads
+@read_only_requests
 class TaskListByCampaignAPIView(APIView):
     """
     GET /api/campaigns/tasks/ - list tasks filtered by campaign.
@@ -226,6 +364,7 @@ class TaskListByCampaignAPIView(APIView):
     """
 
     permission_classes = [AllowAny]
+    query_budget = 3
 
     @extend_schema(
         tags=["Campaigns"],
@@ -277,7 +416,7 @@ class TaskListByCampaignAPIView(APIView):
         tasks_qs = Task.objects.filter(
             tsk_what_id=campaign_id,
             tsk_active=1,
-        ).order_by("tsk_activity_date", "tsk_subject")
+        ).order_by(*TASK_ORDERING)
 
         # Check if pagination parameters are provided
         page_param = request.query_params.get('page')
@@ -286,15 +425,81 @@ class TaskListByCampaignAPIView(APIView):
         # If either pagination parameter is provided, use pagination
         if page_param is not None or page_size_param is not None:
             paginator = StandardPagination()
-            page = paginator.paginate_queryset(tasks_qs, request)
-            serializer = TaskListSerializer(page, many=True, context={"request": request})
-            return paginator.get_paginated_response(serializer.data)
+            page = paginator.paginate_queryset(TASK_LIST_COMPILED.values(tasks_qs), request)
+            return paginator.get_paginated_response(TASK_LIST_COMPILED.serialize(page))
         
         # Otherwise, return all data without pagination
-        serializer = TaskListSerializer(tasks_qs, many=True, context={"request": request})
-        from core.api.responses import APIResponse
         return APIResponse.success(
-            data=serializer.data,
+            data=TASK_LIST_COMPILED.data(tasks_qs),
             message='Data retrieved successfully'
         )
 
+
+@replica_reads
+@read_only_requests
+class CampaignHierarchyAPIView(APIView):
+    """
+    GET /api/campaigns/hierarchy/ - campaign tree with rolled-up budgets.
+
+    Query parameters (one of):
+    - campaign_id: Salesforce Campaign ID of the tree root (cmp_sf_id)
+    - account_id: Salesforce Account ID; returns every root campaign of the account
+    """
+
+    permission_classes = [AllowAny]
+    query_budget = 1
+
+    @extend_schema(
+        tags=["Campaigns"],
+        summary="Campaign hierarchy with rollups",
+        description=(
+            "Returns the campaign tree below a campaign (or every root campaign of "
+            "an account) with children nested at any depth.\n\n"
+            "Each node carries its own budget figures and task counts plus a "
+            "`rollup` object summing budgeted_cost, actual_cost, available_budget, "
+            "used_quantity and task counts over the node and all its descendants. "
+            "The whole tree is computed in one recursive query."
+        ),
+        parameters=[
+            OpenApiParameter(
+                name="campaign_id",
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                required=False,
+                description="Root campaign Salesforce ID (cmp_sf_id). Required unless account_id is given.",
+            ),
+            OpenApiParameter(
+                name="account_id",
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                required=False,
+                description="Salesforce Account ID; returns all root campaigns of the account.",
+            ),
+        ],
+    )
+    def get(self, request):
+        campaign_id = (request.query_params.get("campaign_id") or "").strip()
+        account_id = (request.query_params.get("account_id") or "").strip()
+
+        if bool(campaign_id) == bool(account_id):
+            return ErrorResponse.validation_error(
+                message="Invalid query parameters",
+                errors=[
+                    {
+                        "field": "campaign_id",
+                        "message": "Provide exactly one of campaign_id or account_id",
+                    }
+                ],
+            )
+
+        trees = CampaignHierarchyService.get_hierarchy(
+            campaign_id=campaign_id or None,
+            account_id=account_id or None,
+        )
+        if campaign_id and not trees:
+            return ErrorResponse.resource_not_found("Campaign", campaign_id)
+
+        return APIResponse.success(
+            data=trees,
+            message='Data retrieved successfully'
+        )
@@ -0,0 +1,31 @@
+# Generated by Django 6.0.2 on 2026-10-19 03:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_remove_accountplan_and_update_models'),
+        ('cases', '0003_update_models_align_with_ddl'),
+        ('users', '0004_update_models_align_with_ddl'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='case',
+            index=models.Index(fields=['cs_sf_created_date', 'cs_sf_id'], name='idx_cases_created_id'),
+        ),
+        migrations.AddIndex(
+            model_name='case',
+            index=models.Index(fields=['cs_account_id', 'cs_sf_created_date', 'cs_sf_id'], name='idx_cases_account_created'),
+        ),
+        migrations.AddIndex(
+            model_name='casecomment',
+            index=models.Index(fields=['cc_case_id', 'cc_id'], name='idx_case_comments_case_id'),
+        ),
+        migrations.AddIndex(
+            model_name='casehistory',
+            index=models.Index(fields=['ch_case_id', 'ch_created_date', 'ch_sf_id'], name='idx_case_history_case_created'),
+        ),
+    ]
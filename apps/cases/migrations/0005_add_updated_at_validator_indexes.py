@@ -0,0 +1,22 @@
+# Generated by Django 6.0.2 on 2026-10-19 03:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cases', '0004_add_keyset_pagination_indexes'),
+        ('users', '0004_update_models_align_with_ddl'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='casecomment',
+            index=models.Index(fields=['cc_case_id', 'cc_updated_at'], name='idx_case_comments_case_upd'),
+        ),
+        migrations.AddIndex(
+            model_name='casehistory',
+            index=models.Index(fields=['ch_case_id', 'ch_updated_at'], name='idx_case_history_case_updated'),
+        ),
+    ]
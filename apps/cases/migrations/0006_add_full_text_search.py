@@ -0,0 +1,35 @@
+# Generated by Django 6.0.2 on 2026-10-19 03:46
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_remove_accountplan_and_update_models'),
+        ('cases', '0005_add_updated_at_validator_indexes'),
+        ('users', '0004_update_models_align_with_ddl'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='case',
+            name='cs_search_vector',
+            field=models.GeneratedField(db_column='cs_search_vector', db_persist=True, expression=django.contrib.postgres.search.CombinedSearchVector(django.contrib.postgres.search.SearchVector('cs_subject', config='english', weight='A'), '||', django.contrib.postgres.search.SearchVector('cs_description', config='english', weight='B'), django.contrib.postgres.search.SearchConfig('english')), output_field=django.contrib.postgres.search.SearchVectorField(), verbose_name='Search Vector'),
+        ),
+        migrations.AddField(
+            model_name='casecomment',
+            name='cc_search_vector',
+            field=models.GeneratedField(db_column='cc_search_vector', db_persist=True, expression=django.contrib.postgres.search.SearchVector('cc_comment_body', config='english'), output_field=django.contrib.postgres.search.SearchVectorField(), verbose_name='Search Vector'),
+        ),
+        migrations.AddIndex(
+            model_name='case',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['cs_search_vector'], name='idx_cases_search_vector'),
+        ),
+        migrations.AddIndex(
+            model_name='casecomment',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['cc_search_vector'], name='idx_case_comments_search'),
+        ),
+    ]
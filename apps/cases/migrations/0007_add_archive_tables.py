@@ -0,0 +1,33 @@
+"""
+Archive tables for soft-deleted cases, comments and history.
+
+See products.0015_add_archive_tables; the search vectors are archived as
+plain columns.
+"""
+from django.db import migrations
+
+ARCHIVE_TABLES = {
+    'cases': 'cs_sf_id',
+    'case_comments': 'cc_id',
+    'case_history': 'ch_sf_id',
+}
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cases', '0006_add_full_text_search'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql=[
+                f'CREATE TABLE {table}_archive (LIKE {table})',
+                f'ALTER TABLE {table}_archive '
+                f'ADD COLUMN archived_at timestamp with time zone NOT NULL DEFAULT now(), '
+                f'ADD PRIMARY KEY ({key})',
+            ],
+            reverse_sql=f'DROP TABLE {table}_archive',
+        )
+        for table, key in ARCHIVE_TABLES.items()
+    ]
@@ -1,5 +1,10 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
 from django.db import models
 
+# Text search configuration shared by the stored vectors and search queries
+SEARCH_CONFIG = 'english'
+
 
 class Case(models.Model):
     """Salesforce Case - customer support cases"""
@@ -87,6 +92,17 @@ class Case(models.Model):
         db_column='cs_updated_at',
         verbose_name='Updated At'
     )
+    # Maintained by Postgres, so rows written by the sync process stay searchable
+    cs_search_vector = models.GeneratedField(
+        expression=(
+            SearchVector('cs_subject', weight='A', config=SEARCH_CONFIG)
+            + SearchVector('cs_description', weight='B', config=SEARCH_CONFIG)
+        ),
+        output_field=SearchVectorField(),
+        db_persist=True,
+        db_column='cs_search_vector',
+        verbose_name='Search Vector'
+    )
 
     class Meta:
         db_table = 'cases'
@@ -95,6 +111,13 @@ class Case(models.Model):
         indexes = [
             models.Index(fields=['cs_account_id'], name='idx_cases_account'),
             models.Index(fields=['cs_status'], name='idx_cases_status'),
+            # Keyset pagination on (cs_sf_created_date, cs_sf_id)
+            models.Index(fields=['cs_sf_created_date', 'cs_sf_id'], name='idx_cases_created_id'),
+            models.Index(
+                fields=['cs_account_id', 'cs_sf_created_date', 'cs_sf_id'],
+                name='idx_cases_account_created',
+            ),
+            GinIndex(fields=['cs_search_vector'], name='idx_cases_search_vector'),
         ]
 
     def __str__(self):
@@ -164,6 +187,13 @@ class CaseHistory(models.Model):
         verbose_name_plural = 'Case Histories'
         indexes = [
             models.Index(fields=['ch_case_id'], name='idx_case_history_case'),
+            # Keyset pagination of a case's timeline on (ch_created_date, ch_sf_id)
+            models.Index(
+                fields=['ch_case_id', 'ch_created_date', 'ch_sf_id'],
+                name='idx_case_history_case_created',
+            ),
+            # MAX(ch_updated_at) per case for conditional GET validators
+            models.Index(fields=['ch_case_id', 'ch_updated_at'], name='idx_case_history_case_updated'),
         ]
 
     def __str__(self):
@@ -307,6 +337,14 @@ class CaseComment(models.Model):
         db_column='cc_updated_at',
         verbose_name='Updated At'
     )
+    # Maintained by Postgres, so rows written by the sync process stay searchable
+    cc_search_vector = models.GeneratedField(
+        expression=SearchVector('cc_comment_body', config=SEARCH_CONFIG),
+        output_field=SearchVectorField(),
+        db_persist=True,
+        db_column='cc_search_vector',
+        verbose_name='Search Vector'
+    )
 
     class Meta:
         db_table = 'case_comments'
@@ -315,6 +353,11 @@ class CaseComment(models.Model):
         indexes = [
             models.Index(fields=['cc_case_id'], name='idx_case_comments_case'),
             models.Index(fields=['cc_sync_status'], name='idx_case_comments_sync_status'),
+            # Keyset pagination of a case's comments on cc_id
+            models.Index(fields=['cc_case_id', 'cc_id'], name='idx_case_comments_case_id'),
+            # MAX(cc_updated_at) per case for conditional GET validators
+            models.Index(fields=['cc_case_id', 'cc_updated_at'], name='idx_case_comments_case_upd'),
+            GinIndex(fields=['cc_search_vector'], name='idx_case_comments_search'),
         ]
 
     def __str__(self):
@@ -4,6 +4,7 @@ Complaints & Cases API serializers.
 from rest_framework import serializers
 from django.utils import timezone
 
+from core.api.serializers import CompiledSerializer, SparseFieldsetMixin
 from .models import Case, CaseComment, CaseHistory
 
 
@@ -40,7 +41,7 @@ class CaseSummarySerializer(serializers.Serializer):
     closed_count = serializers.IntegerField()
 
 
-class CaseListSerializer(serializers.ModelSerializer):
+class CaseListSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Single case in list response."""
     id = serializers.CharField(source='cs_sf_id', read_only=True)
     case_number = serializers.CharField(source='cs_case_number', read_only=True)
@@ -80,6 +81,33 @@ class CaseListSerializer(serializers.ModelSerializer):
         return getattr(obj, 'cs_owner_id_id', None)
 
 
+def _opened_at(dt):
+    """ISO date of the case creation timestamp."""
+    return dt.date().isoformat()
+
+
+# Fast path for list endpoints: CaseListSerializer compiled to a values_list()
+# row -> item function (queryset annotated with comments/timeline counts)
+CASE_LIST_COMPILED = CompiledSerializer(
+    CaseListSerializer,
+    columns={
+        'opened_at': ('cs_sf_created_date', _opened_at),
+        'opened_at_display': ('cs_sf_created_date', _format_opened_display),
+        'account_id': 'cs_account_id',
+        'owner_id': 'cs_owner_id',
+    },
+)
+
+
+class CaseSearchResultSerializer(CaseListSerializer):
+    """Single ranked hit in search response."""
+    rank = serializers.FloatField(read_only=True)
+    matched_in = serializers.ListField(child=serializers.CharField(), read_only=True)
+
+    class Meta(CaseListSerializer.Meta):
+        fields = CaseListSerializer.Meta.fields + ['rank', 'matched_in']
+
+
 class CaseDetailSerializer(serializers.ModelSerializer):
     """Single case detail response."""
     id = serializers.CharField(source='cs_sf_id', read_only=True)
@@ -0,0 +1,40 @@
+"""
+Complaints & Cases service layer.
+"""
+from datetime import date
+from typing import Dict, Optional
+
+from .models import Case
+
+
+def get_case_summary(
+    account_id: str,
+    opened_from: Optional[date] = None,
+    opened_to: Optional[date] = None,
+) -> Dict[str, int]:
+    """
+    Open, closed and total case counts for an account.
+
+    Args:
+        account_id: Salesforce Account ID
+        opened_from: Only cases opened on or after this date
+        opened_to: Only cases opened on or before this date
+
+    Returns:
+        Dict with open_count, total_count and closed_count
+    """
+    qs = Case.objects.filter(cs_account_id=account_id)
+
+    # Apply date filters if provided
+    if opened_from:
+        qs = qs.filter(cs_sf_created_date__date__gte=opened_from)
+    if opened_to:
+        qs = qs.filter(cs_sf_created_date__date__lte=opened_to)
+
+    total_count = qs.count()
+    closed_count = qs.filter(cs_status__iexact='Closed').count()
+    return {
+        'open_count': total_count - closed_count,
+        'total_count': total_count,
+        'closed_count': closed_count,
+    }
@@ -1,8 +1,11 @@
 """
 Complaints & Cases API tests.
 """
+import json
 from datetime import datetime, timezone
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from rest_framework.test import APIClient
 from rest_framework import status
 
@@ -195,6 +198,16 @@ class CaseListAPITests(TestCase):
         response = self.client.get('/api/complaints-cases/', {'ordering': 'invalid'})
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
 
+    def test_list_stream_matches_unstreamed_response(self):
+        CaseComment.objects.create(cc_case_id=self.case_open, cc_comment_body='Hello')
+        expected = self.client.get('/api/complaints-cases/', {'ordering': 'opened_at'})
+        response = self.client.get('/api/complaints-cases/', {'ordering': 'opened_at', 'stream': 'true'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        body = b''.join(response.streaming_content)
+        self.assertEqual(json.loads(body), expected.json())
+        self.assertEqual(json.loads(body)['data'][0]['comments_count'], 1)
+
 
 class CaseDetailAPITests(TestCase):
     """GET /api/complaints-cases/{case_id} - detail and 404."""
@@ -507,3 +520,429 @@ class CreateCaseCommentAPITests(TestCase):
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
         data = response.json()
         self.assertFalse(data.get('success'))
+
+
+class CaseCursorPaginationAPITests(TestCase):
+    """Cursor pagination for case list, comments and timeline."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create(
+            usr_sf_id='usr001',
+            usr_username='testuser',
+            usr_email='test@example.com',
+            usr_last_name='User',
+            usr_name='Test User',
+            usr_is_active=True,
+            usr_time_zone='UTC',
+            usr_language='en',
+            usr_sf_created_date=_dt(2020, 1, 1),
+            usr_last_modified_date=_dt(2020, 1, 1),
+            usr_last_modified_by_id='usr001',
+        )
+        self.account = Account.objects.create(
+            acc_sf_id='acc001',
+            acc_name='Test Account',
+            acc_owner_id=self.user,
+            acc_last_modified_date=_dt(2020, 1, 1),
+            acc_last_modified_by_id='usr001',
+        )
+        # Two cases share an opened date so the cs_sf_id tie-breaker is exercised
+        for i, day in enumerate([1, 2, 2, 3, 4]):
+            Case.objects.create(
+                cs_sf_id=f'case_cur_{i}',
+                cs_case_number=f'0000600{i}',
+                cs_subject=f'Cursor case {i}',
+                cs_status='Open',
+                cs_account_id=self.account,
+                cs_owner_id=self.user,
+                cs_sf_created_date=_dt(2024, 6, day),
+                cs_last_modified_date=_dt(2024, 6, day),
+                cs_last_modified_by_id='usr001',
+            )
+        self.case = Case.objects.get(cs_sf_id='case_cur_4')
+
+    def _walk(self, url, params):
+        """Follow next cursors to the end; return ids per page and the last meta."""
+        pages = []
+        params = dict(params, cursor='')
+        while True:
+            response = self.client.get(url, params)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            body = response.json()
+            pages.append(body['data'])
+            meta = body['meta']['pagination']
+            if not meta['has_next']:
+                return pages, meta
+            params['cursor'] = meta['next_cursor']
+
+    def test_list_cursor_walks_all_cases_in_order(self):
+        pages, meta = self._walk('/api/complaints-cases/', {'page_size': 2})
+        ids = [row['id'] for page in pages for row in page]
+        self.assertEqual(
+            ids,
+            ['case_cur_4', 'case_cur_3', 'case_cur_2', 'case_cur_1', 'case_cur_0'],
+        )
+        self.assertEqual([len(page) for page in pages], [2, 2, 1])
+        self.assertTrue(meta['has_previous'])
+        self.assertNotIn('total_count', meta)
+
+    def test_list_cursor_previous_returns_prior_page(self):
+        first = self.client.get('/api/complaints-cases/', {'cursor': '', 'page_size': 2}).json()
+        second = self.client.get(
+            '/api/complaints-cases/',
+            {'cursor': first['meta']['pagination']['next_cursor'], 'page_size': 2},
+        ).json()
+        back = self.client.get(
+            '/api/complaints-cases/',
+            {'cursor': second['meta']['pagination']['previous_cursor'], 'page_size': 2},
+        ).json()
+        self.assertEqual(
+            [row['id'] for row in back['data']],
+            [row['id'] for row in first['data']],
+        )
+        self.assertFalse(back['meta']['pagination']['has_previous'])
+
+    def test_list_cursor_ascending_ordering(self):
+        pages, _ = self._walk('/api/complaints-cases/', {'page_size': 3, 'ordering': 'opened_at'})
+        ids = [row['id'] for page in pages for row in page]
+        self.assertEqual(
+            ids,
+            ['case_cur_0', 'case_cur_1', 'case_cur_2', 'case_cur_3', 'case_cur_4'],
+        )
+
+    def test_invalid_cursor_returns_400(self):
+        response = self.client.get('/api/complaints-cases/', {'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(response.json().get('success'))
+
+    def test_comments_cursor_pagination(self):
+        for i in range(5):
+            CaseComment.objects.create(cc_case_id=self.case, cc_comment_body=f'Comment {i}')
+        pages, _ = self._walk(f'/api/complaints-cases/{self.case.cs_sf_id}/comments/', {'page_size': 2})
+        bodies = [row['body'] for page in pages for row in page]
+        self.assertEqual(bodies, [f'Comment {i}' for i in range(4, -1, -1)])
+
+    def test_timeline_cursor_pagination_breaks_ties(self):
+        for i in range(4):
+            CaseHistory.objects.create(
+                ch_sf_id=f'ch_cur_{i}',
+                ch_case_id=self.case,
+                ch_field='Status',
+                ch_created_date=_dt(2024, 6, 5, 9, 0),
+                ch_created_by_id='usr001',
+            )
+        pages, _ = self._walk(f'/api/complaints-cases/{self.case.cs_sf_id}/timeline/', {'page_size': 3})
+        ids = [row['event_id'] for page in pages for row in page]
+        self.assertEqual(ids, ['ch_cur_3', 'ch_cur_2', 'ch_cur_1', 'ch_cur_0'])
+
+    def test_comments_without_pagination_params_returns_all(self):
+        CaseComment.objects.create(cc_case_id=self.case, cc_comment_body='Only comment')
+        response = self.client.get(f'/api/complaints-cases/{self.case.cs_sf_id}/comments/')
+        body = response.json()
+        self.assertEqual(len(body['data']), 1)
+        self.assertNotIn('meta', body)
+
+
+class CaseBundleAPITests(TestCase):
+    """GET /api/complaints-cases/{case_id}/bundle - case, comments and timeline together."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create(
+            usr_sf_id='usr001',
+            usr_username='testuser',
+            usr_email='test@example.com',
+            usr_last_name='User',
+            usr_name='Test User',
+            usr_is_active=True,
+            usr_time_zone='UTC',
+            usr_language='en',
+            usr_sf_created_date=_dt(2020, 1, 1),
+            usr_last_modified_date=_dt(2020, 1, 1),
+            usr_last_modified_by_id='usr001',
+        )
+        self.account = Account.objects.create(
+            acc_sf_id='acc001',
+            acc_name='Test Account',
+            acc_owner_id=self.user,
+            acc_last_modified_date=_dt(2020, 1, 1),
+            acc_last_modified_by_id='usr001',
+        )
+        self.case = Case.objects.create(
+            cs_sf_id='case_bundle_1',
+            cs_case_number='00007001',
+            cs_subject='Bundle case',
+            cs_description='Bundle description',
+            cs_status='Open',
+            cs_account_id=self.account,
+            cs_owner_id=self.user,
+            cs_sf_created_date=_dt(2024, 7, 1),
+            cs_last_modified_date=_dt(2024, 7, 1),
+            cs_last_modified_by_id='usr001',
+        )
+        for i in range(3):
+            CaseComment.objects.create(
+                cc_case_id=self.case,
+                cc_comment_body=f'Comment {i}',
+                cc_agent_created_by=self.user,
+            )
+            CaseHistory.objects.create(
+                ch_sf_id=f'ch_bundle_{i}',
+                ch_case_id=self.case,
+                ch_field='Status',
+                ch_new_value=f'Value {i}',
+                ch_created_date=_dt(2024, 7, 1, 10 + i),
+                ch_created_by_id='usr001',
+            )
+        self.url = f'/api/complaints-cases/{self.case.cs_sf_id}/bundle/'
+
+    def test_bundle_returns_case_comments_and_timeline(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.json()['data']
+        self.assertEqual(data['case']['id'], 'case_bundle_1')
+        self.assertEqual(data['case']['comments_count'], 3)
+        self.assertEqual(data['case']['timeline_count'], 3)
+        self.assertEqual(
+            [c['body'] for c in data['comments']['items']],
+            ['Comment 2', 'Comment 1', 'Comment 0'],
+        )
+        self.assertEqual(data['comments']['items'][0]['created_by_name'], 'Test User')
+        self.assertIsNone(data['comments']['next_cursor'])
+        self.assertEqual(data['timeline']['items'][0]['event_id'], 'ch_bundle_2')
+
+    def test_bundle_query_count_is_fixed(self):
+        for i in range(3, 30):
+            CaseComment.objects.create(cc_case_id=self.case, cc_comment_body=f'Comment {i}')
+        with CaptureQueriesContext(connection) as small:
+            self.client.get(self.url, {'comments_limit': 1})
+        with CaptureQueriesContext(connection) as large:
+            self.client.get(self.url, {'comments_limit': 100})
+        self.assertEqual(len(small), len(large))
+
+    def test_bundle_include_selects_sections(self):
+        response = self.client.get(self.url, {'include': 'timeline'})
+        data = response.json()['data']
+        self.assertIn('case', data)
+        self.assertIn('timeline', data)
+        self.assertNotIn('comments', data)
+
+        response = self.client.get(self.url, {'include': ''})
+        self.assertEqual(set(response.json()['data']), {'case'})
+
+    def test_bundle_limit_and_cursor_continue_on_comments_endpoint(self):
+        response = self.client.get(self.url, {'include': 'comments', 'comments_limit': 2})
+        comments = response.json()['data']['comments']
+        self.assertEqual([c['body'] for c in comments['items']], ['Comment 2', 'Comment 1'])
+        self.assertIsNotNone(comments['next_cursor'])
+
+        rest = self.client.get(
+            f'/api/complaints-cases/{self.case.cs_sf_id}/comments/',
+            {'cursor': comments['next_cursor']},
+        ).json()
+        self.assertEqual([c['body'] for c in rest['data']], ['Comment 0'])
+
+    def test_bundle_invalid_include_rejected(self):
+        response = self.client.get(self.url, {'include': 'comments,attachments'})
+        self.assertFalse(response.json().get('success'))
+        self.assertNotEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_bundle_not_found_returns_404(self):
+        response = self.client.get('/api/complaints-cases/nonexistent_xyz/bundle/')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class CaseConditionalGetAPITests(TestCase):
+    """ETag / Last-Modified validators on case detail, comments, timeline and bundle."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create(
+            usr_sf_id='usr001',
+            usr_username='testuser',
+            usr_email='test@example.com',
+            usr_last_name='User',
+            usr_name='Test User',
+            usr_is_active=True,
+            usr_time_zone='UTC',
+            usr_language='en',
+            usr_sf_created_date=_dt(2020, 1, 1),
+            usr_last_modified_date=_dt(2020, 1, 1),
+            usr_last_modified_by_id='usr001',
+        )
+        self.account = Account.objects.create(
+            acc_sf_id='acc001',
+            acc_name='Test Account',
+            acc_owner_id=self.user,
+            acc_last_modified_date=_dt(2020, 1, 1),
+            acc_last_modified_by_id='usr001',
+        )
+        self.case = Case.objects.create(
+            cs_sf_id='case_cond_1',
+            cs_case_number='00008001',
+            cs_subject='Conditional case',
+            cs_status='Open',
+            cs_account_id=self.account,
+            cs_owner_id=self.user,
+            cs_sf_created_date=_dt(2024, 8, 1),
+            cs_last_modified_date=_dt(2024, 8, 1),
+            cs_last_modified_by_id='usr001',
+        )
+        CaseComment.objects.create(cc_case_id=self.case, cc_comment_body='First')
+        CaseHistory.objects.create(
+            ch_sf_id='ch_cond_1',
+            ch_case_id=self.case,
+            ch_field='Status',
+            ch_new_value='Open',
+            ch_created_date=_dt(2024, 8, 1, 9),
+            ch_created_by_id='usr001',
+        )
+        base = f'/api/complaints-cases/{self.case.cs_sf_id}'
+        self.urls = [f'{base}/', f'{base}/comments/', f'{base}/timeline/', f'{base}/bundle/']
+
+    def test_validators_present_on_all_case_resources(self):
+        etags = set()
+        for url in self.urls:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK, url)
+            self.assertIn('ETag', response)
+            self.assertIn('Last-Modified', response)
+            self.assertIn('no-cache', response['Cache-Control'])
+            etags.add(response['ETag'])
+        self.assertEqual(len(etags), 1)
+
+    def test_if_none_match_returns_304_with_single_query(self):
+        for url in self.urls:
+            etag = self.client.get(url)['ETag']
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED, url)
+            self.assertEqual(response.content, b'')
+            selects = [q for q in queries.captured_queries if q['sql'].startswith('SELECT')]
+            self.assertEqual(len(selects), 1)
+
+    def test_if_modified_since_returns_304(self):
+        last_modified = self.client.get(self.urls[0])['Last-Modified']
+        response = self.client.get(self.urls[0], HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_new_comment_changes_etag(self):
+        etag = self.client.get(self.urls[1])['ETag']
+        CaseComment.objects.create(cc_case_id=self.case, cc_comment_body='Second')
+        response = self.client.get(self.urls[1], HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(len(response.json()['data']), 2)
+
+    def test_deleted_timeline_event_changes_etag(self):
+        etag = self.client.get(self.urls[2])['ETag']
+        CaseHistory.objects.filter(ch_sf_id='ch_cond_1').delete()
+        response = self.client.get(self.urls[2], HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_account_and_owner_changes_change_etag(self):
+        for related in [self.account, self.user]:
+            etag = self.client.get(self.urls[0])['ETag']
+            related.save()
+            response = self.client.get(self.urls[0], HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, status.HTTP_200_OK, related)
+            self.assertNotEqual(response['ETag'], etag)
+
+    def test_missing_case_still_404(self):
+        response = self.client.get('/api/complaints-cases/nonexistent_xyz/', HTTP_IF_NONE_MATCH='*')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_missing_case_sections_404_with_single_query(self):
+        for section in ['comments', 'timeline']:
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(f'/api/complaints-cases/nonexistent_xyz/{section}/')
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND, section)
+            selects = [q for q in queries.captured_queries if q['sql'].startswith('SELECT')]
+            self.assertEqual(len(selects), 1)
+
+
+class CaseSearchAPITests(TestCase):
+    """GET /api/complaints-cases/search - ranked full-text search."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create(
+            usr_sf_id='usr001',
+            usr_username='testuser',
+            usr_email='test@example.com',
+            usr_last_name='User',
+            usr_name='Test User',
+            usr_is_active=True,
+            usr_time_zone='UTC',
+            usr_language='en',
+            usr_sf_created_date=_dt(2020, 1, 1),
+            usr_last_modified_date=_dt(2020, 1, 1),
+            usr_last_modified_by_id='usr001',
+        )
+        self.account = Account.objects.create(
+            acc_sf_id='acc001',
+            acc_name='Test Account',
+            acc_owner_id=self.user,
+            acc_last_modified_date=_dt(2020, 1, 1),
+            acc_last_modified_by_id='usr001',
+        )
+        self.other_account = Account.objects.create(
+            acc_sf_id='acc002',
+            acc_name='Other Account',
+            acc_owner_id=self.user,
+            acc_last_modified_date=_dt(2020, 1, 1),
+            acc_last_modified_by_id='usr001',
+        )
+        cases = [
+            ('case_s1', 'Leaking valve on pump', 'Customer reports pressure drop', self.account),
+            ('case_s2', 'Invoice question', 'Valve replacement was billed twice', self.account),
+            ('case_s3', 'Delivery delay', 'Shipment arrived late', self.other_account),
+        ]
+        for i, (case_id, subject, description, account) in enumerate(cases):
+            Case.objects.create(
+                cs_sf_id=case_id,
+                cs_case_number=f'0000900{i}',
+                cs_subject=subject,
+                cs_description=description,
+                cs_status='Open',
+                cs_account_id=account,
+                cs_owner_id=self.user,
+                cs_sf_created_date=_dt(2024, 9, 1),
+                cs_last_modified_date=_dt(2024, 9, 1),
+                cs_last_modified_by_id='usr001',
+            )
+        self.url = '/api/complaints-cases/search/'
+
+    def test_search_ranks_subject_above_description(self):
+        response = self.client.get(self.url, {'q': 'valves'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.json()['data']
+        self.assertEqual([hit['id'] for hit in data], ['case_s1', 'case_s2'])
+        self.assertGreater(data[0]['rank'], data[1]['rank'])
+        self.assertEqual(data[0]['matched_in'], ['case'])
+
+    def test_search_matches_comment_bodies(self):
+        CaseComment.objects.create(
+            cc_case_id=Case.objects.get(cs_sf_id='case_s3'),
+            cc_comment_body='Courier lost the valve assembly',
+        )
+        data = self.client.get(self.url, {'q': 'assembly'}).json()['data']
+        self.assertEqual([hit['id'] for hit in data], ['case_s3'])
+        self.assertEqual(data[0]['matched_in'], ['comments'])
+
+    def test_search_vector_follows_updates(self):
+        Case.objects.filter(cs_sf_id='case_s3').update(cs_subject='Broken valve')
+        data = self.client.get(self.url, {'q': 'valve'}).json()['data']
+        self.assertIn('case_s3', [hit['id'] for hit in data])
+
+    def test_search_account_filter_and_limit(self):
+        data = self.client.get(self.url, {'q': 'valve', 'account_id': 'acc002'}).json()['data']
+        self.assertEqual(data, [])
+        data = self.client.get(self.url, {'q': 'valve', 'limit': 1}).json()['data']
+        self.assertEqual([hit['id'] for hit in data], ['case_s1'])
+
+    def test_search_requires_query(self):
+        response = self.client.get(self.url, {'q': '  '})
+        self.assertFalse(response.json().get('success'))
+        self.assertNotEqual(response.status_code, status.HTTP_200_OK)
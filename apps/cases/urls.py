@@ -10,7 +10,9 @@ app_name = 'cases'
 urlpatterns = [
     path('summary/', views.CaseSummaryAPIView.as_view(), name='summary'),
     path('', views.CaseListAPIView.as_view(), name='list'),
+    path('search/', views.CaseSearchAPIView.as_view(), name='search'),
     path('<str:case_id>/', views.CaseDetailAPIView.as_view(), name='detail'),
     path('<str:case_id>/comments/', views.CaseCommentsAPIView.as_view(), name='comments'),
     path('<str:case_id>/timeline/', views.CaseTimelineAPIView.as_view(), name='timeline'),
+    path('<str:case_id>/bundle/', views.CaseBundleAPIView.as_view(), name='bundle'),
 ]
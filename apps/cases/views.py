@@ -1,8 +1,11 @@
 """
 Complaints & Cases API views.
 """
+import hashlib
 from datetime import datetime
-from django.db.models import Count, Q
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db.models import Count, F, Max, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 from drf_spectacular.utils import OpenApiParameter, extend_schema
 from rest_framework.permissions import AllowAny
@@ -11,15 +14,23 @@ from rest_framework.exceptions import ValidationError
 from rest_framework import status
 
 from core.api.responses import APIResponse
-from core.api.utils.pagination import StandardPagination
+from core.api.serializers import requested_fields
+from core.api.utils.pagination import StandardPagination, CursorPagination, is_cursor_requested
+from core.api.utils.conditional import conditional_get, conditional_validators
+from core.api.utils.streaming import is_stream_requested
 from core.api.constants import (
     ErrorMessages, SuccessMessages, ErrorCodes, FieldNames, ValidationConstants
 )
+from core.db import read_only_requests
+from core.db_router import replica_reads
 
-from .models import Case, CaseComment, CaseHistory
+from .models import SEARCH_CONFIG, Case, CaseComment, CaseHistory
+from .services import get_case_summary
 from .serializers import (
-    CaseSummarySerializer,
+    CASE_LIST_COMPILED,
     CaseListSerializer,
+    CaseSummarySerializer,
+    CaseSearchResultSerializer,
     CaseDetailSerializer,
     CaseCommentSerializer,
     CaseTimelineSerializer,
@@ -36,6 +47,10 @@ ORDERING_MAP = {
     '-last_modified': '-cs_last_modified_date',
 }
 
+# Keyset orderings for cursor pagination; the trailing unique column breaks ties
+COMMENTS_CURSOR_ORDERING = ('-cc_id',)
+TIMELINE_CURSOR_ORDERING = ('-ch_created_date', '-ch_sf_id')
+
 
 def _parse_date(value, param_name):
     """Parse YYYY-MM-DD string; raise ValidationError if invalid."""
@@ -46,12 +61,79 @@ def _parse_date(value, param_name):
     except ValueError:
         raise ValidationError({param_name: [ErrorMessages.DATE_FORMAT_INVALID]})
 
+def _case_list_cursor_ordering(order_field):
+    """Keyset ordering for the case list: requested field, then cs_sf_id in the same direction."""
+    tie_breaker = '-cs_sf_id' if order_field.startswith('-') else 'cs_sf_id'
+    return (order_field, tie_breaker)
+
+
+def _related_count(model, case_field):
+    """Correlated COUNT(*) of ``model`` rows pointing at the outer case."""
+    counts = (
+        model.objects.filter(**{case_field: OuterRef('pk')})
+        .order_by()
+        .values(case_field)
+        .annotate(total=Count('*'))
+        .values('total')
+    )
+    return Coalesce(Subquery(counts), 0)
+
+
+def _related_latest(model, case_field, field):
+    """Correlated MAX(field) of ``model`` rows pointing at the outer case."""
+    latest = (
+        model.objects.filter(**{case_field: OuterRef('pk')})
+        .order_by()
+        .values(case_field)
+        .annotate(latest=Max(field))
+        .values('latest')
+    )
+    return Subquery(latest)
+
+
+def _case_validators(request, case_id):
+    """
+    (etag, last_modified) shared by a case's detail, comments, timeline and bundle.
+
+    One query over the case row, its account and owner rows (joined on the
+    primary key) and the (case, updated_at) indexes of its comments and
+    history. Counts are part of the ETag so deletions also change it.
+    Returns None when the case does not exist; views read that back with
+    ``conditional_validators`` instead of querying the case again.
+    """
+    row = (
+        Case.objects.filter(cs_sf_id=case_id)
+        .annotate(
+            comments_updated_at=_related_latest(CaseComment, 'cc_case_id', 'cc_updated_at'),
+            timeline_updated_at=_related_latest(CaseHistory, 'ch_case_id', 'ch_updated_at'),
+            comments_count=_related_count(CaseComment, 'cc_case_id'),
+            timeline_count=_related_count(CaseHistory, 'ch_case_id'),
+        )
+        .values_list(
+            'cs_updated_at', 'comments_updated_at', 'timeline_updated_at',
+            'cs_account_id__acc_updated_at', 'cs_owner_id__usr_updated_at',
+            'comments_count', 'timeline_count',
+        )
+        .first()
+    )
+    if row is None:
+        return None
+    timestamps = [ts for ts in row[:5] if ts is not None]
+    last_modified = max(timestamps) if timestamps else None
+    etag = hashlib.md5('|'.join(str(value) for value in row).encode(), usedforsecurity=False).hexdigest()
+    return etag, last_modified
+
+
 def _cases_queryset_with_counts():
-    """Base Case queryset with comments_count and timeline_count annotations."""
+    """
+    Base Case queryset with comments_count and timeline_count annotations.
+
+    Counts are per-row subqueries rather than a joined GROUP BY, so a LIMITed
+    page only counts the cases it returns.
+    """
     return Case.objects.annotate(
-        # Use the reverse *query* names for relations (casecomment, casehistory)
-        comments_count=Count('casecomment', distinct=True),
-        timeline_count=Count('casehistory', distinct=True),
+        comments_count=_related_count(CaseComment, 'cc_case_id'),
+        timeline_count=_related_count(CaseHistory, 'ch_case_id'),
     )
 
 
@@ -80,9 +162,11 @@ def _cases_queryset_with_counts():
         ),
     ],
 )
+@read_only_requests
 class CaseSummaryAPIView(APIView):
     """GET /api/complaints-cases/summary - open_count, total_count, closed_count with optional date filters."""
     permission_classes = [AllowAny]
+    query_budget = 2
 
     def get(self, request):
         account_id = (request.query_params.get('account_id') or '').strip()
@@ -95,24 +179,7 @@ class CaseSummaryAPIView(APIView):
         opened_from_d = _parse_date(opened_from, 'opened_from')
         opened_to_d = _parse_date(opened_to, 'opened_to')
 
-        qs = Case.objects.all()
-        qs = qs.filter(cs_account_id=account_id)
-
-        # Apply date filters if provided
-        if opened_from_d:
-            qs = qs.filter(cs_sf_created_date__date__gte=opened_from_d)
-        if opened_to_d:
-            qs = qs.filter(cs_sf_created_date__date__lte=opened_to_d)
-
-        total_count = qs.count()
-        closed_count = qs.filter(cs_status__iexact='Closed').count()
-        open_count = total_count - closed_count
-
-        data = {
-            'open_count': open_count,
-            'total_count': total_count,
-            'closed_count': closed_count,
-        }
+        data = get_case_summary(account_id, opened_from_d, opened_to_d)
         serializer = CaseSummarySerializer(data)
         return APIResponse.success(
             data=serializer.data,
@@ -180,11 +247,38 @@ class CaseSummaryAPIView(APIView):
             description='Page size (max 100, if provided, enables pagination)',
             required=False,
         ),
+        OpenApiParameter(
+            name='cursor',
+            type=str,
+            location=OpenApiParameter.QUERY,
+            description=(
+                'Opaque cursor from meta.pagination.next_cursor/previous_cursor. '
+                'If provided (empty for the first page), enables cursor pagination instead of page numbers'
+            ),
+            required=False,
+        ),
+        OpenApiParameter(
+            name='fields',
+            type=str,
+            location=OpenApiParameter.QUERY,
+            description='Comma-separated fields to return, e.g. id,title,status (default: all)',
+            required=False,
+        ),
+        OpenApiParameter(
+            name='stream',
+            type=bool,
+            location=OpenApiParameter.QUERY,
+            description='Stream the unpaginated list with constant memory (ignored when paginating)',
+            required=False,
+        ),
     ],
 )
+@replica_reads
+@read_only_requests
 class CaseListAPIView(APIView):
     """GET /api/complaints-cases - list with filters, ordering, optional pagination."""
     permission_classes = [AllowAny]
+    query_budget = 3
 
     def get(self, request):
         params = request.query_params
@@ -211,6 +305,8 @@ class CaseListAPIView(APIView):
 
         opened_from_d = _parse_date(opened_from, 'opened_from')
         opened_to_d = _parse_date(opened_to, 'opened_to')
+        # Sparse fieldset: unselected count subqueries are left out of the SQL too
+        compiled = CASE_LIST_COMPILED.project(requested_fields(request, CaseListSerializer))
 
         qs = _cases_queryset_with_counts()
 
@@ -230,6 +326,14 @@ class CaseListAPIView(APIView):
         if opened_to_d:
             qs = qs.filter(cs_sf_created_date__date__lte=opened_to_d)
 
+        # Cursor pagination: keyset on (order field, cs_sf_id), no COUNT(*) or OFFSET
+        if is_cursor_requested(request):
+            ordering = _case_list_cursor_ordering(order_field)
+            paginator = CursorPagination(ordering=ordering)
+            rows = compiled.values(qs, *paginator.columns)
+            page = paginator.paginate_queryset(rows, request)
+            return paginator.get_paginated_response(compiled.serialize(page))
+
         qs = qs.order_by(order_field)
 
         # Check if pagination parameters are provided
@@ -239,22 +343,30 @@ class CaseListAPIView(APIView):
         # If either pagination parameter is provided, use pagination
         if page_param is not None or page_size_param is not None:
             paginator = StandardPagination()
-            page = paginator.paginate_queryset(qs, request)
-            serializer = CaseListSerializer(page, many=True)
-            return paginator.get_paginated_response(serializer.data)
+            page = paginator.paginate_queryset(compiled.values(qs), request)
+            return paginator.get_paginated_response(compiled.serialize(page))
+
+        # Streaming mode: rows written as they are fetched
+        if is_stream_requested(request):
+            return APIResponse.streamed(
+                compiled.iter(qs),
+                message=SuccessMessages.DATA_RETRIEVED
+            )
         
         # Otherwise, return all data without pagination
-        serializer = CaseListSerializer(qs, many=True)
         return APIResponse.success(
-            data=serializer.data,
+            data=compiled.data(qs),
             message=SuccessMessages.DATA_RETRIEVED
         )
 
 
+@read_only_requests
 class CaseDetailAPIView(APIView):
     """GET /api/complaints-cases/{case_id} - single case with counts."""
     permission_classes = [AllowAny]
+    query_budget = 2
 
+    @conditional_get(_case_validators)
     def get(self, request, case_id):
         qs = _cases_queryset_with_counts()
         try:
@@ -279,6 +391,20 @@ class CaseDetailAPIView(APIView):
             description='Case Salesforce ID',
             required=True,
         ),
+        OpenApiParameter(
+            name='cursor',
+            type=str,
+            location=OpenApiParameter.QUERY,
+            description='Opaque cursor from meta.pagination (if provided, enables cursor pagination)',
+            required=False,
+        ),
+        OpenApiParameter(
+            name='page_size',
+            type=int,
+            location=OpenApiParameter.QUERY,
+            description='Page size (max 100, if provided, enables cursor pagination)',
+            required=False,
+        ),
     ],
 )
 @extend_schema(
@@ -290,25 +416,33 @@ class CaseDetailAPIView(APIView):
         404: {'description': 'Case not found'},
     },
 )
+@read_only_requests
 class CaseCommentsAPIView(APIView):
     """
     GET /api/complaints-cases/{case_id}/comments - comments latest first.
     POST /api/complaints-cases/{case_id}/comments - create new comment.
     """
     permission_classes = [AllowAny]
+    query_budget = 4
 
+    @conditional_get(_case_validators)
     def get(self, request, case_id):
-        try:
-            Case.objects.get(cs_sf_id=case_id)
-        except Case.DoesNotExist:
+        if conditional_validators(request) is None:
             from rest_framework.exceptions import NotFound
             raise NotFound(ErrorMessages.CASE_NOT_FOUND)
 
         comments = (
             CaseComment.objects.filter(cc_case_id=case_id)
             .select_related('cc_agent_created_by')
-            .order_by('-cc_id')
         )
+
+        if is_cursor_requested(request, 'cursor', 'page_size'):
+            paginator = CursorPagination(ordering=COMMENTS_CURSOR_ORDERING)
+            page = paginator.paginate_queryset(comments, request)
+            serializer = CaseCommentSerializer(page, many=True)
+            return paginator.get_paginated_response(serializer.data)
+
+        comments = comments.order_by(*COMMENTS_CURSOR_ORDERING)
         serializer = CaseCommentSerializer(comments, many=True)
         return APIResponse.success(
             data=serializer.data,
@@ -357,23 +491,256 @@ class CaseCommentsAPIView(APIView):
         )
 
 
+@extend_schema(
+    parameters=[
+        OpenApiParameter(
+            name='cursor',
+            type=str,
+            location=OpenApiParameter.QUERY,
+            description='Opaque cursor from meta.pagination (if provided, enables cursor pagination)',
+            required=False,
+        ),
+        OpenApiParameter(
+            name='page_size',
+            type=int,
+            location=OpenApiParameter.QUERY,
+            description='Page size (max 100, if provided, enables cursor pagination)',
+            required=False,
+        ),
+    ],
+)
+@read_only_requests
 class CaseTimelineAPIView(APIView):
     """GET /api/complaints-cases/{case_id}/timeline - case history latest first."""
     permission_classes = [AllowAny]
+    query_budget = 2
 
+    @conditional_get(_case_validators)
     def get(self, request, case_id):
+        if conditional_validators(request) is None:
+            from rest_framework.exceptions import NotFound
+            raise NotFound(ErrorMessages.CASE_NOT_FOUND)
+
+        events = CaseHistory.objects.filter(ch_case_id=case_id)
+
+        if is_cursor_requested(request, 'cursor', 'page_size'):
+            paginator = CursorPagination(ordering=TIMELINE_CURSOR_ORDERING)
+            page = paginator.paginate_queryset(events, request)
+            serializer = CaseTimelineSerializer(page, many=True)
+            return paginator.get_paginated_response(serializer.data)
+
+        events = events.order_by(*TIMELINE_CURSOR_ORDERING)
+        serializer = CaseTimelineSerializer(events, many=True)
+        return APIResponse.success(
+            data=serializer.data,
+            message=SuccessMessages.TIMELINE_RETRIEVED,
+        )
+
+
+# Sections the bundle endpoint can embed next to the case
+BUNDLE_SECTIONS = ('comments', 'timeline')
+
+
+def _parse_limit(value, param_name):
+    """Parse a 1..MAX_PAGE_SIZE limit; default page size when missing."""
+    if value is None or value == '':
+        return ValidationConstants.DEFAULT_PAGE_SIZE
+    max_size = ValidationConstants.MAX_PAGE_SIZE
+    try:
+        limit = int(value)
+    except (TypeError, ValueError):
+        raise ValidationError({param_name: [ErrorMessages.INVALID_LIMIT.format(max=max_size)]})
+    if limit < 1 or limit > max_size:
+        raise ValidationError({param_name: [ErrorMessages.INVALID_LIMIT.format(max=max_size)]})
+    return limit
+
+
+def _latest_section(queryset, ordering, limit, serializer_class):
+    """First cursor page of a case section plus the cursor to continue from."""
+    paginator = CursorPagination(ordering=ordering)
+    paginator.page_size = limit
+    page = paginator.get_page(queryset)
+    return {
+        'items': serializer_class(page, many=True).data,
+        'next_cursor': paginator.next_cursor,
+    }
+
+
+@extend_schema(
+    parameters=[
+        OpenApiParameter(
+            name='include',
+            type=str,
+            location=OpenApiParameter.QUERY,
+            description='Comma-separated sections to embed: comments, timeline (default: both)',
+            required=False,
+        ),
+        OpenApiParameter(
+            name='comments_limit',
+            type=int,
+            location=OpenApiParameter.QUERY,
+            description='Latest N comments to embed (default 20, max 100)',
+            required=False,
+        ),
+        OpenApiParameter(
+            name='timeline_limit',
+            type=int,
+            location=OpenApiParameter.QUERY,
+            description='Latest N timeline events to embed (default 20, max 100)',
+            required=False,
+        ),
+    ],
+)
+@read_only_requests
+class CaseBundleAPIView(APIView):
+    """
+    GET /api/complaints-cases/{case_id}/bundle - case detail with latest comments and timeline.
+
+    One query per section (case, comments, timeline) regardless of case size;
+    next_cursor continues on the comments/timeline endpoints.
+    """
+    permission_classes = [AllowAny]
+    query_budget = 4
+
+    @conditional_get(_case_validators)
+    def get(self, request, case_id):
+        params = request.query_params
+        include_param = params.get('include')
+        if include_param is None:
+            include = set(BUNDLE_SECTIONS)
+        else:
+            include = {part.strip().lower() for part in include_param.split(',') if part.strip()}
+            invalid = include - set(BUNDLE_SECTIONS)
+            if invalid:
+                raise ValidationError({
+                    'include': [ErrorMessages.INVALID_INCLUDE.format(allowed=', '.join(BUNDLE_SECTIONS))],
+                })
+        comments_limit = _parse_limit(params.get('comments_limit'), 'comments_limit')
+        timeline_limit = _parse_limit(params.get('timeline_limit'), 'timeline_limit')
+
+        # The case fetch doubles as the 404 check for the sections below
         try:
-            Case.objects.get(cs_sf_id=case_id)
+            case = _cases_queryset_with_counts().get(cs_sf_id=case_id)
         except Case.DoesNotExist:
             from rest_framework.exceptions import NotFound
             raise NotFound(ErrorMessages.CASE_NOT_FOUND)
 
-        events = (
-            CaseHistory.objects.filter(ch_case_id=case_id)
-            .order_by('-ch_created_date')
+        data = {'case': CaseDetailSerializer(case).data}
+        if 'comments' in include:
+            data['comments'] = _latest_section(
+                CaseComment.objects.filter(cc_case_id=case_id).select_related('cc_agent_created_by'),
+                COMMENTS_CURSOR_ORDERING,
+                comments_limit,
+                CaseCommentSerializer,
+            )
+        if 'timeline' in include:
+            data['timeline'] = _latest_section(
+                CaseHistory.objects.filter(ch_case_id=case_id),
+                TIMELINE_CURSOR_ORDERING,
+                timeline_limit,
+                CaseTimelineSerializer,
+            )
+
+        return APIResponse.success(
+            data=data,
+            message=SuccessMessages.CASE_BUNDLE_RETRIEVED,
         )
-        serializer = CaseTimelineSerializer(events, many=True)
+
+
+def _search_hits(query, account_id, limit):
+    """
+    Top ``limit`` case ids by rank with the sections that matched.
+
+    A case scores the best of its own rank and its best comment rank, so the
+    top hits are always within the top ``limit`` of each side. Each side is a
+    GIN lookup on its stored vector, which keeps this fast on large tables
+    (an OR across both tables would defeat the indexes).
+    """
+    case_hits = (
+        Case.objects.filter(cs_search_vector=query)
+        .annotate(rank=SearchRank(F('cs_search_vector'), query))
+        .order_by('-rank', 'cs_sf_id')
+    )
+    comment_hits = (
+        CaseComment.objects.filter(cc_search_vector=query)
+        .values('cc_case_id')
+        .annotate(rank=Max(SearchRank(F('cc_search_vector'), query)))
+        .order_by('-rank', 'cc_case_id')
+    )
+    if account_id:
+        case_hits = case_hits.filter(cs_account_id=account_id)
+        comment_hits = comment_hits.filter(cc_case_id__cs_account_id=account_id)
+
+    hits = {}
+    for case_id, rank in case_hits.values_list('cs_sf_id', 'rank')[:limit]:
+        hits[case_id] = {'rank': rank, 'matched_in': ['case']}
+    for row in comment_hits[:limit]:
+        hit = hits.setdefault(row['cc_case_id'], {'rank': 0.0, 'matched_in': []})
+        hit['rank'] = max(hit['rank'], row['rank'])
+        hit['matched_in'].append('comments')
+    ranked = sorted(hits.items(), key=lambda item: (-item[1]['rank'], item[0]))
+    return ranked[:limit]
+
+
+@extend_schema(
+    parameters=[
+        OpenApiParameter(
+            name='q',
+            type=str,
+            location=OpenApiParameter.QUERY,
+            description='Search text (web search syntax: "quoted phrase", or, -exclude)',
+            required=True,
+        ),
+        OpenApiParameter(
+            name='account_id',
+            type=str,
+            location=OpenApiParameter.QUERY,
+            description='Restrict hits to one account',
+            required=False,
+        ),
+        OpenApiParameter(
+            name='limit',
+            type=int,
+            location=OpenApiParameter.QUERY,
+            description='Number of hits (default 20, max 100)',
+            required=False,
+        ),
+    ],
+)
+@read_only_requests
+class CaseSearchAPIView(APIView):
+    """
+    GET /api/complaints-cases/search - ranked full-text search over cases and comments.
+
+    Matches case subject (weighted highest), description and comment bodies
+    using the stored tsvector columns.
+    """
+    permission_classes = [AllowAny]
+    query_budget = 3
+
+    def get(self, request):
+        params = request.query_params
+        text = (params.get('q') or '').strip()
+        if not text:
+            raise ValidationError({'q': [ErrorMessages.QUERY_PARAM_REQUIRED]})
+        account_id = (params.get('account_id') or '').strip()
+        limit = _parse_limit(params.get('limit'), 'limit')
+
+        query = SearchQuery(text, search_type='websearch', config=SEARCH_CONFIG)
+        ranked = _search_hits(query, account_id, limit)
+
+        cases = _cases_queryset_with_counts().in_bulk([case_id for case_id, _ in ranked])
+        results = []
+        for case_id, hit in ranked:
+            case = cases.get(case_id)
+            if case is None:
+                continue
+            case.rank = hit['rank']
+            case.matched_in = hit['matched_in']
+            results.append(case)
+
+        serializer = CaseSearchResultSerializer(results, many=True)
         return APIResponse.success(
             data=serializer.data,
-            message=SuccessMessages.TIMELINE_RETRIEVED,
+            message=SuccessMessages.CASE_SEARCH_RETRIEVED,
         )
@@ -6,7 +6,11 @@ from calendar import monthrange
 from typing import Dict, List, Tuple
 from decimal import Decimal
 
-from django.db import connection
+from django.db import connections
+
+from apps.products.partition_services import PER_ACCOUNT_QUERY_SETTINGS
+from core.db import local_settings_cursor
+from core.db_router import read_alias
 
 
 class SalesAnalyticsService:
@@ -70,6 +74,8 @@ class SalesAnalyticsService:
         ly_from_date = f"{from_year - 1}{from_date[4:]}"
         ly_to_date = f"{to_year - 1}{to_date[4:]}"
         
+        # The invoice date range is repeated on ili_invoice_date so that
+        # both partitioned tables are pruned to the requested years
         query = """
         WITH actuals AS (
             SELECT
@@ -84,6 +90,7 @@ class SalesAnalyticsService:
             WHERE
                 inv.inv_account_id = %s
                 AND inv.inv_invoice_date BETWEEN %s AND %s
+                AND ili.ili_invoice_date BETWEEN %s AND %s
                 AND inv.inv_active = 1
                 AND prd.prd_active = 1
             GROUP BY
@@ -102,6 +109,7 @@ class SalesAnalyticsService:
             WHERE
                 inv.inv_account_id = %s
                 AND inv.inv_invoice_date BETWEEN %s AND %s
+                AND ili.ili_invoice_date BETWEEN %s AND %s
                 AND inv.inv_active = 1
                 AND prd.prd_active = 1
             GROUP BY
@@ -169,8 +177,8 @@ class SalesAnalyticsService:
         """
         
         params = [
-            account_id, from_date, to_date,
-            account_id, ly_from_date, ly_to_date,
+            account_id, from_date, to_date, from_date, to_date,
+            account_id, ly_from_date, ly_to_date, ly_from_date, ly_to_date,
             account_id, from_date, to_date,
             account_id, from_date, to_date
         ]
@@ -183,7 +191,7 @@ class SalesAnalyticsService:
         
         query = query.format(search_filter=search_filter)
         
-        with connection.cursor() as cursor:
+        with local_settings_cursor(read_alias(), PER_ACCOUNT_QUERY_SETTINGS) as cursor:
             cursor.execute(query, params)
             columns = [col[0] for col in cursor.description]
             results = [dict(zip(columns, row)) for row in cursor.fetchall()]
@@ -229,6 +237,8 @@ class SalesAnalyticsService:
         ly_from_date = f"{from_year - 1}{from_date[4:]}"
         ly_to_date = f"{to_year - 1}{to_date[4:]}"
         
+        # The invoice date range is repeated on ili_invoice_date so that
+        # both partitioned tables are pruned to the requested years
         query = """
         WITH actuals AS (
             SELECT
@@ -245,6 +255,7 @@ class SalesAnalyticsService:
                 inv.inv_account_id = %s
                 AND prd.prd_family = %s
                 AND inv.inv_invoice_date BETWEEN %s AND %s
+                AND ili.ili_invoice_date BETWEEN %s AND %s
                 AND inv.inv_active = 1
                 AND ili.ili_active = 1
                 AND prd.prd_active = 1
@@ -265,6 +276,7 @@ class SalesAnalyticsService:
                 inv.inv_account_id = %s
                 AND prd.prd_family = %s
                 AND inv.inv_invoice_date BETWEEN %s AND %s
+                AND ili.ili_invoice_date BETWEEN %s AND %s
                 AND inv.inv_active = 1
                 AND ili.ili_active = 1
                 AND prd.prd_active = 1
@@ -339,8 +351,8 @@ class SalesAnalyticsService:
         """
         
         params = [
-            account_id, family, from_date, to_date,
-            account_id, family, ly_from_date, ly_to_date,
+            account_id, family, from_date, to_date, from_date, to_date,
+            account_id, family, ly_from_date, ly_to_date, ly_from_date, ly_to_date,
             account_id, family, from_date, to_date,
             account_id, family, from_date, to_date
         ]
@@ -353,7 +365,7 @@ class SalesAnalyticsService:
         
         query = query.format(search_filter=search_filter)
         
-        with connection.cursor() as cursor:
+        with local_settings_cursor(read_alias(), PER_ACCOUNT_QUERY_SETTINGS) as cursor:
             cursor.execute(query, params)
             columns = [col[0] for col in cursor.description]
             results = [dict(zip(columns, row)) for row in cursor.fetchall()]
@@ -443,7 +455,7 @@ class SalesAnalyticsService:
         
         query = query.format(search_filter=search_filter)
         
-        with connection.cursor() as cursor:
+        with connections[read_alias()].cursor() as cursor:
             cursor.execute(query, params)
             columns = [col[0] for col in cursor.description]
             results = [dict(zip(columns, row)) for row in cursor.fetchall()]
@@ -532,7 +544,7 @@ class SalesAnalyticsService:
         
         query = query.format(search_filter=search_filter)
         
-        with connection.cursor() as cursor:
+        with connections[read_alias()].cursor() as cursor:
             cursor.execute(query, params)
             columns = [col[0] for col in cursor.description]
             results = [dict(zip(columns, row)) for row in cursor.fetchall()]
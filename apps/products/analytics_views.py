@@ -7,6 +7,8 @@ from rest_framework.views import APIView
 from django.core.paginator import Paginator, EmptyPage
 
 from core.api.responses import APIResponse, ErrorResponse
+from core.db import read_only_requests
+from core.db_router import replica_reads
 
 from .analytics_serializers import (
     ProductFamilySerializer,
@@ -17,6 +19,8 @@ from .analytics_serializers import (
 from .analytics_services import SalesAnalyticsService
 
 
+@replica_reads
+@read_only_requests
 class ProductFamilyAnalyticsAPIView(APIView):
     """
     GET /api/sales/family - Get product family level sales analytics.
@@ -185,6 +189,8 @@ class ProductFamilyAnalyticsAPIView(APIView):
             )
 
 
+@replica_reads
+@read_only_requests
 class ProductAnalyticsAPIView(APIView):
     """
     GET /api/sales/product - Get product level sales analytics.
@@ -377,6 +383,8 @@ class ProductAnalyticsAPIView(APIView):
             )
 
 
+@replica_reads
+@read_only_requests
 class OrderContributionAPIView(APIView):
     """
     GET /api/sales/orders - Get order contribution for a product.
@@ -555,6 +563,8 @@ class OrderContributionAPIView(APIView):
             )
 
 
+@replica_reads
+@read_only_requests
 class OrderDetailsAPIView(APIView):
     """
     GET /api/sales/order-details - Get all product details for an order.
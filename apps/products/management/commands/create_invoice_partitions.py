@@ -0,0 +1,43 @@
+"""
+Create yearly partitions of invoices and invoice_line_items ahead of time.
+
+Run from cron, at the latest in December:
+
+    python manage.py create_invoice_partitions
+    python manage.py create_invoice_partitions --years-ahead 3
+    python manage.py create_invoice_partitions --from-year 2015
+"""
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from apps.products.partition_services import ensure_partitions
+
+
+class Command(BaseCommand):
+    help = 'Create missing yearly invoice partitions up to N years ahead'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--years-ahead',
+            type=int,
+            default=1,
+            help='Create partitions through this many years after the current one (default: 1)',
+        )
+        parser.add_argument(
+            '--from-year',
+            type=int,
+            help='First year to create (default: the current year); use for history in the default partition',
+        )
+
+    def handle(self, *args, **options):
+        this_year = timezone.now().year
+        created = ensure_partitions(
+            options['from_year'] or this_year,
+            this_year + options['years_ahead'],
+        )
+        if not created:
+            self.stdout.write('All partitions exist')
+        for year, moved in created.items():
+            self.stdout.write(self.style.SUCCESS(
+                f'{year}: ' + ', '.join(f'{table} ({rows} rows moved)' for table, rows in moved.items())
+            ))
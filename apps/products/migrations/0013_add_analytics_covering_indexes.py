@@ -0,0 +1,35 @@
+# Generated by Django 6.0.2 on 2026-10-19 04:33
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction; building
+    # concurrently keeps these tables writable while the indexes are built
+    atomic = False
+
+    dependencies = [
+        ('accounts', '0005_add_keyset_pagination_indexes'),
+        ('products', '0012_update_models_align_with_ddl'),
+        ('users', '0006_add_keyset_pagination_index'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='arfrollingforecast',
+            index=models.Index(condition=models.Q(('arf_status', 'Approved')), fields=['arf_account_id', 'arf_forecast_date'], include=('arf_product_id', 'arf_approved_quantity', 'arf_approved_unit_price', 'arf_active'), name='idx_arf_account_approved'),
+        ),
+        AddIndexConcurrently(
+            model_name='invoice',
+            index=models.Index(condition=models.Q(('inv_active', 1)), fields=['inv_account_id', 'inv_invoice_date'], include=('inv_sf_id',), name='idx_invoices_account_date'),
+        ),
+        AddIndexConcurrently(
+            model_name='invoicelineitem',
+            index=models.Index(condition=models.Q(('ili_active', 1)), fields=['ili_invoice_id'], include=('ili_product_id', 'ili_net_price'), name='idx_ili_invoice_amounts'),
+        ),
+        AddIndexConcurrently(
+            model_name='order',
+            index=models.Index(condition=models.Q(('ord_active', 1)), fields=['ord_account_id', 'ord_status', 'ord_effective_date'], include=('ord_sf_id',), name='idx_orders_account_status'),
+        ),
+    ]
@@ -0,0 +1,290 @@
+"""
+Range-partition invoices and invoice_line_items by invoice year.
+
+Both tables are rebuilt as declaratively partitioned tables (one partition
+per year, plus a default partition) and their rows copied over, so run this
+in a maintenance window on a large database. invoice_line_items gets
+ili_invoice_date, a copy of its invoice's date, as partition key.
+
+A partitioned table's primary key and unique constraints must include the
+partition key, so they are widened to (column, date): invoice ids are unique
+per invoice date. The line item -> invoice foreign key becomes
+(ili_invoice_id, ili_invoice_date) -> (inv_sf_id, inv_invoice_date) with ON
+UPDATE CASCADE, so a changed invoice date moves its lines along. Writers
+that do not know ili_invoice_date (the Salesforce sync) insert lines with it
+NULL; a trigger fills it from the invoice, moving the row out of the default
+partition.
+
+Later years are added by ``manage.py create_invoice_partitions``.
+
+Reversing rebuilds both tables unpartitioned, with their original keys and
+the plain line item -> invoice foreign key; like the forward direction it
+copies every row.
+"""
+from datetime import date
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def _year_partition(cursor, table, year):
+    cursor.execute(
+        f'CREATE TABLE {table}_y{year} PARTITION OF {table} '
+        f"FOR VALUES FROM ('{year}-01-01') TO ('{year + 1}-01-01')"
+    )
+
+
+def _partition(cursor, table, column, copy_sql, years):
+    """
+    Rebuild ``table`` partitioned by range of ``column``, keeping its
+    columns, indexes, constraints and outgoing foreign keys.
+    """
+    cursor.execute(
+        """
+        SELECT indexname, indexdef FROM pg_indexes
+        WHERE schemaname = current_schema() AND tablename = %s
+          AND indexname NOT IN (SELECT conname FROM pg_constraint WHERE conrelid = %s::regclass)
+        """,
+        [table, table],
+    )
+    indexes = cursor.fetchall()
+    cursor.execute(
+        """
+        SELECT conname, contype, pg_get_constraintdef(oid),
+               ARRAY(SELECT attname FROM pg_attribute
+                     WHERE attrelid = conrelid AND attnum = ANY(conkey) ORDER BY attnum)
+        FROM pg_constraint
+        WHERE conrelid = %s::regclass AND contype IN ('p', 'u', 'f')
+        """,
+        [table],
+    )
+    constraints = cursor.fetchall()
+
+    cursor.execute(f'ALTER TABLE {table} RENAME TO {table}_unpartitioned')
+    cursor.execute(
+        f'CREATE TABLE {table} (LIKE {table}_unpartitioned INCLUDING DEFAULTS INCLUDING CONSTRAINTS) '
+        f'PARTITION BY RANGE ({column})'
+    )
+    for year in years:
+        _year_partition(cursor, table, year)
+    cursor.execute(f'CREATE TABLE {table}_default PARTITION OF {table} DEFAULT')
+    cursor.execute(copy_sql)
+    # CASCADE also drops foreign keys of other tables that point here
+    cursor.execute(f'DROP TABLE {table}_unpartitioned CASCADE')
+
+    cursor.execute(
+        'SELECT attnotnull FROM pg_attribute WHERE attrelid = %s::regclass AND attname = %s',
+        [table, column],
+    )
+    key_not_null = cursor.fetchone()[0]
+    for name, kind, definition, columns in constraints:
+        if kind == 'f':
+            cursor.execute(f'ALTER TABLE {table} ADD CONSTRAINT {name} {definition}')
+            continue
+        key = ', '.join(columns + [column])
+        if kind == 'p' and key_not_null:
+            cursor.execute(f'ALTER TABLE {table} ADD CONSTRAINT {name} PRIMARY KEY ({key})')
+        else:
+            # A nullable partition key cannot be part of a primary key; NULLS
+            # NOT DISTINCT still keeps ids unique among not yet dated rows
+            name = f'{table}_{columns[0]}_key' if kind == 'p' else name
+            cursor.execute(f'ALTER TABLE {table} ADD CONSTRAINT {name} UNIQUE NULLS NOT DISTINCT ({key})')
+    for _, definition in indexes:
+        cursor.execute(definition)
+
+
+def _unpartition(cursor, table, column, key):
+    """
+    Rebuild partitioned ``table`` as a plain table, narrowing the keys
+    widened by ``_partition`` back to their own columns; ``key`` is the
+    primary key column.
+    """
+    cursor.execute(
+        """
+        SELECT indexname, indexdef FROM pg_indexes
+        WHERE schemaname = current_schema() AND tablename = %s
+          AND indexname NOT IN (SELECT conname FROM pg_constraint WHERE conrelid = %s::regclass)
+        """,
+        [table, table],
+    )
+    indexes = cursor.fetchall()
+    # conparentid = 0 leaves out the clones of foreign keys on partitions
+    cursor.execute(
+        """
+        SELECT conname, contype, pg_get_constraintdef(oid),
+               ARRAY(SELECT attname FROM pg_attribute
+                     WHERE attrelid = conrelid AND attnum = ANY(conkey) ORDER BY attnum)
+        FROM pg_constraint
+        WHERE conrelid = %s::regclass AND contype IN ('p', 'u', 'f') AND conparentid = 0
+        """,
+        [table],
+    )
+    constraints = cursor.fetchall()
+
+    cursor.execute(f'ALTER TABLE {table} RENAME TO {table}_partitioned')
+    cursor.execute(f'CREATE TABLE {table} (LIKE {table}_partitioned INCLUDING DEFAULTS INCLUDING CONSTRAINTS)')
+    cursor.execute(f'INSERT INTO {table} SELECT * FROM {table}_partitioned')
+    cursor.execute(f'DROP TABLE {table}_partitioned CASCADE')
+
+    for name, kind, definition, columns in constraints:
+        if kind == 'f':
+            cursor.execute(f'ALTER TABLE {table} ADD CONSTRAINT {name} {definition}')
+            continue
+        columns = [name for name in columns if name != column]
+        if columns == [key]:
+            cursor.execute(f'ALTER TABLE {table} ADD CONSTRAINT {table}_pkey PRIMARY KEY ({key})')
+        else:
+            cursor.execute(f'ALTER TABLE {table} ADD CONSTRAINT {name} UNIQUE ({", ".join(columns)})')
+    for _, definition in indexes:
+        cursor.execute(definition.replace(' ON ONLY ', ' ON ', 1))
+
+
+def partition_invoices(apps, schema_editor):
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute('SELECT EXTRACT(YEAR FROM MIN(inv_invoice_date))::int FROM invoices')
+        first_year = cursor.fetchone()[0]
+        this_year = date.today().year
+        years = range(min(first_year or this_year, this_year), this_year + 2)
+
+        _partition(
+            cursor, 'invoices', 'inv_invoice_date',
+            'INSERT INTO invoices SELECT * FROM invoices_unpartitioned',
+            years,
+        )
+
+        cursor.execute(
+            """
+            SELECT string_agg(quote_ident(attname), ', ' ORDER BY attnum)
+            FROM pg_attribute
+            WHERE attrelid = 'invoice_line_items'::regclass AND attnum > 0 AND NOT attisdropped
+              AND attname <> 'ili_invoice_date'
+            """
+        )
+        columns = cursor.fetchone()[0]
+        _partition(
+            cursor, 'invoice_line_items', 'ili_invoice_date',
+            f"""
+            INSERT INTO invoice_line_items ({columns}, ili_invoice_date)
+            SELECT {', '.join(f'ili.{name}' for name in columns.split(', '))}, inv.inv_invoice_date
+            FROM invoice_line_items_unpartitioned ili
+            LEFT JOIN invoices inv ON inv.inv_sf_id = ili.ili_invoice_id
+            """,
+            years,
+        )
+
+        cursor.execute(
+            """
+            ALTER TABLE invoice_line_items
+                ADD CONSTRAINT invoice_line_items_invoice_fk
+                FOREIGN KEY (ili_invoice_id, ili_invoice_date)
+                REFERENCES invoices (inv_sf_id, inv_invoice_date)
+                ON UPDATE CASCADE DEFERRABLE INITIALLY DEFERRED
+            """
+        )
+        cursor.execute(
+            """
+            CREATE FUNCTION invoice_line_items_set_invoice_date() RETURNS trigger
+            LANGUAGE plpgsql AS $$
+            BEGIN
+                -- An AFTER trigger, because a BEFORE trigger may not move
+                -- the row to another partition. The date conditions let
+                -- the UPDATE prune to the row's current partition.
+                IF NEW.ili_invoice_date IS NULL THEN
+                    UPDATE invoice_line_items ili
+                    SET ili_invoice_date = inv.inv_invoice_date
+                    FROM invoices inv
+                    WHERE inv.inv_sf_id = NEW.ili_invoice_id
+                      AND ili.ili_sf_id = NEW.ili_sf_id
+                      AND ili.ili_invoice_date IS NULL;
+                ELSE
+                    UPDATE invoice_line_items ili
+                    SET ili_invoice_date = inv.inv_invoice_date
+                    FROM invoices inv
+                    WHERE inv.inv_sf_id = NEW.ili_invoice_id
+                      AND ili.ili_sf_id = NEW.ili_sf_id
+                      AND ili.ili_invoice_date = NEW.ili_invoice_date
+                      AND inv.inv_invoice_date <> NEW.ili_invoice_date;
+                END IF;
+                RETURN NULL;
+            END
+            $$
+            """
+        )
+        cursor.execute(
+            """
+            CREATE TRIGGER invoice_line_items_date_on_insert
+                AFTER INSERT ON invoice_line_items
+                FOR EACH ROW WHEN (NEW.ili_invoice_date IS NULL)
+                EXECUTE FUNCTION invoice_line_items_set_invoice_date()
+            """
+        )
+        cursor.execute(
+            """
+            CREATE TRIGGER invoice_line_items_date_on_update
+                AFTER UPDATE OF ili_invoice_id, ili_invoice_date ON invoice_line_items
+                FOR EACH ROW WHEN (
+                    NEW.ili_invoice_date IS NULL
+                    OR (NEW.ili_invoice_id IS DISTINCT FROM OLD.ili_invoice_id
+                        AND NEW.ili_invoice_date IS NOT DISTINCT FROM OLD.ili_invoice_date)
+                )
+                EXECUTE FUNCTION invoice_line_items_set_invoice_date()
+            """
+        )
+        cursor.execute('ANALYZE invoices, invoice_line_items')
+
+
+def unpartition_invoices(apps, schema_editor):
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute('DROP TRIGGER invoice_line_items_date_on_update ON invoice_line_items')
+        cursor.execute('DROP TRIGGER invoice_line_items_date_on_insert ON invoice_line_items')
+        cursor.execute('DROP FUNCTION invoice_line_items_set_invoice_date()')
+        cursor.execute('ALTER TABLE invoice_line_items DROP CONSTRAINT invoice_line_items_invoice_fk')
+
+        _unpartition(cursor, 'invoice_line_items', 'ili_invoice_date', 'ili_sf_id')
+        _unpartition(cursor, 'invoices', 'inv_invoice_date', 'inv_sf_id')
+
+        # The foreign key as Django created it before 0014
+        name = schema_editor._create_index_name(
+            'invoice_line_items', ['ili_invoice_id'], suffix='_fk_invoices_inv_sf_id'
+        )
+        cursor.execute(
+            f'ALTER TABLE invoice_line_items ADD CONSTRAINT {schema_editor.quote_name(name)} '
+            'FOREIGN KEY (ili_invoice_id) REFERENCES invoices (inv_sf_id) DEFERRABLE INITIALLY DEFERRED'
+        )
+        cursor.execute('ANALYZE invoices, invoice_line_items')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0013_add_analytics_covering_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='invoicelineitem',
+            name='ili_invoice_date',
+            field=models.DateField(blank=True, db_column='ili_invoice_date', editable=False, null=True, verbose_name='Invoice Date'),
+        ),
+        # The database foreign key is replaced by the composite one above
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AlterField(
+                    model_name='invoicelineitem',
+                    name='ili_invoice_id',
+                    field=models.ForeignKey(db_column='ili_invoice_id', db_constraint=False, on_delete=django.db.models.deletion.CASCADE, to='products.invoice', verbose_name='Invoice'),
+                ),
+            ],
+        ),
+        # Rebuilt after partitioning with ili_invoice_date, which the
+        # pruning predicates of the analytics queries now read
+        migrations.RemoveIndex(
+            model_name='invoicelineitem',
+            name='idx_ili_invoice_amounts',
+        ),
+        migrations.RunPython(partition_invoices, unpartition_invoices),
+        migrations.AddIndex(
+            model_name='invoicelineitem',
+            index=models.Index(condition=models.Q(('ili_active', 1)), fields=['ili_invoice_id'], include=('ili_product_id', 'ili_net_price', 'ili_invoice_date'), name='idx_ili_invoice_amounts'),
+        ),
+    ]
@@ -0,0 +1,38 @@
+"""
+Archive tables for soft-deleted invoices, orders and forecasts.
+
+``manage.py archive_inactive_rows`` moves rows that have been inactive for
+longer than the retention window here. Each archive table has the columns of
+its table plus archived_at and is keyed by the table's id only: no foreign
+keys, defaults or other indexes. A migration that adds a column to one of
+these tables must add it to the archive table as well.
+"""
+from django.db import migrations
+
+ARCHIVE_TABLES = {
+    'invoices': 'inv_sf_id',
+    'invoice_line_items': 'ili_sf_id',
+    'orders': 'ord_sf_id',
+    'order_items': 'ori_sf_id',
+    'arf_rolling_forecasts': 'arf_id',
+}
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0014_partition_invoices'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql=[
+                f'CREATE TABLE {table}_archive (LIKE {table})',
+                f'ALTER TABLE {table}_archive '
+                f'ADD COLUMN archived_at timestamp with time zone NOT NULL DEFAULT now(), '
+                f'ADD PRIMARY KEY ({key})',
+            ],
+            reverse_sql=f'DROP TABLE {table}_archive',
+        )
+        for table, key in ARCHIVE_TABLES.items()
+    ]
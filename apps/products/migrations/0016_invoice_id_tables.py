@@ -0,0 +1,86 @@
+"""
+Keep invoice and invoice line item ids unique across partitions.
+
+Since 0014 the primary keys of the partitioned tables are (id, invoice
+date), so the database alone would accept the same inv_sf_id/ili_sf_id
+twice with different dates, while Django looks rows up (and upserts) by the
+id. Each table gets "<table>_ids", a plain table keyed by the id, kept in
+step by triggers: inserting an id that already exists fails with a unique
+violation on "<table>_ids_pkey", just like the old primary key. A row that
+moves to another partition (its date changed) is a delete plus an insert
+and keeps its id entry.
+
+``create_year_partitions`` moves rows between partitions outside the
+triggers and re-adds their ids itself.
+"""
+from django.db import migrations
+
+# Partitioned table -> id column
+ID_TABLES = {
+    'invoices': 'inv_sf_id',
+    'invoice_line_items': 'ili_sf_id',
+}
+
+
+def _create(table, column):
+    ids = f'{table}_ids'
+    # Row triggers fire in name order: "check_id" runs before the
+    # "date_on_*" triggers of 0014, whose UPDATE may move the row again
+    check = f'{table}_check_id'
+    return [
+        f'CREATE TABLE {ids} AS SELECT {column} FROM {table} WITH NO DATA',
+        f'ALTER TABLE {ids} ADD PRIMARY KEY ({column})',
+        # Fails if duplicates slipped in since 0014
+        f'INSERT INTO {ids} SELECT {column} FROM {table}',
+        f"""
+        CREATE FUNCTION {ids}_sync() RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            IF TG_OP IN ('DELETE', 'UPDATE') THEN
+                DELETE FROM {ids} WHERE {column} = OLD.{column};
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                INSERT INTO {ids} ({column}) VALUES (NEW.{column});
+            END IF;
+            RETURN NULL;
+        END
+        $$
+        """,
+        f"""
+        CREATE FUNCTION {ids}_truncate() RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            TRUNCATE {ids};
+            RETURN NULL;
+        END
+        $$
+        """,
+        f'CREATE TRIGGER {check}_on_insert_delete AFTER INSERT OR DELETE ON {table} '
+        f'FOR EACH ROW EXECUTE FUNCTION {ids}_sync()',
+        f'CREATE TRIGGER {check}_on_update AFTER UPDATE OF {column} ON {table} '
+        f'FOR EACH ROW WHEN (OLD.{column} IS DISTINCT FROM NEW.{column}) EXECUTE FUNCTION {ids}_sync()',
+        f'CREATE TRIGGER {check}_on_truncate AFTER TRUNCATE ON {table} '
+        f'FOR EACH STATEMENT EXECUTE FUNCTION {ids}_truncate()',
+    ]
+
+
+def _drop(table):
+    ids, check = f'{table}_ids', f'{table}_check_id'
+    return [
+        f'DROP TRIGGER {check}_on_truncate ON {table}',
+        f'DROP TRIGGER {check}_on_update ON {table}',
+        f'DROP TRIGGER {check}_on_insert_delete ON {table}',
+        f'DROP FUNCTION {ids}_truncate()',
+        f'DROP FUNCTION {ids}_sync()',
+        f'DROP TABLE {ids}',
+    ]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0015_add_archive_tables'),
+    ]
+
+    operations = [
+        migrations.RunSQL(sql=_create(table, column), reverse_sql=_drop(table))
+        for table, column in ID_TABLES.items()
+    ]
@@ -287,6 +287,13 @@ class Invoice(models.Model):
             models.Index(fields=['inv_invoice_date'], name='idx_invoices_date'),
             models.Index(fields=['inv_status'], name='idx_invoices_status'),
             models.Index(fields=['inv_frame_agreement_id'], name='idx_invoices_frame_agreement'),
+            # Sales analytics: an account's active invoices in a date range
+            models.Index(
+                fields=['inv_account_id', 'inv_invoice_date'],
+                include=['inv_sf_id'],
+                condition=models.Q(inv_active=1),
+                name='idx_invoices_account_date',
+            ),
         ]
 
     def __str__(self):
@@ -301,13 +308,24 @@ class InvoiceLineItem(models.Model):
         db_column='ili_sf_id',
         verbose_name='Salesforce ID'
     )
+    # invoices is partitioned, so the database foreign key is the composite
+    # (ili_invoice_id, ili_invoice_date); see migration 0014
     ili_invoice_id = models.ForeignKey(
         'products.Invoice',
         to_field='inv_sf_id',
         on_delete=models.CASCADE,
         db_column='ili_invoice_id',
+        db_constraint=False,
         verbose_name='Invoice'
     )
+    # Partition key: the invoice's date, filled in by a database trigger
+    ili_invoice_date = models.DateField(
+        null=True,
+        blank=True,
+        editable=False,
+        db_column='ili_invoice_date',
+        verbose_name='Invoice Date'
+    )
     ili_product_id = models.ForeignKey(
         'products.Product',
         to_field='prd_sf_id',
@@ -394,6 +412,13 @@ class InvoiceLineItem(models.Model):
         indexes = [
             models.Index(fields=['ili_invoice_id'], name='idx_invoice_line_items_invoice'),
             models.Index(fields=['ili_product_id'], name='idx_invoice_line_items_product'),
+            # Sales analytics: summed amounts of an invoice's active lines
+            models.Index(
+                fields=['ili_invoice_id'],
+                include=['ili_product_id', 'ili_net_price', 'ili_invoice_date'],
+                condition=models.Q(ili_active=1),
+                name='idx_ili_invoice_amounts',
+            ),
         ]
 
     def __str__(self):
@@ -682,6 +707,14 @@ class ArfRollingForecast(models.Model):
             models.Index(fields=['arf_forecast_date'], name='idx_arf_forecast_date'),
             models.Index(fields=['arf_sync_status'], name='idx_arf_sync_status'),
             models.Index(fields=['arf_retry_count'], name='idx_arf_retry_count'),
+            # Sales analytics and product performance: an account's approved
+            # forecast values in a date range
+            models.Index(
+                fields=['arf_account_id', 'arf_forecast_date'],
+                include=['arf_product_id', 'arf_approved_quantity', 'arf_approved_unit_price', 'arf_active'],
+                condition=models.Q(arf_status='Approved'),
+                name='idx_arf_account_approved',
+            ),
         ]
         constraints = [
             models.CheckConstraint(
@@ -871,6 +904,13 @@ class Order(models.Model):
             models.Index(fields=['ord_owner_id'], name='idx_orders_owner'),
             models.Index(fields=['ord_status'], name='idx_orders_status'),
             models.Index(fields=['ord_effective_date'], name='idx_orders_effective_date'),
+            # Sales analytics: an account's active orders by status and date
+            models.Index(
+                fields=['ord_account_id', 'ord_status', 'ord_effective_date'],
+                include=['ord_sf_id'],
+                condition=models.Q(ord_active=1),
+                name='idx_orders_account_status',
+            ),
         ]
 
     def __str__(self):
@@ -0,0 +1,138 @@
+"""
+Yearly range partitions of invoices and invoice_line_items.
+
+Migration 0014 partitions both tables by invoice date, one partition per
+calendar year ("invoices_y2026") plus a default partition for dates without
+one. Partitions for coming years are created ahead of time by
+``manage.py create_invoice_partitions``; rows that already landed in the
+default partition for such a year are moved into the new partition.
+"""
+from datetime import date
+from typing import Dict, List
+
+from django.db import connection, transaction
+
+# Partitioned table -> partition key column, parent table first
+PARTITIONED_TABLES = {
+    'invoices': 'inv_invoice_date',
+    'invoice_line_items': 'ili_invoice_date',
+}
+
+# Partitioned table -> id column, unique across partitions through the
+# "<table>_ids" table its triggers maintain (migration 0016)
+ID_COLUMNS = {
+    'invoices': 'inv_sf_id',
+    'invoice_line_items': 'ili_sf_id',
+}
+
+# Server settings for queries of one account's invoices (local_settings_cursor).
+# Over several yearly partitions the planner expects enough rows for parallel
+# workers (Gather, Parallel Append), but starting them costs more than the
+# few index scans they would share. Scans of all accounts keep parallelism
+PER_ACCOUNT_QUERY_SETTINGS = {'max_parallel_workers_per_gather': '0'}
+
+INVOICE_FOREIGN_KEY = 'invoice_line_items_invoice_fk'
+INVOICE_FOREIGN_KEY_DEFINITION = (
+    'FOREIGN KEY (ili_invoice_id, ili_invoice_date) REFERENCES invoices (inv_sf_id, inv_invoice_date) '
+    'ON UPDATE CASCADE DEFERRABLE INITIALLY DEFERRED'
+)
+
+
+def partition_name(table: str, year: int) -> str:
+    return f'{table}_y{year}'
+
+
+def partition_years(table: str) -> List[int]:
+    """Years that have a partition of ``table``, ascending."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT child.relname
+            FROM pg_inherits
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE pg_inherits.inhparent = %s::regclass
+            """,
+            [table],
+        )
+        prefix = f'{table}_y'
+        return sorted(
+            int(name[len(prefix):]) for (name,) in cursor.fetchall()
+            if name.startswith(prefix) and name[len(prefix):].isdigit()
+        )
+
+
+def create_year_partitions(year: int) -> Dict[str, int]:
+    """
+    Create the missing partitions for ``year``.
+
+    Normally the default partitions hold no rows of that year and the
+    partitions are simply created. Otherwise each partition is built as a
+    standalone table, filled with the year's rows from the default partition
+    and attached. Moving referenced invoices out of invoices_default would
+    violate the line item foreign key, so it is dropped for the move and
+    added back (revalidating every line item) in the same transaction. The
+    delete from the default partition also drops the moved rows' entries
+    from "<table>_ids"; they are added back once the partition is attached.
+
+    Returns:
+        Table -> rows moved out of its default partition, for the tables
+        that got a partition
+    """
+    start, end = date(year, 1, 1), date(year + 1, 1, 1)
+    bounds = f"FOR VALUES FROM ('{start}') TO ('{end}')"
+    moved: Dict[str, int] = {}
+    with transaction.atomic(), connection.cursor() as cursor:
+        missing = [table for table in PARTITIONED_TABLES if year not in partition_years(table)]
+        stranded = False
+        for table in missing:
+            column = PARTITIONED_TABLES[table]
+            cursor.execute(
+                f'SELECT EXISTS (SELECT 1 FROM {table}_default WHERE {column} >= %s AND {column} < %s)',
+                [start, end],
+            )
+            stranded = stranded or cursor.fetchone()[0]
+
+        if not stranded:
+            for table in missing:
+                cursor.execute(f'CREATE TABLE {partition_name(table, year)} PARTITION OF {table} {bounds}')
+                moved[table] = 0
+            return moved
+
+        cursor.execute(f'ALTER TABLE invoice_line_items DROP CONSTRAINT {INVOICE_FOREIGN_KEY}')
+        for table in missing:
+            column = PARTITIONED_TABLES[table]
+            name = partition_name(table, year)
+            cursor.execute(f'CREATE TABLE {name} (LIKE {table} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)')
+            cursor.execute(
+                f"""
+                WITH stranded AS (
+                    DELETE FROM {table}_default WHERE {column} >= %s AND {column} < %s RETURNING *
+                )
+                INSERT INTO {name} SELECT * FROM stranded
+                """,
+                [start, end],
+            )
+            moved[table] = cursor.rowcount
+            # Builds the parent's indexes and constraints on the partition
+            cursor.execute(f'ALTER TABLE {table} ATTACH PARTITION {name} {bounds}')
+            cursor.execute(f'INSERT INTO {table}_ids SELECT {ID_COLUMNS[table]} FROM {name}')
+        cursor.execute(
+            f'ALTER TABLE invoice_line_items ADD CONSTRAINT {INVOICE_FOREIGN_KEY} {INVOICE_FOREIGN_KEY_DEFINITION}'
+        )
+    return moved
+
+
+def ensure_partitions(from_year: int, to_year: int) -> Dict[int, Dict[str, int]]:
+    """
+    Create the missing yearly partitions for ``from_year`` through ``to_year``.
+
+    Returns:
+        Year -> {table: rows moved from the default partition}, for the
+        years where a partition was created
+    """
+    created = {}
+    for year in range(from_year, to_year + 1):
+        moved = create_year_partitions(year)
+        if moved:
+            created[year] = moved
+    return created
@@ -32,8 +32,8 @@ def _parse_dates(from_month: str, to_month: str) -> Tuple[date, date]:
     return from_date, to_date
 
 
-def _default_month_range() -> Tuple[date, date]:
-    """Current month through same month next year."""
+def default_month_range() -> Tuple[date, date]:
+    """Default RFC window: current month through same month next year."""
     today = date.today()
     from_date = date(today.year, today.month, 1)
     to_year = today.year + 1
@@ -101,6 +101,7 @@ def get_rfc_by_month(
         ili_invoice_id__inv_account_id=account_id,
         ili_product_id__in=products_order,
         ili_invoice_id__inv_invoice_date__range=[ly_from, ly_to],
+        ili_invoice_date__range=[ly_from, ly_to],
         ili_invoice_id__inv_status__in=['Closed', 'Posted'],
         ili_invoice_id__inv_valid=True,
         ili_valid=True,
@@ -6,10 +6,12 @@ from decimal import Decimal
 from typing import Dict, List, Tuple, Any, Optional
 from calendar import monthrange
 
-from django.db import connection
 from django.db.models import Sum, Q
 from apps.accounts.models import Account, FrameAgreement, Target
 from apps.products.models import Invoice
+from apps.products.partition_services import PER_ACCOUNT_QUERY_SETTINGS
+from core.db import local_settings_cursor
+from core.db_router import read_alias
 
 # ISO 4217 currency code → symbol for display (extend as needed)
 CURRENCY_SYMBOLS = {
@@ -85,6 +87,8 @@ class ProductPerformanceService:
         account_filter_actual = "AND inv.inv_account_id = %s" if account_id else ""
         account_filter_forecast = "AND arf.arf_account_id = %s" if account_id else ""
         
+        # The invoice date range is repeated on ili_invoice_date so that
+        # both partitioned tables are pruned to the requested years
         query = f"""
         WITH actual_revenue AS (
             SELECT
@@ -99,6 +103,7 @@ class ProductPerformanceService:
                 invoices inv ON inv.inv_sf_id = ili.ili_invoice_id
             WHERE
                 inv.inv_invoice_date BETWEEN %s AND %s
+                AND ili.ili_invoice_date BETWEEN %s AND %s
                 AND inv.inv_status = 'Closed'
                 AND inv.inv_valid = TRUE
                 AND ili.ili_valid = TRUE
@@ -155,11 +160,12 @@ class ProductPerformanceService:
         
         # Build parameters list based on whether account_id is provided
         if account_id:
-            params = [from_date, to_date, account_id, from_date, to_date, account_id]
+            params = [from_date, to_date, from_date, to_date, account_id, from_date, to_date, account_id]
         else:
-            params = [from_date, to_date, from_date, to_date]
+            params = [from_date, to_date, from_date, to_date, from_date, to_date]
         
-        with connection.cursor() as cursor:
+        settings = PER_ACCOUNT_QUERY_SETTINGS if account_id else {}
+        with local_settings_cursor(read_alias(), settings) as cursor:
             cursor.execute(query, params)
             columns = [col[0] for col in cursor.description]
             results = [dict(zip(columns, row)) for row in cursor.fetchall()]
@@ -15,6 +15,8 @@ from core.api.responses import APIResponse, ErrorResponse
 from core.api.constants import (
     ErrorMessages, SuccessMessages, ErrorCodes, FieldNames, ValidationConstants
 )
+from core.db import read_only_requests
+from core.db_router import replica_reads
 
 from .serializers import (
     ProductPerformanceResponseSerializer,
@@ -28,6 +30,7 @@ from .services import ProductPerformanceService, get_quarterly_performance
 from . import rfc_services
 
 
+@read_only_requests
 class QuarterlyPerformanceAPIView(APIView):
     """
     GET /api/products/performance/achieved/
@@ -108,6 +111,8 @@ class QuarterlyPerformanceAPIView(APIView):
         )
 
 
+@replica_reads
+@read_only_requests
 class ProductDeviationPerformanceAPIView(APIView):
     """
     GET /api/products/performance/deviation/
@@ -209,6 +214,7 @@ class ProductDeviationPerformanceAPIView(APIView):
             )
 
 
+@read_only_requests
 class RfcByMonthAPIView(APIView):
     """
     GET /api/products/rfc-by-month/
@@ -375,7 +381,7 @@ class RfcByMonthAPIView(APIView):
                     errors=[{"field": FieldNames.FROM_TO, "message": ErrorMessages.MONTH_FORMAT_INVALID}],
                 )
         else:
-            from_date, to_date = rfc_services._default_month_range()
+            from_date, to_date = rfc_services.default_month_range()
 
         data = rfc_services.get_rfc_by_month(
             account_id=account_id,
@@ -1,15 +1,25 @@
 """
 Authentication Views
-Handles logout and health check endpoints.
+Handles logout, health check and metrics endpoints.
 """
 import logging
+
+from django.http import HttpRequest, HttpResponse, HttpResponseForbidden
+from django.views.decorators.http import require_GET
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.request import Request
 from rest_framework.response import Response
 
+from core.db import get_pool_stats, read_only_requests
+from core.services import metrics
+
 logger = logging.getLogger(__name__)
 
+# Current pool state reported by the health check; the cumulative counters
+# are in /api/metrics/
+POOL_HEALTH_KEYS = ('pool_min', 'pool_max', 'pool_size', 'pool_available', 'requests_waiting')
+
 
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
@@ -65,6 +75,7 @@ def logout_view(request: Request) -> Response:
     return response
 
 
+@read_only_requests
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def health_check(request: Request) -> Response:
@@ -74,13 +85,38 @@ def health_check(request: Request) -> Response:
     GET /api/health/
     
     Returns:
-        200 OK with status information
+        200 OK with status information, plus this worker's connection pool
+        usage when pooling is enabled
     """
-    return Response(
-        {
-            'status': 'healthy',
-            'service': 'agent360-backend',
-            'timestamp': request.META.get('HTTP_DATE', 'N/A')
-        },
-        status=200
-    )
+    data = {
+        'status': 'healthy',
+        'service': 'agent360-backend',
+        'timestamp': request.META.get('HTTP_DATE', 'N/A')
+    }
+    pool = get_pool_stats()
+    if pool is not None:
+        data['database_pool'] = {key: pool.get(key, 0) for key in POOL_HEALTH_KEYS}
+    return Response(data, status=200)
+
+
+@read_only_requests
+@require_GET
+def metrics_view(request: HttpRequest) -> HttpResponse:
+    """
+    Prometheus scrape endpoint - exempt from ALB auth, limited to the scraper.
+    
+    GET /api/metrics/
+    
+    Plain Django view: the body is the Prometheus text format, not the API
+    envelope. With PROMETHEUS_MULTIPROC_DIR set it covers all gunicorn workers.
+    Requires the METRICS_TOKEN bearer token or a client address in
+    METRICS_ALLOWED_NETWORKS.
+    
+    Returns:
+        200 OK with metrics in Prometheus text exposition format
+        403 Forbidden for any other client
+    """
+    if not metrics.scrape_allowed(request):
+        return HttpResponseForbidden()
+    body, content_type = metrics.render()
+    return HttpResponse(body, content_type=content_type)
@@ -0,0 +1,23 @@
+# Generated by Django 6.0.2 on 2026-10-19 03:57
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0004_update_models_align_with_ddl'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userrole',
+            name='ur_parent_role_id',
+            field=models.ForeignKey(blank=True, db_column='ur_parent_role_id', db_constraint=False, db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='child_roles', to='users.userrole', verbose_name='Parent Role'),
+        ),
+        migrations.AddIndex(
+            model_name='userrole',
+            index=models.Index(fields=['ur_parent_role_id'], name='idx_user_roles_parent'),
+        ),
+    ]
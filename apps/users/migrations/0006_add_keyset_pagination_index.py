@@ -0,0 +1,17 @@
+# Generated by Django 6.0.2 on 2026-10-19 04:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0005_add_user_role_parent'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['usr_active', 'usr_name', 'usr_sf_id'], name='idx_users_active_name'),
+        ),
+    ]
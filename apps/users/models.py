@@ -14,6 +14,19 @@ class UserRole(models.Model):
         db_column='ur_name',
         verbose_name='Role Name'
     )
+    # Salesforce ParentRoleId; users in a role see the records of every role below it
+    ur_parent_role_id = models.ForeignKey(
+        'self',
+        to_field='ur_sf_id',
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        db_constraint=False,
+        db_index=False,
+        db_column='ur_parent_role_id',
+        related_name='child_roles',
+        verbose_name='Parent Role'
+    )
     ur_last_modified_date = models.DateTimeField(
         db_column='ur_last_modified_date',
         verbose_name='Last Modified Date'
@@ -44,6 +57,7 @@ class UserRole(models.Model):
         verbose_name_plural = 'User Roles'
         indexes = [
             models.Index(fields=['ur_active'], name='idx_user_roles_active'),
+            models.Index(fields=['ur_parent_role_id'], name='idx_user_roles_parent'),
         ]
 
     def __str__(self):
@@ -173,6 +187,7 @@ class User(models.Model):
             models.Index(fields=['usr_usage_company'], name='idx_users_usage_company'),
             models.Index(fields=['usr_active'], name='idx_users_active'),
             models.Index(fields=['usr_user_role_id'], name='idx_users_role'),
+            models.Index(fields=['usr_active', 'usr_name', 'usr_sf_id'], name='idx_users_active_name'),
         ]
 
     def __str__(self):
@@ -3,6 +3,7 @@ User API serializers.
 """
 from rest_framework import serializers
 
+from core.api.serializers import CompiledSerializer
 from .models import User
 
 
@@ -22,3 +23,11 @@ class UserListSerializer(serializers.ModelSerializer):
         if obj.usr_user_role_id:
             return obj.usr_user_role_id.ur_name
         return None
+
+
+# Fast path for list endpoints: UserListSerializer compiled to a values_list()
+# row -> item function; the role name comes from the same query via a join
+USER_LIST_COMPILED = CompiledSerializer(
+    UserListSerializer,
+    columns={'role': 'usr_user_role_id__ur_name'},
+)
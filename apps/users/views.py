@@ -1,23 +1,52 @@
 """
 User API views.
 """
+from drf_spectacular.utils import OpenApiParameter, extend_schema
 from rest_framework.permissions import AllowAny
 from rest_framework.views import APIView
 
-from core.api.utils.pagination import StandardPagination
+from core.api.utils.pagination import CursorPagination, StandardPagination, is_cursor_requested
+from core.db import read_only_requests
 
 from .models import User
-from .serializers import UserListSerializer
+from .serializers import USER_LIST_COMPILED
 
 
+@extend_schema(
+    parameters=[
+        OpenApiParameter(
+            name='cursor',
+            type=str,
+            location=OpenApiParameter.QUERY,
+            description=(
+                'Opaque cursor from meta.pagination (empty for the first page); '
+                'enables cursor pagination instead of page numbers'
+            ),
+            required=False,
+        ),
+    ],
+)
+@read_only_requests
 class UserListAPIView(APIView):
     """GET /api/users/ - list all users."""
     permission_classes = [AllowAny]
+    query_budget = 3
+    # usr_name is not unique; usr_sf_id breaks ties for keyset pagination
+    cursor_ordering = ('usr_name', 'usr_sf_id')
 
     def get(self, request):
-        qs = User.objects.select_related('usr_user_role_id').filter(usr_active=1).order_by('usr_name')
+        # Role name is selected through the join, so no select_related needed
+        qs = User.objects.filter(usr_active=1)
+
+        # Cursor pagination: keyset on cursor_ordering, no COUNT(*) or OFFSET
+        if is_cursor_requested(request):
+            paginator = CursorPagination(ordering=self.cursor_ordering)
+            rows = USER_LIST_COMPILED.values(qs, *paginator.columns)
+            page = paginator.paginate_queryset(rows, request)
+            return paginator.get_paginated_response(USER_LIST_COMPILED.serialize(page))
 
         paginator = StandardPagination()
-        page = paginator.paginate_queryset(qs, request)
-        serializer = UserListSerializer(page, many=True)
-        return paginator.get_paginated_response(serializer.data)
+        page = paginator.paginate_queryset(
+            USER_LIST_COMPILED.values(qs.order_by(*self.cursor_ordering)), request
+        )
+        return paginator.get_paginated_response(USER_LIST_COMPILED.serialize(page))
@@ -0,0 +1,13 @@
+"""
+Gunicorn configuration for agent-360-backend.
+
+Bind address, workers and threads are passed on the command line in
+entrypoint.sh; this file only holds server hooks.
+"""
+
+
+def child_exit(server, worker):
+    """Drop the exited worker's live-process samples from /api/metrics/."""
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)
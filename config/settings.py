@@ -31,12 +31,16 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     
     # Third-party apps
     'rest_framework',
     'drf_spectacular',
     'corsheaders',
     
+    # Shared framework code (management commands only, no models)
+    'core',
+    
     # Agent 360 modules — ORDER MATTERS for migrations
     'apps.users',
     'apps.accounts',
@@ -52,8 +56,9 @@ REST_FRAMEWORK = {
     'EXCEPTION_HANDLER': 'core.api.exceptions.custom_exception_handler',
     'DEFAULT_PAGINATION_CLASS': 'core.api.utils.StandardPagination',
     'PAGE_SIZE': 20,
+    # orjson-backed, same output as rest_framework.renderers.JSONRenderer
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
+        'core.api.renderers.FastJSONRenderer',
     ],
     'DEFAULT_PARSER_CLASSES': [
         'rest_framework.parsers.JSONParser',
@@ -130,6 +135,9 @@ CORS_ALLOW_HEADERS = [
 ]
 
 MIDDLEWARE = [
+    'core.middleware.query_budget_middleware.QueryBudgetMiddleware',
+    'core.middleware.metrics_middleware.MetricsMiddleware',
+    'core.middleware.replica_middleware.ReplicaStalenessMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -149,6 +157,39 @@ if os.getenv('ALB_AUTH_ENABLED', 'false').lower() == 'true':
 
 ROOT_URLCONF = 'config.urls'
 
+# Per-request query instrumentation (QueryBudgetMiddleware): X-DB-* response
+# headers, warning threshold for a statement repeated within one request
+# (likely N+1), and whether exceeding a view's query_budget raises instead of
+# logging (always on under the test runner)
+QUERY_BUDGET_HEADERS = os.getenv('QUERY_BUDGET_HEADERS', str(DEBUG)).lower() == 'true'
+QUERY_BUDGET_REPEAT_THRESHOLD = int(os.getenv('QUERY_BUDGET_REPEAT_THRESHOLD', '5'))
+QUERY_BUDGET_ENFORCE = os.getenv('QUERY_BUDGET_ENFORCE', 'false').lower() == 'true'
+TEST_RUNNER = 'core.test_runner.QueryBudgetTestRunner'
+
+# Slow-query log: statements slower than SLOW_QUERY_THRESHOLD_MS (0 disables)
+# are appended to SLOW_QUERY_LOG_PATH with an EXPLAIN (ANALYZE, BUFFERS) plan
+# captured in the background on a separate connection. The file rotates to
+# "<path>.1" at SLOW_QUERY_LOG_MAX_BYTES; a fingerprint is explained at most
+# once per SLOW_QUERY_EXPLAIN_INTERVAL seconds per worker. Summarise with
+# "python manage.py slow_queries"
+SLOW_QUERY_THRESHOLD_MS = float(os.getenv('SLOW_QUERY_THRESHOLD_MS', '500'))
+SLOW_QUERY_LOG_PATH = os.getenv('SLOW_QUERY_LOG_PATH', '/tmp/agent360/slow_queries.jsonl')
+SLOW_QUERY_LOG_MAX_BYTES = int(os.getenv('SLOW_QUERY_LOG_MAX_BYTES', str(5 * 1024 * 1024)))
+SLOW_QUERY_EXPLAIN_INTERVAL = int(os.getenv('SLOW_QUERY_EXPLAIN_INTERVAL', '300'))
+SLOW_QUERY_EXPLAIN_TIMEOUT_MS = int(os.getenv('SLOW_QUERY_EXPLAIN_TIMEOUT_MS', '10000'))
+
+# Prometheus scrape endpoint (/api/metrics/, exempt from ALB auth): served only
+# with "Authorization: Bearer <METRICS_TOKEN>" or to a client address in
+# METRICS_ALLOWED_NETWORKS (comma-separated CIDRs, loopback by default), 403
+# otherwise. Requests through the ALB come from the load balancer's own
+# addresses, so never list its subnets here
+METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')
+METRICS_ALLOWED_NETWORKS = [
+    network.strip()
+    for network in os.getenv('METRICS_ALLOWED_NETWORKS', '127.0.0.1/32,::1/128').split(',')
+    if network.strip()
+]
+
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
@@ -178,9 +219,89 @@ DATABASES = {
         'PORT': os.getenv('DB_PORT', '5432'),
         'ATOMIC_REQUESTS': True,
         'CONN_MAX_AGE': 600,
+        'OPTIONS': {},
     }
 }
 
+# Composite endpoints (account overview): sections run on a shared thread pool,
+# each thread keeping its own DB connection (CONN_MAX_AGE applies), and are
+# reported as timed out after this many seconds
+CONCURRENT_SECTIONS_MAX_WORKERS = int(os.getenv('CONCURRENT_SECTIONS_MAX_WORKERS', '8'))
+ACCOUNT_OVERVIEW_TIMEOUT = float(os.getenv('ACCOUNT_OVERVIEW_TIMEOUT', '5'))
+
+# Connection pooling (psycopg_pool, one pool per gunicorn worker process)
+# instead of a persistent connection per thread. A worker needs at most one
+# connection per request thread, plus one per concurrent-section thread and
+# one for the slow-query EXPLAIN thread; GUNICORN_THREADS is exported by
+# entrypoint.sh. The server sees up to GUNICORN_WORKERS * DB_POOL_MAX_SIZE
+# connections. A request waits DB_POOL_TIMEOUT seconds for a free connection
+# before failing; connections are checked with a round trip on checkout and
+# closed after DB_POOL_MAX_IDLE seconds unused above the minimum
+DB_POOL_ENABLED = os.getenv('DB_POOL_ENABLED', 'false').lower() == 'true'
+GUNICORN_THREADS = int(os.getenv('GUNICORN_THREADS', '2'))
+DB_POOL_MIN_SIZE = int(os.getenv('DB_POOL_MIN_SIZE', str(GUNICORN_THREADS)))
+DB_POOL_MAX_SIZE = int(os.getenv('DB_POOL_MAX_SIZE', str(GUNICORN_THREADS + CONCURRENT_SECTIONS_MAX_WORKERS + 1)))
+DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', '10'))
+DB_POOL_MAX_IDLE = float(os.getenv('DB_POOL_MAX_IDLE', '600'))
+
+if DB_POOL_ENABLED:
+    DATABASES['default'].update({
+        'CONN_MAX_AGE': 0,
+        'CONN_HEALTH_CHECKS': True,
+    })
+    DATABASES['default']['OPTIONS']['pool'] = {
+        'name': 'default',
+        'min_size': DB_POOL_MIN_SIZE,
+        'max_size': DB_POOL_MAX_SIZE,
+        'timeout': DB_POOL_TIMEOUT,
+        'max_idle': DB_POOL_MAX_IDLE,
+    }
+
+# Optional read replica. With DB_REPLICA_HOST set, the "replica" alias (same
+# name and credentials unless overridden) takes the reads of the views marked
+# @replica_reads: sales analytics, product performance and the case/campaign
+# lists (core/db_router.py). Those reads stay on the primary while the replica
+# lags more than REPLICA_MAX_STALENESS seconds, and for that long after a
+# client's own write request. With pooling, the replica gets its own pool of
+# the same size. Tests mirror it to the default test database
+DB_REPLICA_HOST = os.getenv('DB_REPLICA_HOST', '')
+REPLICA_MAX_STALENESS = float(os.getenv('REPLICA_MAX_STALENESS', '5'))
+
+if DB_REPLICA_HOST:
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'NAME': os.getenv('DB_REPLICA_NAME', DATABASES['default']['NAME']),
+        'USER': os.getenv('DB_REPLICA_USER', DATABASES['default']['USER']),
+        'PASSWORD': os.getenv('DB_REPLICA_PASSWORD', DATABASES['default']['PASSWORD']),
+        'HOST': DB_REPLICA_HOST,
+        'PORT': os.getenv('DB_REPLICA_PORT', DATABASES['default']['PORT']),
+        'ATOMIC_REQUESTS': False,
+        'OPTIONS': dict(DATABASES['default']['OPTIONS']),
+        'TEST': {'MIRROR': 'default'},
+    }
+    if DB_POOL_ENABLED:
+        DATABASES['replica']['OPTIONS']['pool'] = {
+            **DATABASES['default']['OPTIONS']['pool'],
+            'name': 'replica',
+        }
+
+DATABASE_ROUTERS = ['core.db_router.ReplicaRouter']
+
+# Page-number pagination totals: "exact" (COUNT(*) per request), "cached"
+# (COUNT(*) shared per filter set for PAGINATION_COUNT_CACHE_TIMEOUT seconds in
+# the default cache) or "estimate" (planner estimate once it reaches
+# PAGINATION_ESTIMATE_THRESHOLD rows, exact below it). Endpoints opt in to
+# "cached"/"estimate" individually, e.g. StandardPagination('estimate')
+PAGINATION_COUNT_STRATEGY = os.getenv('PAGINATION_COUNT_STRATEGY', 'exact')
+PAGINATION_ESTIMATE_THRESHOLD = int(os.getenv('PAGINATION_ESTIMATE_THRESHOLD', '100000'))
+PAGINATION_COUNT_CACHE_TIMEOUT = int(os.getenv('PAGINATION_COUNT_CACHE_TIMEOUT', '30'))
+
+# Archival of soft-deleted rows ("python manage.py archive_inactive_rows"):
+# rows inactive for ARCHIVE_RETENTION_DAYS move to "<table>_archive",
+# ARCHIVE_BATCH_SIZE rows per transaction
+ARCHIVE_RETENTION_DAYS = int(os.getenv('ARCHIVE_RETENTION_DAYS', '365'))
+ARCHIVE_BATCH_SIZE = int(os.getenv('ARCHIVE_BATCH_SIZE', '5000'))
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -5,7 +5,7 @@ from django.contrib import admin
 from django.urls import path, include
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
 from apps.products.urls import sales_urlpatterns
-from apps.users.auth_views import logout_view, health_check
+from apps.users.auth_views import logout_view, health_check, metrics_view
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -13,6 +13,7 @@ urlpatterns = [
     # Authentication endpoints
     path('api/auth/logout/', logout_view, name='auth-logout'),
     path('api/health/', health_check, name='health-check'),
+    path('api/metrics/', metrics_view, name='metrics'),
     
     # App endpoints
     path('api/accounts/', include('apps.accounts.urls')),
@@ -68,6 +68,10 @@ class ErrorMessages:
     # Status & Ordering Errors
     INVALID_STATUS = "Invalid status. Allowed: {allowed}"
     INVALID_ORDERING = "Invalid ordering. Allowed: {allowed}"
+    INVALID_INCLUDE = "Invalid include. Allowed: {allowed}"
+    INVALID_SCOPE = "Invalid scope. Allowed: {allowed}"
+    INVALID_FIELDS = "Invalid fields. Allowed: {allowed}"
+    INVALID_LIMIT = "Must be an integer between 1 and {max}"
     
     # RFC/Update Errors
     ACCOUNT_ID_REQUIRED_BODY = "accountId is required"
@@ -88,6 +92,7 @@ class ErrorMessages:
     
     # Pagination
     PAGE_SIZE_INVALID = "Must be valid integers"
+    INVALID_CURSOR = "Invalid cursor"
 
 
 # ============================================================================
@@ -102,6 +107,8 @@ class SuccessMessages:
     
     # Accounts
     ACCOUNTS_RETRIEVED = "Data retrieved successfully"
+    ACCOUNT_OVERVIEW_RETRIEVED = "Account overview retrieved successfully"
+    ACCOUNT_OVERVIEW_PARTIAL = "Account overview retrieved with incomplete sections"
     
     # Cases
     SUMMARY_RETRIEVED = "Summary retrieved successfully"
@@ -109,6 +116,8 @@ class SuccessMessages:
     COMMENTS_RETRIEVED = "Comments retrieved successfully"
     COMMENT_CREATED = "Comment created successfully"
     TIMELINE_RETRIEVED = "Timeline retrieved successfully"
+    CASE_BUNDLE_RETRIEVED = "Case bundle retrieved successfully"
+    CASE_SEARCH_RETRIEVED = "Search results retrieved successfully"
     
     # Products
     QUARTERLY_PERFORMANCE_RETRIEVED = "Achieved (by quarter or year) retrieved successfully"
@@ -189,8 +198,12 @@ class FieldNames:
     FROM_TO = "from/to"
     STATUS = "status"
     ORDERING = "ordering"
+    INCLUDE = "include"
+    SCOPE = "scope"
+    FIELDS = "fields"
     PAGE = "page"
     PAGE_SIZE = "page_size"
+    CURSOR = "cursor"
     BODY = "body"
     UPDATES = "updates"
     COMMENT_BODY = "comment_body"
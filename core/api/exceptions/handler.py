@@ -3,13 +3,14 @@ Custom Exception Handler
 
 Handles all exceptions and returns standardized error responses.
 """
-from rest_framework.views import exception_handler
+from rest_framework import exceptions
 from rest_framework.exceptions import ValidationError, NotAuthenticated, PermissionDenied
-from django.core.exceptions import ObjectDoesNotExist
+from django.core.exceptions import ObjectDoesNotExist, PermissionDenied as DjangoPermissionDenied
 from django.http import Http404
 from rest_framework import status
 import logging
 
+from core.db import set_rollback
 from ..responses import ErrorResponse
 from ..constants import ErrorMessages
 
@@ -23,8 +24,12 @@ def custom_exception_handler(exc, context):
     This handler catches all exceptions and returns standardized error responses.
     """
     
-    # Call DRF's default exception handler first
-    response = exception_handler(exc, context)
+    # Roll back the request's writes for the exceptions DRF's default
+    # exception_handler handles. That handler is not called: its
+    # set_rollback() would also roll back an atomic block a view runs in
+    # outside the ATOMIC_REQUESTS transaction (see core.db.read_only_requests)
+    if isinstance(exc, (exceptions.APIException, Http404, DjangoPermissionDenied)):
+        set_rollback()
     
     # Log the exception
     view = context.get('view', None)
@@ -101,8 +106,10 @@ def custom_exception_handler(exc, context):
             message=str(exc) if str(exc) else ErrorMessages.RESOURCE_NOT_FOUND
         )
     
-    # Handle other DRF exceptions
-    if response is not None:
+    # Handle other DRF exceptions (and Django's PermissionDenied, as DRF does)
+    if isinstance(exc, DjangoPermissionDenied):
+        exc = exceptions.PermissionDenied(*(exc.args))
+    if isinstance(exc, exceptions.APIException):
         error_message = "An error occurred"
         
         if hasattr(exc, 'detail'):
@@ -115,7 +122,7 @@ def custom_exception_handler(exc, context):
         
         return ErrorResponse.custom(
             message=error_message,
-            status_code=response.status_code,
+            status_code=exc.status_code,
             error_code=exc.__class__.__name__.upper()
         )
     
@@ -3,9 +3,14 @@ Base Response Structure for Agent 360 API
 
 Provides standardized response format for all API endpoints.
 """
-from typing import Any, Optional, Dict, List
+from typing import Any, Optional, Dict, Iterable, List
+from django.http import StreamingHttpResponse
 from rest_framework.response import Response
 from rest_framework import status
+from rest_framework.settings import api_settings
+
+# Items encoded per chunk written to the client by APIResponse.streamed
+STREAM_ITEMS_PER_WRITE = 500
 
 
 class APIResponse:
@@ -147,7 +152,9 @@ class APIResponse:
         page: int,
         page_size: int,
         total_count: int,
-        message: str = "Data retrieved successfully"
+        message: str = "Data retrieved successfully",
+        total_count_exact: bool = True,
+        has_next: Optional[bool] = None
     ) -> Response:
         """
         Return paginated response
@@ -158,6 +165,8 @@ class APIResponse:
             page_size: Items per page
             total_count: Total number of items
             message: Success message
+            total_count_exact: False when total_count is an estimate or cached
+            has_next: Whether another page follows (default: page < total_pages)
             
         Returns:
             Response: DRF Response object with pagination meta
@@ -169,8 +178,9 @@ class APIResponse:
                 "current_page": page,
                 "page_size": page_size,
                 "total_count": total_count,
+                "total_count_exact": total_count_exact,
                 "total_pages": total_pages,
-                "has_next": page < total_pages,
+                "has_next": page < total_pages if has_next is None else has_next,
                 "has_previous": page > 1
             }
         }
@@ -180,3 +190,85 @@ class APIResponse:
             message=message,
             meta=meta
         )
+    
+    @staticmethod
+    def cursor_paginated(
+        data: List[Any],
+        page_size: int,
+        next_cursor: Optional[str],
+        previous_cursor: Optional[str],
+        message: str = "Data retrieved successfully"
+    ) -> Response:
+        """
+        Return cursor paginated response
+        
+        Args:
+            data: List of items for current page
+            page_size: Items per page
+            next_cursor: Opaque cursor for the following page (None on last page)
+            previous_cursor: Opaque cursor for the preceding page (None on first page)
+            message: Success message
+            
+        Returns:
+            Response: DRF Response object with cursor pagination meta
+        """
+        meta = {
+            "pagination": {
+                "page_size": page_size,
+                "next_cursor": next_cursor,
+                "previous_cursor": previous_cursor,
+                "has_next": next_cursor is not None,
+                "has_previous": previous_cursor is not None
+            }
+        }
+        
+        return APIResponse.success(
+            data=data,
+            message=message,
+            meta=meta
+        )
+    
+    @staticmethod
+    def streamed(
+        items: Iterable[Any],
+        message: str = "Data retrieved successfully",
+        status_code: int = status.HTTP_200_OK
+    ) -> StreamingHttpResponse:
+        """
+        Return success response whose data list is written incrementally
+        
+        Produces the same JSON as ``success(data=list(items))`` but encodes
+        ``items`` while iterating it, so only one write buffer is held in
+        memory. Pass a generator over ``queryset.values().iterator()``.
+        
+        Args:
+            items: Iterable of JSON-serialisable items (consumed once)
+            message: Success message
+            status_code: HTTP status code
+            
+        Returns:
+            StreamingHttpResponse: Chunked JSON response
+        """
+        # Encode with the configured renderer so the bytes match success()
+        renderer = api_settings.DEFAULT_RENDERER_CLASSES[0]()
+        head = renderer.render({"success": True, "message": message})[:-1]
+        
+        def generate():
+            buffer = [head, b',"data":[']
+            count = 0
+            for item in items:
+                if count:
+                    buffer.append(b",")
+                buffer.append(renderer.render(item))
+                count += 1
+                if count % STREAM_ITEMS_PER_WRITE == 0:
+                    yield b"".join(buffer)
+                    buffer = []
+            buffer.append(b"]}")
+            yield b"".join(buffer)
+        
+        return StreamingHttpResponse(
+            generate(),
+            status=status_code,
+            content_type="application/json"
+        )
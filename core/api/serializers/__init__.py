@@ -13,7 +13,11 @@ from .base import (
     ListRequestSerializer,
     BulkOperationSerializer,
     IDListRequestSerializer,
+    SparseFieldsetMixin,
+    FIELDS_QUERY_PARAM,
+    requested_fields,
 )
+from .compiled import CompiledSerializer
 
 __all__ = [
     'BaseRequestSerializer',
@@ -25,4 +29,8 @@ __all__ = [
     'ListRequestSerializer',
     'BulkOperationSerializer',
     'IDListRequestSerializer',
+    'SparseFieldsetMixin',
+    'FIELDS_QUERY_PARAM',
+    'requested_fields',
+    'CompiledSerializer',
 ]
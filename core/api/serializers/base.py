@@ -3,8 +3,43 @@ Base Serializers
 
 Provides base serializer classes with common functionality.
 """
+from functools import lru_cache
 from rest_framework import serializers
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Tuple
+
+from ..constants import ErrorMessages, FieldNames
+
+# Query parameter selecting a sparse fieldset, e.g. ?fields=id,name,status
+FIELDS_QUERY_PARAM = 'fields'
+
+
+@lru_cache(maxsize=None)
+def serializer_field_names(serializer_class) -> Tuple[str, ...]:
+    """Output field names of a serializer class, in declaration order"""
+    return tuple(serializer_class().fields)
+
+
+def requested_fields(request, serializer_class) -> Optional[Tuple[str, ...]]:
+    """
+    Fields requested with ``?fields=`` (comma separated)
+    
+    Returns None when the parameter is absent or blank, meaning every
+    field. Names are returned in the serializer's declaration order.
+    
+    Raises:
+        ValidationError: If a name is not a field of ``serializer_class``
+    """
+    raw = request.query_params.get(FIELDS_QUERY_PARAM) or ''
+    names = {name.strip() for name in raw.split(',') if name.strip()}
+    if not names:
+        return None
+    
+    allowed = serializer_field_names(serializer_class)
+    if not names.issubset(allowed):
+        raise serializers.ValidationError({
+            FieldNames.FIELDS: [ErrorMessages.INVALID_FIELDS.format(allowed=', '.join(allowed))],
+        })
+    return tuple(name for name in allowed if name in names)
 
 
 class BaseRequestSerializer(serializers.Serializer):
@@ -62,6 +97,29 @@ class BaseModelSerializer(serializers.ModelSerializer):
         return super().validate(attrs)
 
 
+class SparseFieldsetMixin:
+    """
+    Mixin restricting a serializer's output to a subset of its fields
+    
+    The subset comes from the ``fields`` argument or ``context['fields']``
+    (usually ``requested_fields(request, SerializerClass)``); None keeps
+    every field. List views use ``CompiledSerializer.project`` instead,
+    which also narrows the selected columns.
+    
+    Example:
+        fields = requested_fields(request, AccountListSerializer)
+        serializer = AccountListSerializer(qs, many=True, fields=fields)
+    """
+    
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is None:
+            fields = self.context.get('fields')
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+
 class TimestampedSerializer(serializers.Serializer):
     """Mixin for serializers that include timestamp fields"""
     created_date = serializers.DateTimeField(read_only=True)
@@ -3,7 +3,15 @@ API Utils Module
 
 Provides utility functions and classes for API handling.
 """
-from .pagination import StandardPagination, LargePagination, SmallPagination
+from .pagination import (
+    StandardPagination,
+    LargePagination,
+    SmallPagination,
+    CursorPagination,
+    is_cursor_requested,
+)
+from .conditional import conditional_get, conditional_validators
+from .streaming import STREAM_CHUNK_SIZE, is_stream_requested, batched
 from .validators import (
     validate_salesforce_id,
     validate_email,
@@ -20,6 +28,13 @@ __all__ = [
     'StandardPagination',
     'LargePagination',
     'SmallPagination',
+    'CursorPagination',
+    'is_cursor_requested',
+    'conditional_get',
+    'conditional_validators',
+    'STREAM_CHUNK_SIZE',
+    'is_stream_requested',
+    'batched',
     'validate_salesforce_id',
     'validate_email',
     'validate_phone_number',
@@ -0,0 +1,69 @@
+"""
+Conditional GET Utilities
+
+Provides ETag/Last-Modified handling for read endpoints that are polled.
+"""
+from functools import wraps
+
+from django.utils.cache import patch_cache_control
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
+
+from core.services.metrics import record_cache
+
+CONDITIONAL_GET_CACHE = 'conditional_get'
+
+
+def conditional_validators(request):
+    """
+    Validators the ``conditional_get`` of the running view computed for
+    ``request``: ``(etag, last_modified)``, or None for a missing resource.
+    """
+    return request._conditional_validators
+
+
+def conditional_get(validators_func):
+    """
+    Decorate an APIView ``get`` so unchanged resources answer 304 early
+
+    ``validators_func(request, *args, **kwargs)`` returns ``(etag, last_modified)``
+    or None when the resource does not exist (the view then runs and 404s;
+    ``conditional_validators(request)`` tells it without another query).
+    It is called once per request; If-None-Match / If-Modified-Since are
+    evaluated by Django's ``condition`` before the view queries or serialises
+    anything. Responses are marked ``private, no-cache`` so browsers always
+    revalidate instead of reusing a heuristically fresh copy.
+
+    Args:
+        validators_func: Callable computing the resource validators
+
+    Returns:
+        Method decorator
+    """
+    def _validators(request, *args, **kwargs):
+        if not hasattr(request, '_conditional_validators'):
+            request._conditional_validators = validators_func(request, *args, **kwargs)
+        return request._conditional_validators or (None, None)
+
+    def _etag(request, *args, **kwargs):
+        return _validators(request, *args, **kwargs)[0]
+
+    def _last_modified(request, *args, **kwargs):
+        return _validators(request, *args, **kwargs)[1]
+
+    conditional = method_decorator(condition(etag_func=_etag, last_modified_func=_last_modified))
+
+    def decorator(view_method):
+        conditional_method = conditional(view_method)
+
+        @wraps(view_method)
+        def wrapper(self, request, *args, **kwargs):
+            response = conditional_method(self, request, *args, **kwargs)
+            # A 304 is a hit on the client's copy
+            record_cache(CONDITIONAL_GET_CACHE, response.status_code == 304)
+            patch_cache_control(response, private=True, no_cache=True)
+            return response
+
+        return wrapper
+
+    return decorator
@@ -3,22 +3,207 @@ Pagination Utilities
 
 Provides custom pagination classes for API responses.
 """
-from rest_framework.pagination import PageNumberPagination
+import base64
+import hashlib
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+from functools import partial
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.core.paginator import EmptyPage, Page, PageNotAnInteger, Paginator
+from django.db import connections
+from django.db.models import Q, QuerySet
+from django.utils.functional import cached_property
+from rest_framework.pagination import BasePagination, PageNumberPagination
 from rest_framework.response import Response
+
+from core.services.metrics import record_cache
+
 from ..responses import APIResponse
-from ..constants import SuccessMessages, ValidationConstants
+from ..exceptions import InvalidParameterException
+from ..constants import ErrorMessages, SuccessMessages, ValidationConstants
+
+
+COUNT_EXACT = 'exact'
+COUNT_CACHED = 'cached'
+COUNT_ESTIMATE = 'estimate'
+COUNT_STRATEGIES = (COUNT_EXACT, COUNT_CACHED, COUNT_ESTIMATE)
+
+COUNT_CACHE_PREFIX = 'pagination_count'
+
+
+def estimate_count(queryset):
+    """
+    Planner row estimate for ``queryset``, or None when there is none
+    
+    An unfiltered single-table query reads ``pg_class.reltuples`` (kept
+    current by autovacuum/ANALYZE); anything else is the top-level row
+    estimate of ``EXPLAIN``, which does not execute the query. Returns None
+    on other database vendors and for tables that were never analyzed.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return None
+    
+    query = queryset.query
+    with connection.cursor() as cursor:
+        if not query.where and not query.distinct and len(query.alias_map) <= 1:
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                [connection.ops.quote_name(queryset.model._meta.db_table)]
+            )
+            row = cursor.fetchone()
+            # -1 (PostgreSQL 14+) means the table has never been analyzed
+            return row[0] if row and row[0] >= 0 else None
+        
+        sql, params = queryset.order_by().query.sql_with_params()
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def cached_count(queryset, timeout):
+    """
+    ``queryset.count()`` cached for ``timeout`` seconds
+    
+    The key is a digest of the compiled SQL and parameters, so every
+    distinct filter combination gets its own entry.
+    
+    Returns:
+        tuple: (count, hit) where hit is True when served from the cache
+    """
+    sql, params = queryset.order_by().query.sql_with_params()
+    digest = hashlib.sha256(repr((sql, params)).encode('utf-8')).hexdigest()
+    key = f'{COUNT_CACHE_PREFIX}:{queryset.db}:{digest}'
+    count = cache.get(key)
+    record_cache(COUNT_CACHE_PREFIX, count is not None)
+    if count is not None:
+        return count, True
+    count = queryset.count()
+    cache.set(key, count, timeout)
+    return count, False
+
+
+class CountingPage(Page):
+    """Page whose ``has_next`` can come from a row fetched past it"""
+    
+    def __init__(self, object_list, number, paginator, has_following=None):
+        super().__init__(object_list, number, paginator)
+        self.has_following = has_following
+    
+    def has_next(self):
+        if self.has_following is None:
+            return super().has_next()
+        return self.has_following
+
+
+class CountingPaginator(Paginator):
+    """
+    Django Paginator with a pluggable strategy for the total count
+    
+    - ``exact``: ``COUNT(*)`` on every request (Django's behaviour)
+    - ``cached``: ``COUNT(*)`` shared for ``cache_timeout`` seconds between
+      requests with the same filters; totals may lag writes by that long
+    - ``estimate``: the planner estimate when it is at least
+      ``estimate_threshold`` rows, otherwise ``COUNT(*)``
+    
+    ``count_exact`` tells whether ``count`` is known to be current. When it
+    is not, pages are not cut off at ``count``: any page number is accepted,
+    a page past the real end is empty rather than a 404, a page past an
+    underestimated end still returns its rows, and ``has_next`` comes from
+    one extra row fetched past the page instead of from the count.
+    """
+    
+    def __init__(self, object_list, per_page, *args, count_strategy=COUNT_EXACT,
+                 estimate_threshold=0, cache_timeout=0, **kwargs):
+        if count_strategy not in COUNT_STRATEGIES:
+            raise ValueError(f"Unknown count strategy: {count_strategy!r}")
+        super().__init__(object_list, per_page, *args, **kwargs)
+        self.count_strategy = count_strategy
+        self.estimate_threshold = estimate_threshold
+        self.cache_timeout = cache_timeout
+        self.count_exact = True
+    
+    @cached_property
+    def count(self):
+        """Total number of objects, according to ``count_strategy``"""
+        queryset = self.object_list
+        if not isinstance(queryset, QuerySet):
+            return super().count
+        
+        if self.count_strategy == COUNT_ESTIMATE:
+            estimate = estimate_count(queryset)
+            if estimate is not None and estimate >= self.estimate_threshold:
+                self.count_exact = False
+                return estimate
+        elif self.count_strategy == COUNT_CACHED and self.cache_timeout > 0:
+            count, hit = cached_count(queryset, self.cache_timeout)
+            self.count_exact = not hit
+            return count
+        return queryset.count()
+    
+    def validate_number(self, number):
+        """Only the lower bound is checked when the count is not exact"""
+        self.count  # resolves count_exact
+        if self.count_exact:
+            return super().validate_number(number)
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger(self.error_messages["invalid_page"])
+        if number < 1:
+            raise EmptyPage(self.error_messages["min_page"])
+        return number
+    
+    def page(self, number):
+        """Page ``number``, sliced by offset alone when the count is not exact"""
+        number = self.validate_number(number)
+        if self.count_exact:
+            return super().page(number)
+        bottom = (number - 1) * self.per_page
+        rows = list(self.object_list[bottom:bottom + self.per_page + 1])
+        return CountingPage(
+            rows[:self.per_page], number, self, has_following=len(rows) > self.per_page
+        )
+    
+    def _get_page(self, *args, **kwargs):
+        return CountingPage(*args, **kwargs)
 
 
 class StandardPagination(PageNumberPagination):
     """
     Standard pagination for API endpoints
     
+    The total count follows ``count_strategy`` (default: the
+    PAGINATION_COUNT_STRATEGY setting, see CountingPaginator) and
+    ``meta.pagination.total_count_exact`` says whether it is exact.
+    
     Default: 20 items per page, max 100
     """
     page_size = ValidationConstants.DEFAULT_PAGE_SIZE
     page_size_query_param = 'page_size'
     max_page_size = ValidationConstants.MAX_PAGE_SIZE
     page_query_param = 'page'
+    count_strategy = None
+    
+    def __init__(self, count_strategy=None):
+        if count_strategy is not None:
+            self.count_strategy = count_strategy
+    
+    @property
+    def django_paginator_class(self):
+        """CountingPaginator bound to this pagination's count settings"""
+        return partial(
+            CountingPaginator,
+            count_strategy=self.count_strategy or settings.PAGINATION_COUNT_STRATEGY,
+            estimate_threshold=settings.PAGINATION_ESTIMATE_THRESHOLD,
+            cache_timeout=settings.PAGINATION_COUNT_CACHE_TIMEOUT,
+        )
     
     def get_paginated_response(self, data):
         """Return paginated response in standardized format"""
@@ -27,47 +212,223 @@ class StandardPagination(PageNumberPagination):
             page=self.page.number,
             page_size=self.page.paginator.per_page,
             total_count=self.page.paginator.count,
-            message=SuccessMessages.DATA_RETRIEVED
+            message=SuccessMessages.DATA_RETRIEVED,
+            total_count_exact=self.page.paginator.count_exact,
+            has_next=self.page.has_next()
         )
 
 
-class LargePagination(PageNumberPagination):
+class LargePagination(StandardPagination):
     """
     Pagination for large datasets
     
     Default: 50 items per page, max 200
     """
     page_size = 50
-    page_size_query_param = 'page_size'
     max_page_size = 200
-    page_query_param = 'page'
-    
-    def get_paginated_response(self, data):
-        return APIResponse.paginated(
-            data=data,
-            page=self.page.number,
-            page_size=self.page.paginator.per_page,
-            total_count=self.page.paginator.count,
-            message=SuccessMessages.DATA_RETRIEVED
-        )
 
 
-class SmallPagination(PageNumberPagination):
+class SmallPagination(StandardPagination):
     """
     Pagination for small datasets
     
     Default: 10 items per page, max 50
     """
     page_size = 10
-    page_size_query_param = 'page_size'
     max_page_size = 50
-    page_query_param = 'page'
+
+
+def is_cursor_requested(request, *params):
+    """
+    True if any cursor-mode query param is present (default: ``cursor``)
+    
+    An empty value counts, so ``?cursor=`` asks for the first cursor page.
+    """
+    return any(request.query_params.get(param) is not None for param in params or ('cursor',))
+
+
+class CursorPagination(BasePagination):
+    """
+    Keyset (cursor) pagination for API endpoints
+    
+    Pages are addressed by an opaque cursor holding the ordering key of the
+    boundary row instead of an OFFSET, and no COUNT(*) is issued, so page 500
+    costs the same index range scan as page one.
+    
+    The ordering must be a tuple of non-null fields ending in a unique one
+    (e.g. ``('-cs_sf_created_date', '-cs_sf_id')``) so every row has a
+    distinct position.
+    
+    Views configure it by passing their ordering (usually a ``cursor_ordering``
+    class attribute), e.g. ``CursorPagination(ordering=('acc_name', 'acc_sf_id'))``.
+    When paginating ``values_list()`` rows, select ``columns`` as well.
+    
+    Default: 20 items per page, max 100
+    """
+    page_size = ValidationConstants.DEFAULT_PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = ValidationConstants.MAX_PAGE_SIZE
+    cursor_query_param = 'cursor'
+    ordering = None
+    
+    def __init__(self, ordering=None):
+        if ordering is not None:
+            self.ordering = tuple(ordering)
+        self.next_cursor = None
+        self.previous_cursor = None
+    
+    @property
+    def columns(self):
+        """Field names of the ordering, without direction prefixes"""
+        return tuple(field.lstrip('-') for field in self.ordering)
+    
+    def paginate_queryset(self, queryset, request, view=None):
+        """Return the page of rows following (or preceding) the request cursor"""
+        self.page_size = self.get_page_size(request)
+        position, reverse = self.decode_cursor(request, queryset.model)
+        return self.get_page(queryset, position, reverse)
+    
+    def get_page(self, queryset, position=None, reverse=False):
+        """
+        Return the page after ``position`` (before it when ``reverse``)
+        
+        Sets next_cursor/previous_cursor. With no position this is the first
+        page, which lets callers embed page one without a request cursor.
+        """
+        if not self.ordering:
+            raise ValueError("CursorPagination requires an ordering tuple")
+        
+        ordering = self.ordering
+        if reverse:
+            ordering = tuple(self._invert(field) for field in ordering)
+        
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            queryset = queryset.filter(self._keyset_filter(ordering, position))
+        
+        # Fetch one extra row to learn whether another page follows
+        results = list(queryset[:self.page_size + 1])
+        has_following = len(results) > self.page_size
+        results = results[:self.page_size]
+        
+        if reverse:
+            results.reverse()
+            has_next, has_previous = True, has_following
+        else:
+            has_next, has_previous = has_following, position is not None
+        
+        # values_list() rows are plain tuples; locate the ordering columns by name
+        row_fields = getattr(queryset, '_fields', None)
+        if results and has_next:
+            self.next_cursor = self.encode_cursor(
+                self._position(results[-1], row_fields), reverse=False
+            )
+        if results and has_previous:
+            self.previous_cursor = self.encode_cursor(
+                self._position(results[0], row_fields), reverse=True
+            )
+        
+        return results
     
     def get_paginated_response(self, data):
-        return APIResponse.paginated(
+        """Return cursor paginated response in standardized format"""
+        return APIResponse.cursor_paginated(
             data=data,
-            page=self.page.number,
-            page_size=self.page.paginator.per_page,
-            total_count=self.page.paginator.count,
+            page_size=self.page_size,
+            next_cursor=self.next_cursor,
+            previous_cursor=self.previous_cursor,
             message=SuccessMessages.DATA_RETRIEVED
         )
+    
+    def get_page_size(self, request):
+        """Requested page size clamped to max_page_size; default if missing or invalid"""
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError, TypeError):
+            return self.page_size
+        if size <= 0:
+            return self.page_size
+        return min(size, self.max_page_size)
+    
+    def encode_cursor(self, position, reverse=False):
+        """Encode an ordering key as an opaque URL-safe token"""
+        payload = {"p": [self._dump_value(value) for value in position]}
+        if reverse:
+            payload["r"] = 1
+        raw = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+        return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+    
+    def decode_cursor(self, request, model):
+        """
+        Decode the request cursor into (position, reverse)
+        
+        A missing or empty cursor means the first page: (None, False).
+        
+        Raises:
+            InvalidParameterException: If the cursor is malformed
+        """
+        token = (request.query_params.get(self.cursor_query_param) or '').strip()
+        if not token:
+            return None, False
+        
+        try:
+            padded = token + '=' * (-len(token) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+            values = payload["p"]
+            if not isinstance(values, list) or len(values) != len(self.ordering):
+                raise ValueError(token)
+            position = tuple(
+                model._meta.get_field(field.lstrip('-')).to_python(value)
+                for field, value in zip(self.ordering, values)
+            )
+        except (ValueError, TypeError, KeyError, UnicodeError, DjangoValidationError):
+            raise InvalidParameterException(detail=ErrorMessages.INVALID_CURSOR)
+        
+        return position, bool(payload.get("r"))
+    
+    @staticmethod
+    def _invert(field):
+        return field[1:] if field.startswith('-') else f'-{field}'
+    
+    @staticmethod
+    def _keyset_filter(ordering, position):
+        """
+        Build ``(a, b, ...) > (x, y, ...)`` for the given ordering directions
+        
+        The leading-column bound is repeated outside the OR so the database can
+        turn it into an index range condition.
+        """
+        after = Q()
+        equal = Q()
+        for field, value in zip(ordering, position):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            after |= equal & Q(**{f'{name}__{lookup}': value})
+            equal &= Q(**{name: value})
+        
+        first = ordering[0]
+        lead_lookup = 'lte' if first.startswith('-') else 'gte'
+        return Q(**{f'{first.lstrip("-")}__{lead_lookup}': position[0]}) & after
+    
+    def _position(self, item, row_fields=None):
+        """
+        Ordering key of a model instance, values() row or values_list() row
+        
+        For values_list() rows, ``row_fields`` are the selected column names;
+        the ordering fields must be among them.
+        """
+        names = self.columns
+        if isinstance(item, dict):
+            return tuple(item[name] for name in names)
+        if isinstance(item, tuple):
+            return tuple(item[row_fields.index(name)] for name in names)
+        return tuple(getattr(item, item._meta.get_field(name).attname) for name in names)
+    
+    @staticmethod
+    def _dump_value(value):
+        if isinstance(value, (datetime, date, time)):
+            # Full precision; keyset comparisons must round-trip exactly
+            return value.isoformat()
+        if isinstance(value, Decimal):
+            return str(value)
+        return value
@@ -0,0 +1,27 @@
+"""
+Streaming Utilities
+
+Helpers for writing large unpaginated lists without materialising them.
+"""
+from itertools import islice
+from typing import Any, Iterable, Iterator, List
+
+# Rows fetched per round trip from the server-side cursor
+STREAM_CHUNK_SIZE = 2000
+
+_TRUE_VALUES = ('1', 'true', 'yes')
+
+
+def is_stream_requested(request) -> bool:
+    """True when the client asked for a streamed list (``?stream=true``)."""
+    return (request.query_params.get('stream') or '').strip().lower() in _TRUE_VALUES
+
+
+def batched(iterable: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """Yield lists of up to ``size`` consecutive items from ``iterable``."""
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
@@ -1,12 +1,27 @@
 """
 Database utilities for PostgreSQL connection management.
 """
+import hashlib
 import logging
-from django.db import connection
+import re
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Any, Dict, Iterator, Optional
+
+from django.db import connection, connections, transaction
 from django.db.utils import OperationalError
+from rest_framework.permissions import SAFE_METHODS
 
 logger = logging.getLogger(__name__)
 
+# "IN (%s, %s, ...)" of any length is the same query
+_IN_LIST = re.compile(r'IN \((?:%s, )*%s\)')
+
+# True while a @read_only_requests view serves a safe method, i.e. outside
+# the ATOMIC_REQUESTS transaction
+_outside_request_transaction = ContextVar('outside_request_transaction', default=False)
+
 
 def check_database_connection():
     """
@@ -40,3 +55,114 @@ def get_db_info():
         'host': db_config.get('HOST'),
         'port': db_config.get('PORT'),
     }
+
+
+def get_pool_stats(alias: str = 'default', reset: bool = False) -> Optional[Dict[str, Any]]:
+    """
+    Stats of this process's connection pool for ``alias``.
+
+    Args:
+        alias: Database alias
+        reset: Reset the pool's counters (requests_num, connections_num,
+            ...) after reading them, so the next call returns the increments
+
+    Returns:
+        dict: psycopg_pool stats (pool_size, pool_available,
+        requests_waiting, ...), or None when the alias is not pooled
+    """
+    pool = getattr(connections[alias], 'pool', None)
+    if pool is None:
+        return None
+    return pool.pop_stats() if reset else pool.get_stats()
+
+
+@contextmanager
+def local_settings_cursor(alias: str, settings: Dict[str, str]) -> Iterator[Any]:
+    """
+    Cursor on ``alias`` whose server settings are changed for the queries
+    run on it only (SET LOCAL inside a transaction or savepoint).
+
+    Outside a transaction the COMMIT at the end of the block ends the
+    settings. Inside one, the previous values are put back when the block
+    exits normally; on an error the rollback resets them. Without settings
+    this is a plain cursor.
+
+    Example:
+        with local_settings_cursor('default', {'max_parallel_workers_per_gather': '0'}) as cursor:
+            cursor.execute(query, params)
+    """
+    db = connections[alias]
+    if not settings:
+        with db.cursor() as cursor:
+            yield cursor
+        return
+    restore = db.in_atomic_block
+    with transaction.atomic(using=alias), db.cursor() as cursor:
+        previous = {}
+        for name, value in settings.items():
+            cursor.execute('SELECT current_setting(%s), set_config(%s, %s, true)', [name, name, value])
+            previous[name] = cursor.fetchone()[0]
+        yield cursor
+        if restore:
+            for name, value in previous.items():
+                cursor.execute('SELECT set_config(%s, %s, true)', [name, value])
+
+
+def _atomic_unless_safe(func, request_index: int):
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        if args[request_index].method in SAFE_METHODS:
+            token = _outside_request_transaction.set(True)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                _outside_request_transaction.reset(token)
+        with transaction.atomic():
+            return func(*args, **kwargs)
+    return transaction.non_atomic_requests(wrapper)
+
+
+def set_rollback() -> None:
+    """
+    Mark the request's ATOMIC_REQUESTS transaction for rollback after an
+    exception DRF handles, like DRF's set_rollback().
+
+    Skipped while a ``read_only_requests`` view serves a safe method: there
+    is no request transaction then, and an atomic block that is open belongs
+    to the caller (e.g. a TestCase), which must not be rolled back.
+    """
+    if _outside_request_transaction.get():
+        return
+    for db in connections.all(initialized_only=True):
+        if db.settings_dict['ATOMIC_REQUESTS'] and db.in_atomic_block:
+            db.set_rollback(True)
+
+
+def read_only_requests(view):
+    """
+    Run a view's GET/HEAD/OPTIONS requests outside the ATOMIC_REQUESTS
+    transaction, in autocommit.
+
+    Reads then skip BEGIN/COMMIT and do not stay idle in transaction, holding
+    their table locks, while the response is serialised. Under READ COMMITTED
+    every statement takes its own snapshot either way, so reads see the same
+    data. Other methods of the view still run in a transaction (rolled back
+    when DRF handles an exception, as with ATOMIC_REQUESTS; see
+    ``set_rollback``).
+
+    Works on APIView classes and function views.
+
+    Example:
+        @read_only_requests
+        class UserListAPIView(APIView):
+            ...
+    """
+    if isinstance(view, type):
+        view.dispatch = _atomic_unless_safe(view.dispatch, 1)
+        return view
+    return _atomic_unless_safe(view, 0)
+
+
+def fingerprint(sql: str) -> str:
+    """Short digest of a query's SQL text with IN-list lengths folded."""
+    return hashlib.sha1(_IN_LIST.sub('IN (...)', sql).encode('utf-8')).hexdigest()[:12]
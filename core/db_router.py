@@ -0,0 +1,141 @@
+"""
+Read Replica Routing
+Sends the reads of views marked ``@replica_reads`` to the optional "replica"
+database alias (DB_REPLICA_HOST); everything else, and every write, goes to
+"default".
+
+Reads stay on the primary when the replica lags more than
+REPLICA_MAX_STALENESS seconds, and for REPLICA_MAX_STALENESS seconds after
+a client's own write request (ReplicaStalenessMiddleware sets a cookie), so
+a user always reads their own writes.
+"""
+import logging
+import time
+from contextvars import ContextVar
+from functools import wraps
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+from rest_framework.permissions import SAFE_METHODS
+
+logger = logging.getLogger(__name__)
+
+REPLICA_ALIAS = 'replica'
+PRIMARY_UNTIL_COOKIE = 'db_primary_until'
+
+# Seconds a worker process reuses its last reading of the replica lag
+LAG_CHECK_INTERVAL = 1.0
+
+_replica_reads: ContextVar[bool] = ContextVar('replica_reads', default=False)
+_lag = {'checked_at': float('-inf'), 'seconds': 0.0}
+
+
+def replica_configured() -> bool:
+    return REPLICA_ALIAS in connections.settings
+
+
+def read_alias() -> str:
+    """Alias for raw SQL reads: the replica inside a replica_reads view, else default."""
+    return REPLICA_ALIAS if _replica_reads.get() else DEFAULT_DB_ALIAS
+
+
+def replica_lag() -> float:
+    """
+    Seconds the replica is behind the primary, re-read at most every
+    LAG_CHECK_INTERVAL seconds per process.
+
+    0 when the replica has replayed everything it received (an idle primary
+    does not make it stale) or is not a streaming standby. An unreachable
+    replica counts as infinitely behind until the next check.
+    """
+    now = time.monotonic()
+    if now - _lag['checked_at'] < LAG_CHECK_INTERVAL:
+        return _lag['seconds']
+    try:
+        with connections[REPLICA_ALIAS].cursor() as cursor:
+            cursor.execute(
+                """
+                SELECT CASE
+                    WHEN NOT pg_is_in_recovery() THEN 0
+                    WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+                    ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+                END
+                """
+            )
+            seconds = float(cursor.fetchone()[0])
+    except DatabaseError as e:
+        logger.warning(f'Replica lag check failed, reading from primary: {str(e)}')
+        seconds = float('inf')
+    _lag.update(checked_at=now, seconds=seconds)
+    return seconds
+
+
+def _primary_pinned(request) -> bool:
+    """Whether the client wrote within the last REPLICA_MAX_STALENESS seconds."""
+    try:
+        return float(request.COOKIES.get(PRIMARY_UNTIL_COOKIE, '0')) > time.time()
+    except ValueError:
+        return False
+
+
+def _use_replica(request) -> bool:
+    return (
+        request.method in SAFE_METHODS
+        and replica_configured()
+        and not _primary_pinned(request)
+        and replica_lag() <= settings.REPLICA_MAX_STALENESS
+    )
+
+
+def _replica_unless_stale(func, request_index: int):
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        if not _use_replica(args[request_index]):
+            return func(*args, **kwargs)
+        token = _replica_reads.set(True)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _replica_reads.reset(token)
+    return wrapper
+
+
+def replica_reads(view):
+    """
+    Route a view's GET/HEAD/OPTIONS reads to the replica when it is fresh enough.
+
+    ORM reads are routed by ReplicaRouter; raw SQL must use
+    ``connections[read_alias()]``. Only the view call itself is covered:
+    rows a streaming response fetches while it is written, and section
+    threads, read from the primary. Works on APIView classes and function
+    views.
+
+    Example:
+        @replica_reads
+        @read_only_requests
+        class CaseListAPIView(APIView):
+            ...
+    """
+    if isinstance(view, type):
+        view.dispatch = _replica_unless_stale(view.dispatch, 1)
+        return view
+    return _replica_unless_stale(view, 0)
+
+
+class ReplicaRouter:
+    """Reads inside replica_reads go to the replica, all writes to the primary."""
+
+    def db_for_read(self, model, **hints):
+        return REPLICA_ALIAS if _replica_reads.get() else None
+
+    def db_for_write(self, model, **hints):
+        # Not the instance's own database: a row read from the replica is
+        # saved to the primary
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica gets its schema through replication
+        return False if db == REPLICA_ALIAS else None
@@ -0,0 +1,54 @@
+"""
+Move long-inactive rows of the hot tables to their archive tables.
+
+Run from cron, e.g. nightly; safe to interrupt and re-run:
+
+    python manage.py archive_inactive_rows
+    python manage.py archive_inactive_rows --retention-days 730 --batch-size 1000
+    python manage.py archive_inactive_rows --tables cases case_comments case_history
+    python manage.py archive_inactive_rows --dry-run
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from core.services.archival import archive_inactive_rows, count_archivable
+
+
+class Command(BaseCommand):
+    help = 'Archive rows inactive for longer than the retention window, in batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--retention-days',
+            type=int,
+            help='Days a row has to be inactive (default: ARCHIVE_RETENTION_DAYS)',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            help='Rows moved per transaction (default: ARCHIVE_BATCH_SIZE)',
+        )
+        parser.add_argument(
+            '--tables',
+            nargs='+',
+            help='Only these tables (default: all archived tables)',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only count the rows that would be archived',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            if options['dry_run']:
+                counts = count_archivable(options['retention_days'], options['tables'])
+            else:
+                counts = archive_inactive_rows(
+                    options['retention_days'], options['batch_size'], options['tables']
+                )
+        except ValueError as exc:
+            raise CommandError(str(exc))
+        verb = 'would archive' if options['dry_run'] else 'archived'
+        for table, rows in counts.items():
+            self.stdout.write(f'{table}: {rows} rows {verb}')
+        self.stdout.write(self.style.SUCCESS(f'{sum(counts.values())} rows {verb} in total'))
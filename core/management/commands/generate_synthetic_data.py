@@ -0,0 +1,76 @@
+"""
+Load synthetic accounts, products, invoices, orders, forecasts, cases and
+campaigns for local performance work.
+
+    python manage.py generate_synthetic_data
+    python manage.py generate_synthetic_data --scale 10 --seed 42
+    python manage.py generate_synthetic_data --factor invoices=4 --factor cases=0.5 --clear
+"""
+from datetime import date
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.accounts.services import AccountAccessService
+from core.services.synthetic_data import VOLUMES, SyntheticDataGenerator, clear_synthetic_data
+
+
+def _factor(value):
+    table, _, factor = value.partition('=')
+    try:
+        return table.strip(), float(factor)
+    except ValueError:
+        raise CommandError(f'--factor expects table=number, got {value!r}')
+
+
+class Command(BaseCommand):
+    help = 'Generate synthetic data with COPY (scale 1: 1,000 accounts, ~120k invoice lines)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', type=float, default=1.0, help='Multiplier for users, accounts and products')
+        parser.add_argument('--seed', type=int, default=0, help='Random seed (same seed, same rows)')
+        parser.add_argument(
+            '--factor',
+            action='append',
+            default=[],
+            metavar='TABLE=N',
+            help=f'Multiply one table\'s volume; tables: {", ".join(VOLUMES)}',
+        )
+        parser.add_argument(
+            '--until',
+            type=date.fromisoformat,
+            help='Last date of the generated history, YYYY-MM-DD (default: today)',
+        )
+        parser.add_argument('--clear', action='store_true', help='Delete previously generated rows first')
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Run even with DEBUG off (never against production)',
+        )
+
+    def handle(self, *args, **options):
+        if not settings.DEBUG and not options['force']:
+            raise CommandError('DEBUG is off; pass --force if this really is not production')
+
+        try:
+            generator = SyntheticDataGenerator(
+                scale=options['scale'],
+                seed=options['seed'],
+                factors=dict(_factor(value) for value in options['factor']),
+                until=options['until'],
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        if options['clear']:
+            deleted = sum(clear_synthetic_data().values())
+            self.stdout.write(f'Deleted {deleted} generated rows')
+
+        counts = generator.load(
+            progress=lambda table, rows: self.stdout.write(f'{table:<24} {rows:>10}')
+        )
+        access = AccountAccessService.refresh(full=True)
+        self.stdout.write(self.style.SUCCESS(
+            f'{sum(counts.values())} rows loaded; account_access: '
+            + ', '.join(f'{key}={value}' for key, value in access.items())
+        ))
@@ -0,0 +1,109 @@
+"""
+Summarise the slow-query log.
+
+    python manage.py slow_queries
+    python manage.py slow_queries --sort count --limit 20
+    python manage.py slow_queries --fingerprint 3f2a9c1b7d04
+"""
+import json
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.services.slow_queries import iter_plan_nodes, read_records
+
+SORT_KEYS = {
+    'total': lambda row: row['total_ms'],
+    'count': lambda row: row['count'],
+    'max': lambda row: row['max_ms'],
+    'mean': lambda row: row['total_ms'] / row['count'],
+}
+
+
+def _summarise(records):
+    """Fingerprint -> aggregate of its records, keeping the latest plan."""
+    rows = defaultdict(lambda: {'count': 0, 'total_ms': 0.0, 'max_ms': 0.0, 'sources': defaultdict(int)})
+    for record in records:
+        row = rows[record['fingerprint']]
+        row['fingerprint'] = record['fingerprint']
+        row['count'] += 1
+        row['total_ms'] += record['duration_ms']
+        row['max_ms'] = max(row['max_ms'], record['duration_ms'])
+        row['last_seen'] = record['at']
+        row['sql'] = record['sql']
+        row['sources'][record.get('source') or '-'] += 1
+        if record.get('plan') is not None:
+            row['latest'] = record
+    return list(rows.values())
+
+
+def _seq_scans(plan):
+    return sorted({
+        node['Relation Name'] for node in iter_plan_nodes(plan)
+        if node.get('Node Type') == 'Seq Scan' and 'Relation Name' in node
+    })
+
+
+class Command(BaseCommand):
+    help = 'List the slowest statements of the slow-query log, grouped by fingerprint'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=10, help='Number of fingerprints to list')
+        parser.add_argument(
+            '--sort',
+            choices=sorted(SORT_KEYS),
+            default='total',
+            help='Order by total, count, max or mean duration',
+        )
+        parser.add_argument(
+            '--fingerprint',
+            help='Show the SQL, parameters and latest plan of one fingerprint',
+        )
+        parser.add_argument('--path', help='Log file (default: SLOW_QUERY_LOG_PATH)')
+
+    def handle(self, *args, **options):
+        rows = _summarise(read_records(options['path']))
+        if options['fingerprint']:
+            return self._show(rows, options['fingerprint'])
+        if not rows:
+            self.stdout.write('No slow queries recorded')
+            return
+
+        rows.sort(key=SORT_KEYS[options['sort']], reverse=True)
+        self.stdout.write(
+            f"{'fingerprint':<12}  {'count':>6}  {'total ms':>10}  {'mean ms':>9}  "
+            f"{'max ms':>9}  {'last seen':<19}  top source / sql"
+        )
+        for row in rows[:options['limit']]:
+            source = max(row['sources'], key=row['sources'].get)
+            sql = ' '.join(row['sql'].split())[:100]
+            self.stdout.write(
+                f"{row['fingerprint']:<12}  {row['count']:>6}  {row['total_ms']:>10.1f}  "
+                f"{row['total_ms'] / row['count']:>9.1f}  {row['max_ms']:>9.1f}  "
+                f"{row['last_seen'][:19]:<19}  {source}\n{'':<12}  {sql}"
+            )
+
+    def _show(self, rows, key):
+        row = next((row for row in rows if row['fingerprint'] == key), None)
+        if row is None:
+            raise CommandError(f'No records for fingerprint {key}')
+
+        self.stdout.write(
+            f"{row['count']} occurrences, {row['total_ms']:.1f} ms total, "
+            f"{row['max_ms']:.1f} ms max, last at {row['last_seen']}"
+        )
+        for source, count in sorted(row['sources'].items(), key=lambda item: -item[1]):
+            self.stdout.write(f'  {count:>6}  {source}')
+        self.stdout.write(f"\n{row['sql']}\n")
+
+        latest = row.get('latest')
+        if latest is None:
+            self.stdout.write('No plan captured')
+            return
+        plan = latest['plan']
+        self.stdout.write(f"Parameters: {json.dumps(latest['params'])}")
+        self.stdout.write(
+            f"Plan from {latest['at']}: execution {plan[0].get('Execution Time')} ms, "
+            f"seq scans: {', '.join(_seq_scans(plan)) or 'none'}\n"
+        )
+        self.stdout.write(json.dumps(plan, indent=2))
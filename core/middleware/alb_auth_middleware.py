@@ -5,6 +5,7 @@ Only active when ALB_AUTH_ENABLED=true.
 """
 import json
 import logging
+import time
 from typing import Callable, Optional
 
 from django.http import HttpRequest, HttpResponse
@@ -17,6 +18,7 @@ from core.api.responses import ErrorResponse
 from core.api.constants import ErrorMessages, ErrorCodes
 from core.config.alb_settings import alb_settings
 from core.services.alb_jwt_verifier import ALBJWTVerifier, ALBJWTVerificationError
+from core.services.metrics import AUTH_VERIFICATION
 
 logger = logging.getLogger(__name__)
 
@@ -36,9 +38,11 @@ class ALBAuthMiddleware(MiddlewareMixin):
     - Bypasses all authentication (for local development)
     """
     
-    # Paths that don't require authentication
+    # Paths that don't require authentication (metrics_view checks the
+    # scraper's token or address itself)
     EXEMPT_PATHS = [
         '/api/health/',
+        '/api/metrics/',
         '/admin/login/',
         '/api/schema/',
         '/api/docs/',
@@ -85,15 +89,18 @@ class ALBAuthMiddleware(MiddlewareMixin):
             )
         
         # Verify JWT token
+        started = time.perf_counter()
         try:
             claims = ALBJWTVerifier.verify_token(token)
         except ALBJWTVerificationError as e:
+            AUTH_VERIFICATION.labels(result='error').observe(time.perf_counter() - started)
             logger.error(f"JWT verification failed: {str(e)}")
             return self._render_error_response(
                 message=f'{ErrorMessages.INVALID_AUTH_TOKEN}: {str(e)}',
                 error_code=ErrorCodes.INVALID_AUTH_TOKEN,
                 status_code=status.HTTP_401_UNAUTHORIZED
             )
+        AUTH_VERIFICATION.labels(result='ok').observe(time.perf_counter() - started)
         
         # Extract user info from claims
         user_info = ALBJWTVerifier.extract_user_info(claims)
@@ -0,0 +1,60 @@
+"""
+Metrics Middleware
+Records per-route latency, status codes, DB time and connection pool usage
+for /api/metrics/.
+"""
+import time
+from typing import Callable
+
+from django.core.signals import request_finished
+from django.http import HttpRequest, HttpResponse
+
+from core.services.metrics import (
+    REQUEST_DB_QUERIES,
+    REQUEST_DB_TIME,
+    REQUEST_LATENCY,
+    REQUESTS,
+    UNMATCHED_ROUTE,
+    record_pool_stats,
+)
+
+
+def _sample_pool(sender, **kwargs):
+    # Connected after Django's own request_finished receiver, so the
+    # request's connection is already back in the pool
+    record_pool_stats()
+
+
+class MetricsMiddleware:
+    """
+    Middleware observing every request into the Prometheus metrics.
+
+    - Labels by the matched URL pattern (``api/accounts/<str:account_id>/``),
+      not the path, so series stay bounded however many ids are requested
+    - Takes DB time and query count from the QueryStats that
+      QueryBudgetMiddleware attaches to the request; it must come after
+      QueryBudgetMiddleware in MIDDLEWARE
+    - Samples the connection pool once the request has finished
+    """
+
+    def __init__(self, get_response: Callable):
+        self.get_response = get_response
+        request_finished.connect(_sample_pool, dispatch_uid='metrics_pool_stats')
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        started = time.perf_counter()
+        response = self.get_response(request)
+        elapsed = time.perf_counter() - started
+
+        match = getattr(request, 'resolver_match', None)
+        route = (match.route if match else None) or UNMATCHED_ROUTE
+        method = request.method
+
+        REQUEST_LATENCY.labels(method=method, route=route).observe(elapsed)
+        REQUESTS.labels(method=method, route=route, status=str(response.status_code)).inc()
+
+        stats = getattr(request, 'query_stats', None)
+        if stats is not None:
+            REQUEST_DB_TIME.labels(method=method, route=route).observe(stats.duration)
+            REQUEST_DB_QUERIES.labels(method=method, route=route).observe(stats.count)
+        return response
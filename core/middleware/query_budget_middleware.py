@@ -0,0 +1,171 @@
+"""
+Query Budget Middleware
+Records query count, DB time and repeated queries per request, and checks
+them against the per-endpoint budget declared on the view.
+"""
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack
+from typing import Callable, Dict, List, Optional
+
+from django.conf import settings
+from django.db import connections
+from django.http import HttpRequest, HttpResponse
+
+from core.db import fingerprint
+from core.services.slow_queries import SlowQueryRecorder
+
+logger = logging.getLogger(__name__)
+
+QUERY_COUNT_HEADER = 'X-DB-Query-Count'
+QUERY_TIME_HEADER = 'X-DB-Time-Ms'
+DUPLICATE_QUERIES_HEADER = 'X-DB-Duplicate-Queries'
+
+# Transaction control issued by ATOMIC_REQUESTS/atomic(); not counted as queries
+_TRANSACTION_SQL = re.compile(r'^\s*(SAVEPOINT|RELEASE SAVEPOINT|ROLLBACK TO SAVEPOINT)\b', re.I)
+
+
+class QueryBudgetExceeded(AssertionError):
+    """A view ran more queries than its declared query_budget."""
+
+
+def query_budget(max_queries: int):
+    """
+    Declare the most queries a view may run per request.
+
+    Works on APIView classes and function views; equivalent to setting a
+    ``query_budget`` class attribute.
+
+    Example:
+        @query_budget(3)
+        class UserListAPIView(APIView):
+            ...
+    """
+    def decorator(view):
+        view.query_budget = max_queries
+        return view
+    return decorator
+
+
+class QueryStats:
+    """
+    execute_wrapper collecting the queries of one request.
+
+    Parameters are not part of a fingerprint, so the same statement run for
+    each item of a loop (an N+1) shows up as one fingerprint with a high count.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.fingerprints: Counter = Counter()
+        self.samples: Dict[str, str] = {}
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - started
+            if not _TRANSACTION_SQL.match(sql):
+                self.count += 1
+                key = fingerprint(sql)
+                self.fingerprints[key] += 1
+                self.samples.setdefault(key, sql)
+
+    @property
+    def duration_ms(self) -> float:
+        return round(self.duration * 1000, 1)
+
+    @property
+    def duplicate_count(self) -> int:
+        """Executions beyond the first of each fingerprint."""
+        return sum(count - 1 for count in self.fingerprints.values())
+
+    def repeated(self, threshold: int) -> List[Dict]:
+        """Fingerprints run at least ``threshold`` times, most frequent first."""
+        return [
+            {'fingerprint': key, 'count': count, 'sql': self.samples[key][:200]}
+            for key, count in self.fingerprints.most_common()
+            if count >= threshold
+        ]
+
+
+class QueryBudgetMiddleware:
+    """
+    Middleware instrumenting every database query of a request.
+
+    - Wraps each connection with ``connection.execute_wrapper``
+    - Adds X-DB-Query-Count, X-DB-Time-Ms and X-DB-Duplicate-Queries
+      headers when QUERY_BUDGET_HEADERS is on
+    - Logs a warning for statements repeated QUERY_BUDGET_REPEAT_THRESHOLD
+      times (likely N+1) and for views over their ``query_budget``
+    - Raises QueryBudgetExceeded instead when QUERY_BUDGET_ENFORCE is on
+      (set by the test runner), so the test exercising the view fails
+    - Sends statements over SLOW_QUERY_THRESHOLD_MS to the slow-query log
+    - Exposes the QueryStats as ``request.query_stats`` for inner middleware
+      (MetricsMiddleware)
+
+    Queries run while a streaming response is iterated, or on other threads
+    (concurrent sections), happen outside the request and are not counted.
+    """
+
+    def __init__(self, get_response: Callable):
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        stats = QueryStats()
+        request.query_budget = None
+        request.query_stats = stats
+        slow_queries = SlowQueryRecorder.from_settings(f'{request.method} {request.path}')
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(stats))
+                if slow_queries is not None:
+                    stack.enter_context(connection.execute_wrapper(slow_queries))
+            response = self.get_response(request)
+
+        self._report(request, response, stats)
+        return response
+
+    def process_view(self, request: HttpRequest, view_func, view_args, view_kwargs) -> None:
+        """Remember the budget declared on the resolved view."""
+        view = getattr(view_func, 'view_class', view_func)
+        request.query_budget = getattr(view, 'query_budget', None)
+        return None
+
+    def _report(self, request: HttpRequest, response: HttpResponse, stats: QueryStats) -> None:
+        if getattr(settings, 'QUERY_BUDGET_HEADERS', False):
+            response[QUERY_COUNT_HEADER] = str(stats.count)
+            response[QUERY_TIME_HEADER] = str(stats.duration_ms)
+            response[DUPLICATE_QUERIES_HEADER] = str(stats.duplicate_count)
+
+        summary = {
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'queries': stats.count,
+            'db_time_ms': stats.duration_ms,
+            'duplicates': stats.duplicate_count,
+        }
+        repeated = stats.repeated(getattr(settings, 'QUERY_BUDGET_REPEAT_THRESHOLD', 5))
+        if repeated:
+            logger.warning(
+                f"Repeated queries (possible N+1) on {request.method} {request.path}: {repeated}",
+                extra={'query_stats': summary},
+            )
+        else:
+            logger.debug(f"Query stats: {summary}", extra={'query_stats': summary})
+
+        budget: Optional[int] = getattr(request, 'query_budget', None)
+        if budget is None or stats.count <= budget:
+            return
+        message = (
+            f"{request.method} {request.path} ran {stats.count} queries, "
+            f"budget is {budget}: {stats.repeated(2) or list(stats.samples.values())}"
+        )
+        if getattr(settings, 'QUERY_BUDGET_ENFORCE', False):
+            raise QueryBudgetExceeded(message)
+        logger.warning(message, extra={'query_stats': summary})
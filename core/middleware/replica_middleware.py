@@ -0,0 +1,42 @@
+"""
+Replica Staleness Middleware
+Keeps a client's reads on the primary database for a while after it writes.
+"""
+import math
+import time
+from typing import Callable
+
+from django.conf import settings
+from django.http import HttpRequest, HttpResponse
+from rest_framework.permissions import SAFE_METHODS
+
+from core.db_router import PRIMARY_UNTIL_COOKIE, replica_configured
+
+
+class ReplicaStalenessMiddleware:
+    """
+    Middleware pinning a client to the primary after a write request.
+
+    Any non-GET/HEAD/OPTIONS request sets a cookie holding the time until
+    which ``@replica_reads`` views read from the primary instead of the
+    replica: REPLICA_MAX_STALENESS seconds, the most the replica may lag
+    before all reads fall back to the primary anyway. A no-op without a
+    replica alias.
+    """
+
+    def __init__(self, get_response: Callable):
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        response = self.get_response(request)
+        if request.method not in SAFE_METHODS and replica_configured():
+            staleness = settings.REPLICA_MAX_STALENESS
+            response.set_cookie(
+                PRIMARY_UNTIL_COOKIE,
+                f'{time.time() + staleness:.3f}',
+                max_age=math.ceil(staleness),
+                secure=request.is_secure(),
+                httponly=True,
+                samesite='Lax',
+            )
+        return response
@@ -0,0 +1,195 @@
+"""
+Archival of Soft-Deleted Rows
+Moves rows that have been inactive (``*_active = 0``) for longer than
+ARCHIVE_RETENTION_DAYS out of the hot tables into "<table>_archive", so the
+hot tables and their indexes only carry live rows.
+
+Rows move in batches of ARCHIVE_BATCH_SIZE, each batch one statement
+(DELETE ... RETURNING into INSERT) in its own transaction: an interrupted
+run loses nothing and the next run continues with the rows still left. A
+row archived again after being re-synced replaces its earlier archived copy.
+Line items, order items, comments and history also move when their parent
+is archivable; a parent only moves once no hot row refers to it.
+``manage.py archive_inactive_rows`` runs it; ``with_archive`` reads through
+to the archive for audit queries.
+"""
+import logging
+from datetime import timedelta
+from typing import Dict, List, Optional, Sequence, Type
+
+from django.conf import settings
+from django.db import connection, models, transaction
+from django.db.models.expressions import RawSQL
+from django.db.models.sql.datastructures import BaseTable
+from django.utils import timezone
+
+from apps.cases.models import Case, CaseComment, CaseHistory
+from apps.products.models import ArfRollingForecast, Invoice, InvoiceLineItem, Order, OrderLineItem
+
+logger = logging.getLogger(__name__)
+
+# Archived models with the foreign key to their archived parent, children
+# before their parents
+ARCHIVED_MODELS = [
+    (InvoiceLineItem, 'ili_invoice_id'),
+    (Invoice, None),
+    (OrderLineItem, 'ori_order_id'),
+    (Order, None),
+    (ArfRollingForecast, None),
+    (CaseComment, 'cc_case_id'),
+    (CaseHistory, 'ch_case_id'),
+    (Case, None),
+]
+
+
+def archive_table(model: Type[models.Model]) -> str:
+    return f'{model._meta.db_table}_archive'
+
+
+def _prefix(model: Type[models.Model]) -> str:
+    """Column prefix of a model ("inv" for invoices)."""
+    return model._meta.pk.column.split('_')[0]
+
+
+def _inactive(model: Type[models.Model], alias: str) -> str:
+    prefix = _prefix(model)
+    return f'{alias}.{prefix}_active = 0 AND {alias}.{prefix}_updated_at < %(cutoff)s'
+
+
+def _eligible(model: Type[models.Model], parent_field: Optional[str]) -> str:
+    """WHERE clause (alias "t") of the rows of ``model`` that can be archived."""
+    condition = _inactive(model, 't')
+    if parent_field:
+        field = model._meta.get_field(parent_field)
+        parent = field.related_model
+        condition = (
+            f'({condition} OR EXISTS (SELECT 1 FROM {parent._meta.db_table} p '
+            f'WHERE p.{field.target_field.column} = t.{field.column} AND {_inactive(parent, "p")}))'
+        )
+    for relation in model._meta.related_objects:
+        condition += (
+            f' AND NOT EXISTS (SELECT 1 FROM {relation.related_model._meta.db_table} c '
+            f'WHERE c.{relation.field.column} = t.{relation.field.target_field.column})'
+        )
+    return condition
+
+
+def _archive_batch(model: Type[models.Model], parent_field: Optional[str], cutoff, batch_size: int) -> int:
+    table = model._meta.db_table
+    key = model._meta.pk.column
+    columns = [field.column for field in model._meta.concrete_fields]
+    column_list = ', '.join(columns)
+    updates = ', '.join(f'{column} = EXCLUDED.{column}' for column in columns if column != key)
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            WITH batch AS (
+                SELECT t.{key} FROM {table} t
+                WHERE {_eligible(model, parent_field)}
+                LIMIT %(batch_size)s
+                FOR UPDATE SKIP LOCKED
+            ), moved AS (
+                DELETE FROM {table} t USING batch WHERE t.{key} = batch.{key}
+                RETURNING t.*
+            )
+            INSERT INTO {archive_table(model)} ({column_list})
+            SELECT {column_list} FROM moved
+            ON CONFLICT ({key}) DO UPDATE SET {updates}, archived_at = now()
+            """,
+            {'cutoff': cutoff, 'batch_size': batch_size},
+        )
+        return cursor.rowcount
+
+
+def _selected(tables: Optional[Sequence[str]]):
+    known = [model._meta.db_table for model, _ in ARCHIVED_MODELS]
+    unknown = set(tables or ()) - set(known)
+    if unknown:
+        raise ValueError(f'Not archived: {", ".join(sorted(unknown))}; choose from {", ".join(known)}')
+    return [(model, parent) for model, parent in ARCHIVED_MODELS if not tables or model._meta.db_table in tables]
+
+
+def _cutoff(retention_days: Optional[int]):
+    days = settings.ARCHIVE_RETENTION_DAYS if retention_days is None else retention_days
+    return timezone.now() - timedelta(days=days)
+
+
+def count_archivable(
+    retention_days: Optional[int] = None,
+    tables: Optional[Sequence[str]] = None,
+) -> Dict[str, int]:
+    """
+    Rows each table would archive now, without moving anything.
+
+    Children of an archivable parent are counted, but not parents whose
+    children would only move in the same run.
+    """
+    cutoff = _cutoff(retention_days)
+    counts = {}
+    with connection.cursor() as cursor:
+        for model, parent_field in _selected(tables):
+            cursor.execute(
+                f'SELECT COUNT(*) FROM {model._meta.db_table} t WHERE {_eligible(model, parent_field)}',
+                {'cutoff': cutoff},
+            )
+            counts[model._meta.db_table] = cursor.fetchone()[0]
+    return counts
+
+
+def archive_inactive_rows(
+    retention_days: Optional[int] = None,
+    batch_size: Optional[int] = None,
+    tables: Optional[Sequence[str]] = None,
+) -> Dict[str, int]:
+    """
+    Move rows inactive for longer than the retention window to the archive.
+
+    Args:
+        retention_days: Days a row has to be inactive (default: ARCHIVE_RETENTION_DAYS)
+        batch_size: Rows per transaction (default: ARCHIVE_BATCH_SIZE)
+        tables: Only these tables (default: all of ARCHIVED_MODELS)
+
+    Returns:
+        Table name -> rows archived
+    """
+    batch_size = batch_size or settings.ARCHIVE_BATCH_SIZE
+    cutoff = _cutoff(retention_days)
+    counts = {}
+    for model, parent_field in _selected(tables):
+        table = model._meta.db_table
+        counts[table] = 0
+        while True:
+            moved = _archive_batch(model, parent_field, cutoff, batch_size)
+            counts[table] += moved
+            if moved < batch_size:
+                break
+        if counts[table]:
+            logger.info('Archived %s rows of %s', counts[table], table)
+    return counts
+
+
+def with_archive(queryset: models.QuerySet) -> List[models.Model]:
+    """
+    Rows of ``queryset`` followed by the archived rows matching the same
+    filters, for audit queries that must also see archived data.
+
+    Only the queryset's own table is read through: filters across a
+    relation, self-joins and subqueries still read the hot tables. Archived
+    instances carry ``archived_at``; live ones have it set to None.
+    """
+    model = queryset.model
+    if model not in dict(ARCHIVED_MODELS):
+        raise ValueError(f'{model._meta.db_table} is not archived')
+    if queryset.query.combinator:
+        raise ValueError(f'with_archive() does not support {queryset.query.combinator}()')
+    rows = list(queryset)
+    for row in rows:
+        row.archived_at = None
+
+    # Same query with its base table swapped for the archive: the columns
+    # keep referring to the base alias, other aliases are left alone
+    archived = queryset.all()
+    alias = archived.query.get_initial_alias()
+    archived.query.alias_map[alias] = BaseTable(archive_table(model), alias)
+    archived = archived.annotate(archived_at=RawSQL(f'{connection.ops.quote_name(alias)}.archived_at', ()))
+    return rows + list(archived)
@@ -0,0 +1,152 @@
+"""
+Concurrent Section Runner
+Runs independent read-only service calls in parallel for composite endpoints.
+Each call runs on its pool thread's database connection, with a statement
+timeout and a deadline.
+"""
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from contextlib import ExitStack
+from typing import Any, Callable, Dict
+
+from django.conf import settings
+from django.db import OperationalError, connection, transaction
+from psycopg.errors import QueryCanceled
+
+from core.services.slow_queries import SlowQueryRecorder
+
+logger = logging.getLogger(__name__)
+
+SECTION_OK = 'ok'
+SECTION_TIMEOUT = 'timeout'
+SECTION_ERROR = 'error'
+
+# Shared by all requests of a worker process; bounded so composite endpoints
+# cannot hold more than MAX_WORKERS extra DB connections per process
+MAX_WORKERS = getattr(settings, 'CONCURRENT_SECTIONS_MAX_WORKERS', 8)
+_executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix='sections')
+
+
+class SectionDeadlineExceeded(Exception):
+    """A section tried to run a query after its deadline."""
+
+
+def _deadline_guard(deadline: float):
+    def guard(execute, sql, params, many, context):
+        if time.monotonic() >= deadline:
+            raise SectionDeadlineExceeded('Section deadline passed before the query started')
+        return execute(sql, params, many, context)
+    return guard
+
+
+def _result(status: str, data: Any, started: float) -> Dict[str, Any]:
+    return {
+        'status': status,
+        'data': data,
+        'duration_ms': round((time.monotonic() - started) * 1000, 1),
+    }
+
+
+def _run_section(name: str, func: Callable[[], Any], deadline: float) -> Dict[str, Any]:
+    """
+    Run one section in a pool thread on that thread's connection.
+
+    The section runs in a read transaction whose statement_timeout is the
+    time left until the deadline, so a query that overruns is cancelled by
+    Postgres instead of holding the pool thread, and no query may start
+    after the deadline. The connection stays open for the thread's next
+    section, like a request thread's, unless it is broken or older than
+    CONN_MAX_AGE (with connection pooling it goes back to the pool).
+    Statements over SLOW_QUERY_THRESHOLD_MS go to the slow-query log.
+    """
+    started = time.monotonic()
+    if started >= deadline:
+        return _result(SECTION_TIMEOUT, None, started)
+    connection.close_if_unusable_or_obsolete()
+    try:
+        remaining_ms = max(int((deadline - started) * 1000), 1)
+        with ExitStack() as stack:
+            stack.enter_context(connection.execute_wrapper(_deadline_guard(deadline)))
+            slow_queries = SlowQueryRecorder.from_settings(f'section {name}')
+            if slow_queries is not None:
+                stack.enter_context(connection.execute_wrapper(slow_queries))
+            stack.enter_context(transaction.atomic())
+            with connection.cursor() as cursor:
+                cursor.execute('SET LOCAL statement_timeout = %s', [remaining_ms])
+            data = func()
+        status = SECTION_OK
+    except SectionDeadlineExceeded as e:
+        data = None
+        logger.warning(f'Section {name} stopped: {str(e)}')
+        status = SECTION_TIMEOUT
+    except Exception as e:
+        data = None
+        if isinstance(e, OperationalError) and isinstance(e.__cause__, QueryCanceled):
+            logger.warning(f'Section cancelled by statement_timeout: {str(e)}')
+            status = SECTION_TIMEOUT
+        else:
+            logger.exception(f'Section failed: {str(e)}')
+            status = SECTION_ERROR
+    finally:
+        connection.close_if_unusable_or_obsolete()
+    return _result(status, data, started)
+
+
+def close_section_connections() -> None:
+    """
+    Close the DB connection of every pool thread, e.g. before dropping the
+    database they are connected to. Waits for running sections to finish.
+    """
+    barrier = threading.Barrier(MAX_WORKERS)
+
+    def close():
+        # Holds each thread until every thread has taken one close
+        barrier.wait()
+        connection.close()
+
+    for future in [_executor.submit(close) for _ in range(MAX_WORKERS)]:
+        future.result()
+
+
+def run_sections(
+    sections: Dict[str, Callable[[], Any]],
+    timeout: float,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Run section callables concurrently and collect what finishes in time.
+
+    Args:
+        sections: Section name -> zero-argument callable returning JSON data
+        timeout: Seconds to wait for all sections together
+
+    Returns:
+        Section name -> {"status", "data", "duration_ms"}. Status is "ok",
+        "error" (callable raised) or "timeout" (not done by the deadline;
+        data is None). Order follows ``sections``.
+
+    A section still running at the deadline cannot be interrupted and keeps
+    its pool thread until it returns; its result is discarded. That
+    orphaned work is limited to the query in flight (statement_timeout, set
+    to the time left when the section started, cancels it) and the Python
+    code up to the section's next query, which fails without reaching the
+    database. Sections not started by the deadline are cancelled.
+    """
+    started = time.monotonic()
+    deadline = started + timeout
+    futures = {
+        name: _executor.submit(_run_section, name, func, deadline)
+        for name, func in sections.items()
+    }
+    wait(futures.values(), timeout=timeout)
+
+    results = {}
+    for name, future in futures.items():
+        if future.done():
+            results[name] = future.result()
+        else:
+            future.cancel()
+            logger.warning(f'Section {name} timed out after {timeout}s')
+            results[name] = _result(SECTION_TIMEOUT, None, started)
+    return results
@@ -0,0 +1,176 @@
+"""
+Prometheus Metrics
+Process metrics for request latency, status codes, DB time, cache hit
+ratios, auth verification time and database connection pool usage, exposed
+at /api/metrics/.
+
+Under gunicorn every worker is a separate process with its own counters.
+When PROMETHEUS_MULTIPROC_DIR is set (entrypoint.sh does), prometheus_client
+writes samples to memory-mapped files in that directory and the scrape
+aggregates the files of all workers, whichever worker serves it.
+
+Scrapes are limited to the METRICS_TOKEN bearer token or the
+METRICS_ALLOWED_NETWORKS addresses (scrape_allowed).
+"""
+import hmac
+import ipaddress
+import os
+from typing import Tuple
+
+from django.conf import settings
+from django.http import HttpRequest
+
+from core.db import get_pool_stats
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+# Label for requests that did not resolve to a URL pattern (404s, probes);
+# the raw path would give every unknown URL its own series
+UNMATCHED_ROUTE = '<unmatched>'
+
+CACHE_HIT = 'hit'
+CACHE_MISS = 'miss'
+
+REQUEST_LATENCY = Histogram(
+    'http_request_duration_seconds',
+    'Request latency by route pattern',
+    ['method', 'route'],
+)
+REQUESTS = Counter(
+    'http_requests',
+    'Responses by route pattern and status code',
+    ['method', 'route', 'status'],
+)
+REQUEST_DB_TIME = Histogram(
+    'http_request_db_duration_seconds',
+    'Time spent in database queries per request',
+    ['method', 'route'],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+REQUEST_DB_QUERIES = Histogram(
+    'http_request_db_queries',
+    'Database queries per request',
+    ['method', 'route'],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89),
+)
+CACHE_REQUESTS = Counter(
+    'cache_requests',
+    'Cache lookups by cache and result (hit/miss)',
+    ['cache', 'result'],
+)
+AUTH_VERIFICATION = Histogram(
+    'auth_verification_duration_seconds',
+    'ALB JWT verification time by result',
+    ['result'],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+
+# Connection pool (DB_POOL_ENABLED), sampled after every request. Gauges are
+# summed over the live workers; counters are the increments since the
+# previous sample
+DB_POOL_CONNECTIONS = Gauge(
+    'db_pool_connections',
+    'Pooled connections by state (idle/in_use)',
+    ['state'],
+    multiprocess_mode='livesum',
+)
+DB_POOL_MAX_CONNECTIONS = Gauge(
+    'db_pool_max_connections',
+    'Maximum pool size',
+    multiprocess_mode='livesum',
+)
+DB_POOL_WAITING = Gauge(
+    'db_pool_waiting_requests',
+    'Requests waiting for a pooled connection',
+    multiprocess_mode='livesum',
+)
+DB_POOL_REQUESTS = Counter(
+    'db_pool_requests',
+    'Connection checkouts by result (ok/error: timed out or failed)',
+    ['result'],
+)
+DB_POOL_WAIT_TIME = Counter(
+    'db_pool_wait_seconds',
+    'Time spent waiting for a pooled connection',
+)
+DB_POOL_CONNECTS = Counter(
+    'db_pool_connects',
+    'New server connections opened by the pool, by result (ok/error)',
+    ['result'],
+)
+DB_POOL_LOST = Counter(
+    'db_pool_connections_lost',
+    'Connections discarded as broken on checkout or return',
+)
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    """Count one lookup of ``cache``; the hit ratio is derived at query time."""
+    CACHE_REQUESTS.labels(cache=cache, result=CACHE_HIT if hit else CACHE_MISS).inc()
+
+
+def record_pool_stats(alias: str = 'default') -> None:
+    """Sample this process's connection pool; a no-op without pooling."""
+    stats = get_pool_stats(alias, reset=True)
+    if stats is None:
+        return
+    available = stats.get('pool_available', 0)
+    DB_POOL_CONNECTIONS.labels(state='idle').set(available)
+    DB_POOL_CONNECTIONS.labels(state='in_use').set(stats.get('pool_size', 0) - available)
+    DB_POOL_MAX_CONNECTIONS.set(stats.get('pool_max', 0))
+    DB_POOL_WAITING.set(stats.get('requests_waiting', 0))
+
+    errors = stats.get('requests_errors', 0)
+    DB_POOL_REQUESTS.labels(result='ok').inc(stats.get('requests_num', 0) - errors)
+    DB_POOL_REQUESTS.labels(result='error').inc(errors)
+    DB_POOL_WAIT_TIME.inc(stats.get('requests_wait_ms', 0) / 1000)
+    connect_errors = stats.get('connections_errors', 0)
+    DB_POOL_CONNECTS.labels(result='ok').inc(stats.get('connections_num', 0) - connect_errors)
+    DB_POOL_CONNECTS.labels(result='error').inc(connect_errors)
+    DB_POOL_LOST.inc(stats.get('connections_lost', 0) + stats.get('returns_bad', 0))
+
+
+def scrape_allowed(request: HttpRequest) -> bool:
+    """
+    Whether ``request`` may read the metrics: it carries the METRICS_TOKEN
+    bearer token, or comes from an address in METRICS_ALLOWED_NETWORKS.
+    """
+    token = settings.METRICS_TOKEN
+    if token:
+        scheme, _, credentials = request.META.get('HTTP_AUTHORIZATION', '').partition(' ')
+        if scheme.lower() == 'bearer' and hmac.compare_digest(credentials.encode(), token.encode()):
+            return True
+    try:
+        address = ipaddress.ip_address(request.META.get('REMOTE_ADDR', ''))
+    except ValueError:
+        return False
+    return any(
+        address in ipaddress.ip_network(network, strict=False)
+        for network in settings.METRICS_ALLOWED_NETWORKS
+    )
+
+
+def render() -> Tuple[bytes, str]:
+    """
+    Current metrics in the Prometheus text exposition format.
+
+    Returns:
+        tuple: (body, content_type)
+    """
+    if 'PROMETHEUS_MULTIPROC_DIR' in os.environ:
+        # Fresh registry per scrape: MultiProcessCollector reads the files
+        # of every worker, live or exited, at collection time
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
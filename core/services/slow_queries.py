@@ -0,0 +1,227 @@
+"""
+Slow Query Log
+Records statements slower than SLOW_QUERY_THRESHOLD_MS with their
+parameters, duration and an EXPLAIN (ANALYZE, BUFFERS) plan.
+
+The plan is captured on a background thread with its own connection, so the
+slow request is not delayed further and the EXPLAIN is not part of its
+transaction. Records are JSON lines in SLOW_QUERY_LOG_PATH, rotated to
+"<path>.1" at SLOW_QUERY_LOG_MAX_BYTES so the log stays bounded;
+``manage.py slow_queries`` summarises the top offenders.
+"""
+import json
+import logging
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, Optional
+
+from django.conf import settings
+from django.db import connections, transaction
+
+from core.db import fingerprint
+
+try:
+    import fcntl
+except ImportError:  # Windows: appends are not serialised between processes
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# EXPLAIN ANALYZE runs the statement again, so only reads are explained,
+# in a READ ONLY transaction where a data-modifying CTE fails instead
+_EXPLAINABLE = re.compile(r'^\s*(SELECT|WITH)\b', re.I)
+MAX_SQL_LENGTH = 10000
+# Slow queries waiting for their EXPLAIN; beyond this they are dropped so a
+# database-wide slowdown cannot pile up work (and connections) in the worker
+MAX_PENDING = 20
+
+# One thread per worker process: plans are captured one at a time
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='slow-queries')
+_lock = threading.Lock()
+_pending = 0
+# Fingerprint -> monotonic time of its last EXPLAIN in this process
+_last_explained: Dict[str, float] = {}
+
+
+def _json_safe(value: Any) -> Any:
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, (list, tuple)):
+        return [_json_safe(item) for item in value]
+    if isinstance(value, dict):
+        return {str(key): _json_safe(item) for key, item in value.items()}
+    return str(value)
+
+
+def explain(alias: str, sql: str, params) -> Any:
+    """
+    ``EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON)`` of a statement.
+
+    Runs on the calling thread's connection for ``alias``, in a read-only
+    transaction that is rolled back, with SLOW_QUERY_EXPLAIN_TIMEOUT_MS as
+    statement_timeout.
+
+    Returns:
+        The JSON plan as returned by Postgres
+    """
+    timeout_ms = getattr(settings, 'SLOW_QUERY_EXPLAIN_TIMEOUT_MS', 10000)
+    with transaction.atomic(using=alias):
+        with connections[alias].cursor() as cursor:
+            cursor.execute('SET TRANSACTION READ ONLY')
+            cursor.execute('SET LOCAL statement_timeout = %s', [timeout_ms])
+            cursor.execute(f'EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql}', params)
+            plan = cursor.fetchone()[0]
+        transaction.set_rollback(True, using=alias)
+    return json.loads(plan) if isinstance(plan, str) else plan
+
+
+def iter_plan_nodes(plan: Any) -> Iterator[Dict[str, Any]]:
+    """Every node of a FORMAT JSON plan, depth first."""
+    if isinstance(plan, list):
+        for item in plan:
+            yield from iter_plan_nodes(item)
+        return
+    node = plan.get('Plan', plan)
+    yield node
+    for child in node.get('Plans', []):
+        yield from iter_plan_nodes(child)
+
+
+def write_record(record: Dict[str, Any], path: Optional[str] = None) -> None:
+    """
+    Append one record to the slow-query log.
+
+    Writers hold an exclusive lock, so lines from several gunicorn workers do
+    not interleave. The writer that takes the file past
+    SLOW_QUERY_LOG_MAX_BYTES moves it to "<path>.1", replacing the previous one.
+    """
+    path = path or settings.SLOW_QUERY_LOG_PATH
+    max_bytes = getattr(settings, 'SLOW_QUERY_LOG_MAX_BYTES', 5 * 1024 * 1024)
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    line = json.dumps(record, default=str) + '\n'
+    with open(path, 'a', encoding='utf-8') as log_file:
+        if fcntl:
+            fcntl.flock(log_file, fcntl.LOCK_EX)
+        log_file.write(line)
+        log_file.flush()
+        if log_file.tell() >= max_bytes:
+            os.replace(path, f'{path}.1')
+
+
+def read_records(path: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """Records of the rotated and the current log, oldest first."""
+    path = path or settings.SLOW_QUERY_LOG_PATH
+    for name in (f'{path}.1', path):
+        try:
+            with open(name, encoding='utf-8') as log_file:
+                for line in log_file:
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        continue  # partial line of a concurrent rotation
+        except FileNotFoundError:
+            continue
+
+
+def _capture(record: Dict[str, Any], alias: str, sql: str, params) -> None:
+    """Background half of record_slow_query: EXPLAIN, then append."""
+    global _pending
+    try:
+        if record['explained']:
+            try:
+                record['plan'] = explain(alias, sql, params)
+            except Exception as e:
+                record['explain_error'] = str(e)
+            finally:
+                connections[alias].close()
+        write_record(record)
+    except Exception:
+        logger.exception('Could not write slow query record')
+    finally:
+        with _lock:
+            _pending -= 1
+
+
+def record_slow_query(
+    alias: str,
+    sql: str,
+    params,
+    duration: float,
+    source: Optional[str] = None,
+) -> bool:
+    """
+    Queue a slow statement for the slow-query log.
+
+    Each fingerprint is explained at most once per SLOW_QUERY_EXPLAIN_INTERVAL
+    seconds per process; other occurrences are logged without a plan.
+
+    Returns:
+        bool: False when dropped because MAX_PENDING records are queued
+    """
+    global _pending
+    key = fingerprint(sql)
+    now = time.monotonic()
+    interval = getattr(settings, 'SLOW_QUERY_EXPLAIN_INTERVAL', 300)
+    with _lock:
+        if _pending >= MAX_PENDING:
+            logger.warning(f'Slow query log backlog full, dropped {key} ({duration * 1000:.0f} ms)')
+            return False
+        last = _last_explained.get(key)
+        explained = bool(_EXPLAINABLE.match(sql)) and (last is None or now - last >= interval)
+        if explained:
+            _last_explained[key] = now
+        _pending += 1
+
+    record = {
+        'at': datetime.now(timezone.utc).isoformat(),
+        'fingerprint': key,
+        'duration_ms': round(duration * 1000, 1),
+        'source': source,
+        'alias': alias,
+        'sql': sql[:MAX_SQL_LENGTH],
+        'params': _json_safe(params),
+        'explained': explained,
+    }
+    logger.warning(f'Slow query {key} ({record["duration_ms"]} ms) from {source}')
+    _executor.submit(_capture, record, alias, sql, params)
+    return True
+
+
+def wait_idle(timeout: Optional[float] = None) -> None:
+    """Block until every queued slow query has been written."""
+    _executor.submit(lambda: None).result(timeout)
+
+
+class SlowQueryRecorder:
+    """
+    execute_wrapper sending statements slower than SLOW_QUERY_THRESHOLD_MS
+    to the slow-query log.
+
+    ``source`` (e.g. "GET /api/accounts/") is stored with each record.
+    """
+
+    def __init__(self, threshold_ms: float, source: Optional[str] = None):
+        self.threshold = threshold_ms / 1000
+        self.source = source
+
+    @classmethod
+    def from_settings(cls, source: Optional[str] = None) -> Optional['SlowQueryRecorder']:
+        """Recorder using SLOW_QUERY_THRESHOLD_MS, or None when the log is disabled."""
+        threshold_ms = getattr(settings, 'SLOW_QUERY_THRESHOLD_MS', 0)
+        if threshold_ms <= 0:
+            return None
+        return cls(threshold_ms, source)
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - started
+            # executemany batches have no single plan to capture
+            if duration >= self.threshold and not many:
+                record_slow_query(context['connection'].alias, sql, params, duration, self.source)
@@ -0,0 +1,618 @@
+"""
+Synthetic Data Generator
+Loads realistic volumes of Salesforce-shaped rows with COPY, for local
+performance work: ``manage.py generate_synthetic_data``, the endpoint
+benchmarks and the query-plan tests.
+
+Output is deterministic for a given seed, scale, factors and end date. Every
+generated id is a Salesforce key prefix, then "SYN", then a counter, so
+generated rows can be told apart and removed again (``clear_synthetic_data``).
+"""
+import random
+from datetime import date, datetime, time, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from django.db import connection, models, transaction
+from django.utils import timezone
+
+from apps.accounts.models import Account, AccountAccess, FrameAgreement, Target
+from apps.campaigns.models import Campaign, Task
+from apps.cases.models import Case, CaseComment, CaseHistory
+from apps.products.models import (
+    ArfRollingForecast,
+    Invoice,
+    InvoiceLineItem,
+    Order,
+    OrderLineItem,
+    Product,
+    ProductBrand,
+)
+from apps.products.partition_services import ensure_partitions
+from apps.users.models import User, UserRole
+
+SYNTHETIC_MARKER = 'SYN'
+# LIKE pattern matching every generated id
+SYNTHETIC_ID_PATTERN = f'___{SYNTHETIC_MARKER}%'
+
+# Rows at scale 1. Top-level tables are absolute counts and grow with the
+# scale; the others are mean children per parent row. Each account gets one
+# log-normal size weight applied to all its child tables, so a few accounts
+# are much larger than most across invoices, orders, cases and campaigns.
+VOLUMES: Dict[str, float] = {
+    'user_roles': 10,
+    'users': 50,
+    'accounts': 1000,
+    'product_brands': 20,
+    'products': 500,
+    'frame_agreements': 1,        # share of accounts with one (targets: one per quarter)
+    'invoices': 24,               # per account
+    'invoice_line_items': 5,      # per invoice
+    'orders': 12,                 # per account
+    'order_items': 4,             # per order
+    'arf_rolling_forecasts': 24,  # per account (product x month)
+    'cases': 5,                   # per account
+    'case_comments': 3,           # per case
+    'case_history': 2,            # per case
+    'campaigns': 2,               # root campaigns per account
+    'tasks': 5,                   # per campaign
+}
+TOP_LEVEL = ('user_roles', 'users', 'accounts', 'product_brands', 'products')
+
+# Share of rows soft-deleted (*_active = 0), as left behind by the sync
+INACTIVE_RATE = 0.03
+YEARS = 3
+
+_FIRST_NAMES = ('Anna', 'Ben', 'Clara', 'David', 'Eva', 'Felix', 'Greta', 'Hugo', 'Ida', 'Jonas')
+_LAST_NAMES = ('Schmidt', 'Müller', 'Weber', 'Fischer', 'Meyer', 'Wagner', 'Becker', 'Hoffmann')
+_COMPANY_WORDS = ('Nord', 'Alpen', 'Rhein', 'Main', 'Elbe', 'Donau', 'Harz', 'Spree', 'Isar', 'Weser')
+_COMPANY_SUFFIXES = ('Logistik GmbH', 'Bau AG', 'Agrar KG', 'Transport GmbH', 'Maschinenbau AG')
+_FAMILIES = ('Engine Oil', 'Hydraulics', 'Gear Oil', 'Greases', 'Coolants', 'Filters', 'Additives')
+_AGREEMENT_TYPES = ('Quarterly', 'Quarterly & Volume', 'Growth')
+_CASE_SUBJECTS = (
+    'Delivery delayed', 'Wrong product delivered', 'Invoice amount incorrect',
+    'Damaged packaging', 'Leaking container', 'Missing certificate of analysis',
+)
+_WORDS = (
+    'customer', 'reported', 'delivery', 'invoice', 'container', 'pallet', 'credit',
+    'replacement', 'warehouse', 'driver', 'quality', 'sample', 'order', 'refund',
+)
+
+
+def synthetic_id(prefix: str, number: int) -> str:
+    """18-character Salesforce-style id: key prefix, marker, counter."""
+    return f'{prefix}{SYNTHETIC_MARKER}{number:012d}'
+
+
+def _money(value: float) -> Decimal:
+    return Decimal(value).quantize(Decimal('0.01'))
+
+
+def _copy_columns(model) -> List[models.Field]:
+    """Columns written by COPY: generated columns and serial keys are left to the database."""
+    return [
+        field for field in model._meta.concrete_fields
+        if not isinstance(field, (models.GeneratedField, models.AutoField))
+    ]
+
+
+def copy_rows(model, rows: Iterable[Dict[str, Any]]) -> int:
+    """
+    ``COPY ... FROM STDIN`` of dicts keyed by column name into ``model``'s table.
+
+    Missing columns get the field default, ``now`` for auto_now(_add) fields,
+    and NULL otherwise.
+
+    Returns:
+        int: Rows written
+    """
+    fields = _copy_columns(model)
+    now = timezone.now()
+    defaults = {}
+    for field in fields:
+        if field.has_default():
+            defaults[field.column] = field.get_default()
+        elif getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False):
+            defaults[field.column] = now
+        else:
+            defaults[field.column] = None
+
+    columns = [field.column for field in fields]
+    statement = f'COPY {model._meta.db_table} ({", ".join(columns)}) FROM STDIN'
+    count = 0
+    with connection.cursor() as cursor:
+        with cursor.copy(statement) as copy:
+            for row in rows:
+                copy.write_row(tuple(row.get(column, defaults[column]) for column in columns))
+                count += 1
+    return count
+
+
+class SyntheticDataGenerator:
+    """
+    Generates and loads one synthetic data set.
+
+    Args:
+        scale: Multiplier for the top-level tables (users, accounts, products)
+        seed: Random seed; the same seed gives the same rows
+        factors: Per-table multipliers of VOLUMES, e.g. {'invoices': 2}
+        until: Last date of the generated history (default: today)
+
+    Rows are recorded as loaded (``*_created_at``/``*_updated_at``) at
+    midnight UTC at the start of ``until``: fixed, so a seed always gives
+    the same rows, and never later than a load run on that day.
+    """
+
+    def __init__(
+        self,
+        scale: float = 1.0,
+        seed: int = 0,
+        factors: Optional[Dict[str, float]] = None,
+        until: Optional[date] = None,
+    ):
+        unknown = set(factors or {}) - set(VOLUMES)
+        if unknown:
+            raise ValueError(f'Unknown tables: {", ".join(sorted(unknown))}')
+        self.scale = scale
+        self.factors = dict(factors or {})
+        self.rng = random.Random(seed)
+        self.until = until or date.today()
+        self.since = self.until - timedelta(days=365 * YEARS)
+        # Load time as recorded in the rows
+        self.now = datetime.combine(self.until, time(0), tzinfo=dt_timezone.utc)
+        self._counters: Dict[str, int] = {}
+
+        self.role_ids: List[str] = []
+        self.user_ids: List[str] = []
+        self.accounts: List[Tuple[str, str, float]] = []  # (id, owner id, size weight)
+        self.brands: List[Tuple[str, str]] = []          # (id, name)
+        self.products: List[Tuple[str, str, str, Decimal]] = []  # (id, family, brand, price)
+        self.frame_agreements: List[Tuple[str, str, date]] = []  # (id, account id, start)
+        self.invoices: List[Tuple[str, date]] = []
+        self.orders: List[Tuple[str, date, str]] = []    # (id, effective date, status)
+        self.cases: List[Tuple[str, datetime, str]] = []  # (id, created, status)
+        self.campaigns: List[Tuple[str, str]] = []       # (id, owner id)
+
+    def volume(self, table: str) -> float:
+        """Rows (top-level) or mean rows per parent for ``table``."""
+        volume = VOLUMES[table] * self.factors.get(table, 1)
+        if table in TOP_LEVEL:
+            return max(1, round(volume * self.scale))
+        return volume
+
+    def _children(self, table: str, weight: Optional[float] = None) -> int:
+        """Child rows of one parent: ``weight`` times the mean, else exponentially spread."""
+        mean = self.volume(table)
+        if weight is None:
+            return int(self.rng.expovariate(1 / mean) + 0.5) if mean > 0 else 0
+        expected = mean * weight
+        return int(expected) + (self.rng.random() < expected % 1)
+
+    def _id(self, prefix: str) -> str:
+        number = self._counters.get(prefix, 0) + 1
+        self._counters[prefix] = number
+        return synthetic_id(prefix, number)
+
+    def _active(self) -> int:
+        return 0 if self.rng.random() < INACTIVE_RATE else 1
+
+    def _date(self, start: Optional[date] = None, end: Optional[date] = None) -> date:
+        start, end = start or self.since, end or self.until
+        return start + timedelta(days=self.rng.randint(0, max((end - start).days, 0)))
+
+    def _datetime(self, start: Optional[date] = None, end: Optional[date] = None) -> datetime:
+        moment = datetime.combine(self._date(start, end), time(8), tzinfo=dt_timezone.utc)
+        return moment + timedelta(minutes=self.rng.randint(0, 600))
+
+    def _text(self, words: int) -> str:
+        return ' '.join(self.rng.choice(_WORDS) for _ in range(words)).capitalize() + '.'
+
+    def _audit(self, prefix: str, created: Optional[datetime] = None) -> Dict[str, Any]:
+        """Salesforce and local audit columns shared by most tables."""
+        created = created or self._datetime()
+        # Rows created on the last day are modified no earlier than created
+        modified = max(created, min(created + timedelta(days=self.rng.randint(0, 90)), self.now))
+        return {
+            f'{prefix}_sf_created_date': created,
+            f'{prefix}_last_modified_date': modified,
+            f'{prefix}_last_modified_by_id': self.user_ids[0] if self.user_ids else synthetic_id('005', 1),
+            f'{prefix}_active': self._active(),
+            f'{prefix}_created_at': self.now,
+            f'{prefix}_updated_at': self.now,
+        }
+
+    def _user_roles(self) -> Iterator[Dict[str, Any]]:
+        count = self.volume('user_roles')
+        managers = max(1, min(3, count - 1))
+        for i in range(count):
+            role_id = self._id('00E')
+            self.role_ids.append(role_id)
+            if i == 0:
+                name, parent = 'Head of Sales', None
+            elif i <= managers:
+                name, parent = f'Sales Manager {i}', self.role_ids[0]
+            else:
+                name, parent = f'Sales Rep {i}', self.role_ids[1 + (i % managers)]
+            yield {
+                'ur_sf_id': role_id, 'ur_name': name, 'ur_parent_role_id': parent,
+                'ur_last_modified_date': self.now, 'ur_system_modstamp': self.now,
+                'ur_active': 1, 'ur_created_at': self.now, 'ur_updated_at': self.now,
+            }
+
+    def _users(self) -> Iterator[Dict[str, Any]]:
+        for i in range(self.volume('users')):
+            user_id = self._id('005')
+            self.user_ids.append(user_id)
+            first, last = self.rng.choice(_FIRST_NAMES), self.rng.choice(_LAST_NAMES)
+            email = f'{first}.{last}.{i}@synthetic.example'.lower()
+            row = self._audit('usr')
+            row.update({
+                'usr_sf_id': user_id, 'usr_username': email, 'usr_email': email,
+                'usr_first_name': first, 'usr_last_name': last, 'usr_name': f'{first} {last}',
+                'usr_is_active': self.rng.random() > 0.05,
+                'usr_user_role_id': self.role_ids[i % len(self.role_ids)],
+                'usr_time_zone': 'Europe/Berlin', 'usr_language': 'de',
+            })
+            yield row
+
+    def _accounts(self) -> Iterator[Dict[str, Any]]:
+        for i in range(self.volume('accounts')):
+            account_id = self._id('001')
+            owner = self.rng.choice(self.user_ids)
+            # Mean 1; the largest accounts are around ten times the average
+            self.accounts.append((account_id, owner, self.rng.lognormvariate(-0.5, 1)))
+            credit = _money(self.rng.choice((25_000, 50_000, 100_000, 250_000)))
+            row = self._audit('acc')
+            row.update({
+                'acc_sf_id': account_id,
+                'acc_name': f'{self.rng.choice(_COMPANY_WORDS)} {self.rng.choice(_COMPANY_SUFFIXES)} {i + 1}',
+                'acc_owner_id': owner,
+                'acc_credit_limit': credit,
+                'acc_invoice_open_amount': _money(float(credit) * self.rng.random() * 0.5),
+                'acc_order_open_amount': _money(float(credit) * self.rng.random() * 0.3),
+                'acc_account_number': f'D{100000 + i}',
+                'acc_currency_iso_code': 'EUR',
+            })
+            yield row
+
+    def _frame_agreements(self) -> Iterator[Dict[str, Any]]:
+        year = self.until.year
+        share = min(self.volume('frame_agreements'), 1)
+        for account_id, _, _ in self.accounts:
+            if self.rng.random() < share:
+                fa_id = self._id('a0F')
+                start = date(year, 1, 1)
+                self.frame_agreements.append((fa_id, account_id, start))
+                ty = self.rng.uniform(50_000, 500_000)
+                row = self._audit('fa')
+                row.update({
+                    'fa_sf_id': fa_id, 'fa_account_id': account_id,
+                    'fa_agreement_type': self.rng.choice(_AGREEMENT_TYPES),
+                    'fa_start_date': start, 'fa_end_date': date(year, 12, 31),
+                    'fa_start_year': year, 'fa_status': 'Activated', 'fa_is_active': True,
+                    'fa_total_sales_ty': _money(ty),
+                    'fa_total_sales_ly': _money(ty * self.rng.uniform(0.7, 1.2)),
+                })
+                yield row
+
+    def _targets(self) -> Iterator[Dict[str, Any]]:
+        for fa_id, account_id, _ in self.frame_agreements:
+            for quarter in ('Q1', 'Q2', 'Q3', 'Q4'):
+                target = _money(self.rng.uniform(10_000, 150_000))
+                rate = _money(self.rng.choice((1, 2, 3, 5)))
+                row = self._audit('tgt')
+                row.update({
+                    'tgt_sf_id': self._id('a0T'), 'tgt_account_id': account_id,
+                    'tgt_frame_agreement_id': fa_id, 'tgt_quarter': quarter,
+                    'tgt_net_turnover_target': target, 'tgt_rebate_rate': rate,
+                    'tgt_rebate_if_achieved': _money(float(target) * float(rate) / 100),
+                })
+                yield row
+
+    def _product_brands(self) -> Iterator[Dict[str, Any]]:
+        for i in range(self.volume('product_brands')):
+            brand_id = self._id('a0B')
+            name = f'{self.rng.choice(_COMPANY_WORDS)}Lube {i + 1}'
+            self.brands.append((brand_id, name))
+            row = self._audit('pb')
+            row.update({
+                'pb_sf_id': brand_id, 'pb_name': name, 'pb_brand_code': f'B{i + 1:03d}',
+                'pb_is_active': True,
+            })
+            yield row
+
+    def _products(self) -> Iterator[Dict[str, Any]]:
+        for i in range(self.volume('products')):
+            product_id = self._id('01t')
+            family = self._family()
+            brand_id, brand = self.rng.choice(self.brands)
+            price = _money(self.rng.lognormvariate(3.5, 0.8))
+            self.products.append((product_id, family, brand, price))
+            row = self._audit('prd')
+            row.update({
+                'prd_sf_id': product_id, 'prd_name': f'{brand} {family} {i + 1}',
+                'prd_family': family, 'prd_classification': self.rng.choice(('A', 'B', 'C')),
+                'prd_central_product_code': f'C{i + 1:06d}', 'prd_product_code': f'P-{i + 1:06d}',
+                'prd_product_brand_id': brand_id, 'prd_brand': brand, 'prd_is_active': True,
+            })
+            yield row
+
+    def _family(self) -> str:
+        # A few families carry most of the catalogue
+        return self.rng.choices(_FAMILIES, weights=(30, 20, 15, 12, 10, 8, 5))[0]
+
+    def _product(self) -> Tuple[str, str, str, Decimal]:
+        # Popular products sell far more often than the long tail (the top
+        # 1% get about a fifth of the lines); the stride spreads them over ids
+        index = int(len(self.products) * self.rng.random() ** 3)
+        return self.products[(index * 7919) % len(self.products)]
+
+    def _invoices(self) -> Iterator[Dict[str, Any]]:
+        for account_id, _, weight in self.accounts:
+            for _ in range(self._children('invoices', weight)):
+                invoice_id = self._id('a0I')
+                invoice_date = self._date()
+                self.invoices.append((invoice_id, invoice_date))
+                credit_note = self.rng.random() < 0.05
+                net = self.rng.uniform(200, 20_000) * (-1 if credit_note else 1)
+                row = self._audit('inv', self._datetime(invoice_date, invoice_date))
+                row.update({
+                    'inv_sf_id': invoice_id, 'inv_name': f'INV-{invoice_id[-8:]}',
+                    'inv_account_id': account_id, 'inv_invoice_date': invoice_date,
+                    'inv_invoice_year': str(invoice_date.year),
+                    'inv_invoice_type': 'Credit Note' if credit_note else 'Invoice',
+                    'inv_status': 'Closed' if invoice_date < self.until - timedelta(days=30) else 'Open',
+                    'inv_net_price': _money(net), 'inv_total_vat': _money(net * 0.19),
+                    'inv_total_invoice_value': _money(net * 1.19), 'inv_valid': self.rng.random() > 0.02,
+                    'inv_currency_iso_code': 'EUR',
+                })
+                yield row
+
+    def _invoice_line_items(self) -> Iterator[Dict[str, Any]]:
+        for invoice_id, invoice_date in self.invoices:
+            for _ in range(max(self._children('invoice_line_items'), 1)):
+                line_id = self._id('a0L')
+                product_id, _, _, price = self._product()
+                quantity = Decimal(self.rng.randint(1, 200))
+                row = self._audit('ili', self._datetime(invoice_date, invoice_date))
+                row.update({
+                    'ili_sf_id': line_id, 'ili_invoice_id': invoice_id, 'ili_invoice_date': invoice_date,
+                    'ili_product_id': product_id,
+                    'ili_quantity': quantity, 'ili_unit_price': price,
+                    'ili_net_price': _money(float(quantity * price)),
+                    'ili_vat': _money(float(quantity * price) * 0.19),
+                    'ili_unique_line_code': line_id, 'ili_status': 'Closed', 'ili_valid': True,
+                })
+                yield row
+
+    def _orders(self) -> Iterator[Dict[str, Any]]:
+        for account_id, owner, weight in self.accounts:
+            for _ in range(self._children('orders', weight)):
+                order_id = self._id('801')
+                effective = self._date()
+                recent = effective > self.until - timedelta(days=90)
+                status = self.rng.choice(('Open', 'Open', 'Draft')) if recent else 'Closed'
+                self.orders.append((order_id, effective, status))
+                total = self.rng.uniform(500, 30_000)
+                open_share = self.rng.random() if status == 'Open' else 0
+                row = self._audit('ord', self._datetime(effective, effective))
+                row.update({
+                    'ord_sf_id': order_id, 'ord_order_number': f'{self._counters["801"]:08d}',
+                    'ord_account_id': account_id, 'ord_status': status, 'ord_effective_date': effective,
+                    'ord_expected_delivery_date': effective + timedelta(days=self.rng.randint(2, 21)),
+                    'ord_type': 'Standard', 'ord_total_amount': _money(total),
+                    'ord_open_amount': _money(total * open_share),
+                    'ord_delivered_amount': _money(total * (1 - open_share)),
+                    'ord_currency_iso_code': 'EUR', 'ord_owner_id': owner,
+                })
+                yield row
+
+    def _order_items(self) -> Iterator[Dict[str, Any]]:
+        for order_id, effective, status in self.orders:
+            for _ in range(max(self._children('order_items'), 1)):
+                product_id, family, brand, price = self._product()
+                quantity = Decimal(self.rng.randint(1, 100))
+                total = quantity * price
+                open_amount = total if status == 'Open' else Decimal('0')
+                row = self._audit('ori', self._datetime(effective, effective))
+                row.update({
+                    'ori_sf_id': self._id('802'), 'ori_order_id': order_id, 'ori_product_id': product_id,
+                    'ori_product_name': f'{brand} {family}', 'ori_quantity': quantity,
+                    'ori_unit_price': price, 'ori_total_price': _money(float(total)),
+                    'ori_open_amount': _money(float(open_amount)),
+                    'ori_ordered_amount': _money(float(total)), 'ori_ordered_quantity': quantity,
+                    'ori_open_quantity': quantity if status == 'Open' else Decimal('0'),
+                    'ori_status': status,
+                })
+                yield row
+
+    def _arf_rolling_forecasts(self) -> Iterator[Dict[str, Any]]:
+        first_month = date(self.until.year - 1, 1, 1)
+        for account_id, owner, weight in self.accounts:
+            for _ in range(self._children('arf_rolling_forecasts', weight)):
+                product_id, family, brand, price = self._product()
+                month = self._date(first_month, date(self.until.year, 12, 1)).replace(day=1)
+                quantity = Decimal(self.rng.randint(10, 500))
+                value = _money(float(quantity * price))
+                status = self.rng.choices(
+                    ('Approved', 'Draft', 'Pending_Approval', 'Frozen'), weights=(60, 20, 15, 5)
+                )[0]
+                arf_id = self._id('a0R')
+                yield {
+                    'arf_sf_id': arf_id, 'arf_name': f'ARF-{arf_id[-8:]}', 'arf_account_id': account_id,
+                    'arf_sales_rep_id': owner, 'arf_product_id': product_id, 'arf_forecast_date': month,
+                    'arf_status': status, 'arf_currency_iso_code': 'EUR', 'arf_owner_id': owner,
+                    'arf_draft_quantity': quantity, 'arf_draft_unit_price': price, 'arf_draft_value': value,
+                    'arf_approved_quantity': quantity if status == 'Approved' else None,
+                    'arf_approved_unit_price': price if status == 'Approved' else None,
+                    'arf_approved_value': value if status == 'Approved' else None,
+                    'arf_product_family': family, 'arf_product_brand': brand,
+                    'arf_active': self._active(), 'arf_created_at': self.now, 'arf_updated_at': self.now,
+                }
+
+    def _cases(self) -> Iterator[Dict[str, Any]]:
+        for account_id, owner, weight in self.accounts:
+            for _ in range(self._children('cases', weight)):
+                case_id = self._id('500')
+                created = self._datetime()
+                status = 'Closed' if created.date() < self.until - timedelta(days=60) else (
+                    self.rng.choice(('New', 'Working', 'Escalated', 'Closed'))
+                )
+                self.cases.append((case_id, created, status))
+                row = self._audit('cs', created)
+                row.update({
+                    'cs_sf_id': case_id, 'cs_case_number': f'{self._counters["500"]:08d}',
+                    'cs_subject': self.rng.choice(_CASE_SUBJECTS), 'cs_description': self._text(25),
+                    'cs_status': status, 'cs_account_id': account_id, 'cs_owner_id': owner,
+                    'cs_priority': self.rng.choice(('Low', 'Medium', 'High')),
+                })
+                yield row
+
+    def _case_comments(self) -> Iterator[Dict[str, Any]]:
+        for case_id, created, _ in self.cases:
+            for n in range(self._children('case_comments')):
+                at = created + timedelta(hours=4 * (n + 1))
+                yield {
+                    'cc_sf_id': self._id('00a'), 'cc_case_id': case_id, 'cc_comment_body': self._text(15),
+                    'cc_is_published': True, 'cc_sf_created_date': at, 'cc_last_modified_date': at,
+                    'cc_sf_created_by_id': self.rng.choice(self.user_ids),
+                    'cc_active': self._active(), 'cc_created_at': self.now, 'cc_updated_at': self.now,
+                }
+
+    def _case_history(self) -> Iterator[Dict[str, Any]]:
+        for case_id, created, status in self.cases:
+            for n in range(self._children('case_history')):
+                yield {
+                    'ch_sf_id': self._id('017'), 'ch_case_id': case_id, 'ch_field': 'Status',
+                    'ch_old_value': 'New', 'ch_new_value': status,
+                    'ch_created_date': created + timedelta(hours=2 * (n + 1)),
+                    'ch_created_by_id': self.rng.choice(self.user_ids),
+                    'ch_active': 1, 'ch_created_at': self.now, 'ch_updated_at': self.now,
+                }
+
+    def _campaigns(self) -> Iterator[Dict[str, Any]]:
+        for account_id, owner, weight in self.accounts:
+            for _ in range(self._children('campaigns', weight)):
+                # A root campaign with up to two levels of children
+                parents = [None]
+                for depth in range(self.rng.randint(1, 3)):
+                    parent = self.rng.choice(parents)
+                    campaign_id = self._id('701')
+                    parents.append(campaign_id)
+                    self.campaigns.append((campaign_id, owner))
+                    start = self._date()
+                    budget = self.rng.uniform(1_000, 50_000)
+                    row = self._audit('cmp', self._datetime(start, start))
+                    row.update({
+                        'cmp_sf_id': campaign_id, 'cmp_name': f'Campaign {campaign_id[-6:]}',
+                        'cmp_type': self.rng.choice(('Promotion', 'Trade Show', 'Webinar')),
+                        'cmp_parent_id': parent,
+                        'cmp_status': 'Completed' if start < self.until - timedelta(days=90) else 'In Progress',
+                        'cmp_start_date': start, 'cmp_end_date': start + timedelta(days=90),
+                        'cmp_budgeted_cost': _money(budget), 'cmp_actual_cost': _money(budget * self.rng.random()),
+                        'cmp_available_budget': _money(budget * self.rng.random()),
+                        'cmp_currency_iso_code': 'EUR', 'cmp_owner_id': owner,
+                        'cmp_account_id': account_id, 'cmp_is_active': True,
+                    })
+                    yield row
+
+    def _tasks(self) -> Iterator[Dict[str, Any]]:
+        for campaign_id, owner in self.campaigns:
+            for _ in range(self._children('tasks')):
+                activity = self._date(self.since, self.until + timedelta(days=60))
+                done = activity < self.until and self.rng.random() < 0.7
+                row = self._audit('tsk', self._datetime(activity - timedelta(days=14), activity))
+                row.update({
+                    'tsk_sf_id': self._id('00T'), 'tsk_what_id': campaign_id,
+                    'tsk_activity_date': activity, 'tsk_status': 'Completed' if done else 'Open',
+                    'tsk_priority': self.rng.choice(('Normal', 'High')), 'tsk_subject': self._text(4),
+                    'tsk_owner_id': owner,
+                    'tsk_completed_date': self._datetime(activity, activity) if done else None,
+                })
+                yield row
+
+    def tables(self) -> List[Tuple[Any, Callable[[], Iterator[Dict[str, Any]]]]]:
+        """(model, row generator) pairs in load order."""
+        return [
+            (UserRole, self._user_roles),
+            (User, self._users),
+            (Account, self._accounts),
+            (FrameAgreement, self._frame_agreements),
+            (Target, self._targets),
+            (ProductBrand, self._product_brands),
+            (Product, self._products),
+            (Invoice, self._invoices),
+            (InvoiceLineItem, self._invoice_line_items),
+            (Order, self._orders),
+            (OrderLineItem, self._order_items),
+            (ArfRollingForecast, self._arf_rolling_forecasts),
+            (Case, self._cases),
+            (CaseComment, self._case_comments),
+            (CaseHistory, self._case_history),
+            (Campaign, self._campaigns),
+            (Task, self._tasks),
+        ]
+
+    def load(self, progress: Optional[Callable[[str, int], None]] = None) -> Dict[str, int]:
+        """
+        COPY every table in one transaction, then ANALYZE them. Missing
+        yearly invoice partitions for the generated years are created first,
+        so the history does not pile up in the default partitions.
+
+        Args:
+            progress: Called with (table, rows) after each table
+
+        Returns:
+            Table name -> rows written
+        """
+        counts = {}
+        with transaction.atomic():
+            ensure_partitions(self.since.year, self.until.year)
+            for model, rows in self.tables():
+                table = model._meta.db_table
+                counts[table] = copy_rows(model, rows())
+                if progress:
+                    progress(table, counts[table])
+        with connection.cursor() as cursor:
+            for table in counts:
+                cursor.execute(f'ANALYZE {table}')
+        return counts
+
+
+# Delete order: children first. Tables keyed by a serial use their parent's id.
+_CLEAR = [
+    (AccountAccess, 'aa_account_id'),
+    (Task, 'tsk_sf_id'),
+    (Campaign, 'cmp_sf_id'),
+    (CaseHistory, 'ch_sf_id'),
+    (CaseComment, 'cc_case_id'),
+    (Case, 'cs_sf_id'),
+    (ArfRollingForecast, 'arf_account_id'),
+    (OrderLineItem, 'ori_sf_id'),
+    (Order, 'ord_sf_id'),
+    (InvoiceLineItem, 'ili_sf_id'),
+    (Invoice, 'inv_sf_id'),
+    (Product, 'prd_sf_id'),
+    (ProductBrand, 'pb_sf_id'),
+    (Target, 'tgt_sf_id'),
+    (FrameAgreement, 'fa_sf_id'),
+    (Account, 'acc_sf_id'),
+    (User, 'usr_sf_id'),
+    (UserRole, 'ur_sf_id'),
+]
+
+
+def clear_synthetic_data() -> Dict[str, int]:
+    """
+    Delete every generated row (ids with the SYN marker).
+
+    Returns:
+        Table name -> rows deleted
+    """
+    counts = {}
+    with transaction.atomic(), connection.cursor() as cursor:
+        for model, column in _CLEAR:
+            table = model._meta.db_table
+            cursor.execute(f'DELETE FROM {table} WHERE {column} LIKE %s', [SYNTHETIC_ID_PATTERN])
+            counts[table] = cursor.rowcount
+    return counts
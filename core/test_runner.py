@@ -0,0 +1,18 @@
+"""
+Test runner enforcing per-view query budgets.
+"""
+from django.conf import settings
+from django.test.runner import DiscoverRunner
+
+
+class QueryBudgetTestRunner(DiscoverRunner):
+    """
+    DiscoverRunner with QUERY_BUDGET_ENFORCE switched on.
+
+    A request whose view declares ``query_budget`` and runs more queries
+    raises QueryBudgetExceeded, which the test client re-raises in the test.
+    """
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        settings.QUERY_BUDGET_ENFORCE = True
@@ -10,8 +10,19 @@ python manage.py collectstatic --noinput
 #echo "Running migrations..."
 #python manage.py migrate --noinput
 
+# Prometheus samples of all workers are aggregated through this directory;
+# cleared on start so counters of a previous run are not scraped again
+export PROMETHEUS_MULTIPROC_DIR="${PROMETHEUS_MULTIPROC_DIR:-/tmp/prometheus}"
+rm -rf "$PROMETHEUS_MULTIPROC_DIR"
+mkdir -p "$PROMETHEUS_MULTIPROC_DIR"
+
+# Exported: settings.py sizes each worker's database pool from the threads
+export GUNICORN_WORKERS="${GUNICORN_WORKERS:-2}"
+export GUNICORN_THREADS="${GUNICORN_THREADS:-2}"
+
 echo "Starting Gunicorn App..."
 exec gunicorn config.wsgi:application \
+    --config config/gunicorn.py \
     --bind 0.0.0.0:8080 \
-    --workers 2 \
-    --threads 2
\ No newline at end of file
+    --workers "$GUNICORN_WORKERS" \
+    --threads "$GUNICORN_THREADS"
\ No newline at end of file
@@ -0,0 +1 @@
+# API framework tests module
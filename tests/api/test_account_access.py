@@ -0,0 +1,166 @@
+"""
+Tests for the account_access territory closure (AccountAccessService.refresh)
+
+Role tree: VP -> North manager -> North rep, VP -> South manager -> South
+rep; each rep owns one account. The fixture rows are backdated, so an
+incremental refresh sees only what a test changes afterwards.
+"""
+from datetime import datetime, timedelta, timezone
+
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.accounts.models import Account, AccountAccess
+from apps.accounts.services import AccountAccessService
+from apps.sync.models import SyncLog
+from apps.users.models import User, UserRole
+
+
+def _dt(y, m, d):
+    return datetime(y, m, d, tzinfo=timezone.utc)
+
+
+class AccountAccessRefreshTests(TestCase):
+
+    def setUp(self):
+        for role_id, parent in [
+            ('role_vp', None),
+            ('role_north', 'role_vp'),
+            ('role_south', 'role_vp'),
+            ('role_north_rep', 'role_north'),
+            ('role_south_rep', 'role_south'),
+        ]:
+            UserRole.objects.create(
+                ur_sf_id=role_id,
+                ur_name=role_id,
+                ur_parent_role_id_id=parent,
+                ur_last_modified_date=_dt(2020, 1, 1),
+                ur_system_modstamp=_dt(2020, 1, 1),
+            )
+        for user_id in ['vp', 'north', 'south', 'north_rep', 'south_rep']:
+            User.objects.create(
+                usr_sf_id=user_id,
+                usr_username=user_id,
+                usr_email=f'{user_id}@example.com',
+                usr_last_name=user_id,
+                usr_name=user_id,
+                usr_is_active=True,
+                usr_user_role_id_id=f'role_{user_id}',
+                usr_time_zone='UTC',
+                usr_language='en',
+                usr_sf_created_date=_dt(2020, 1, 1),
+                usr_last_modified_date=_dt(2020, 1, 1),
+                usr_last_modified_by_id='vp',
+            )
+        for account_id, owner in [('acc_north', 'north_rep'), ('acc_south', 'south_rep')]:
+            self._create_account(account_id, owner)
+
+        hour_ago = datetime.now(timezone.utc) - timedelta(hours=1)
+        UserRole.objects.update(ur_updated_at=hour_ago)
+        User.objects.update(usr_updated_at=hour_ago)
+        Account.objects.update(acc_updated_at=hour_ago)
+        self.assertEqual(AccountAccessService.refresh()['mode'], 'full')
+
+    def _create_account(self, account_id, owner):
+        return Account.objects.create(
+            acc_sf_id=account_id,
+            acc_name=account_id,
+            acc_owner_id_id=owner,
+            acc_last_modified_date=_dt(2020, 1, 1),
+            acc_last_modified_by_id='vp',
+        )
+
+    def _territory(self, user_id):
+        return dict(
+            AccountAccess.objects.filter(aa_user_id=user_id).values_list('aa_account_id', 'aa_depth')
+        )
+
+    def _refresh(self):
+        stats = AccountAccessService.refresh()
+        self.assertEqual(stats['mode'], 'incremental')
+        return stats
+
+    def _finish_sync(self, sf_object, status_='success'):
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            SyncLog.objects.create(
+                sl_job_name='salesforce_sync',
+                sl_direction='inbound',
+                sl_object_name=sf_object.lower(),
+                sl_sf_object_api=sf_object,
+                sl_status=status_,
+            )
+        return callbacks
+
+    def test_full_refresh_builds_territories(self):
+        self.assertEqual(self._territory('north_rep'), {'acc_north': 0})
+        self.assertEqual(self._territory('north'), {'acc_north': 1})
+        self.assertEqual(self._territory('south'), {'acc_south': 1})
+        self.assertEqual(self._territory('vp'), {'acc_north': 2, 'acc_south': 2})
+
+    def test_new_account_joins_territory(self):
+        self._create_account('acc_north_2', 'north_rep')
+        stats = self._refresh()
+        self.assertEqual(stats['changed_accounts'], 1)
+        self.assertEqual(self._territory('north'), {'acc_north': 1, 'acc_north_2': 1})
+        self.assertIn('acc_north_2', self._territory('vp'))
+        self.assertNotIn('acc_north_2', self._territory('south'))
+
+    def test_deleted_account_leaves_territory(self):
+        Account.objects.filter(pk='acc_north').delete()
+        self._refresh()
+        self.assertFalse(AccountAccess.objects.filter(aa_account_id='acc_north').exists())
+        self.assertEqual(self._territory('vp'), {'acc_south': 2})
+
+    def test_reassigned_account_moves_territory(self):
+        account = Account.objects.get(pk='acc_north')
+        account.acc_owner_id_id = 'south_rep'
+        account.save()
+        self._refresh()
+        self.assertEqual(self._territory('north'), {})
+        self.assertEqual(self._territory('south'), {'acc_north': 1, 'acc_south': 1})
+        self.assertEqual(self._territory('south_rep'), {'acc_north': 0, 'acc_south': 0})
+        self.assertEqual(self._territory('vp'), {'acc_north': 2, 'acc_south': 2})
+
+    def test_rep_moved_to_other_team(self):
+        rep = User.objects.get(pk='north_rep')
+        rep.usr_user_role_id_id = 'role_south_rep'
+        rep.save()
+        self._refresh()
+        self.assertEqual(self._territory('north'), {})
+        self.assertEqual(self._territory('south'), {'acc_north': 1, 'acc_south': 1})
+
+    def test_deactivated_manager_loses_territory(self):
+        manager = User.objects.get(pk='north')
+        manager.usr_is_active = False
+        manager.save()
+        self._refresh()
+        self.assertEqual(self._territory('north'), {})
+        self.assertEqual(self._territory('vp'), {'acc_north': 2, 'acc_south': 2})
+
+        manager.usr_is_active = True
+        manager.save()
+        self._refresh()
+        self.assertEqual(self._territory('north'), {'acc_north': 1})
+
+    def test_role_change_rebuilds_everything(self):
+        role = UserRole.objects.get(pk='role_north')
+        role.ur_parent_role_id_id = None
+        role.save()
+        self.assertEqual(AccountAccessService.refresh()['mode'], 'full')
+        self.assertEqual(self._territory('vp'), {'acc_south': 2})
+        self.assertEqual(self._territory('north'), {'acc_north': 1})
+
+    def test_territory_scope_lists_team_accounts(self):
+        response = APIClient().get('/api/accounts/user/vp/', {'scope': 'territory'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([row['id'] for row in response.json()['data']], ['acc_north', 'acc_south'])
+
+    def test_account_sync_refreshes_access(self):
+        self._create_account('acc_north_2', 'north_rep')
+        self.assertEqual(len(self._finish_sync('Account')), 1)
+        self.assertIn('acc_north_2', self._territory('north'))
+
+    def test_other_syncs_do_not_refresh(self):
+        self.assertEqual(self._finish_sync('Case'), [])
+        self.assertEqual(self._finish_sync('Account', status_='failed'), [])
@@ -0,0 +1,125 @@
+"""
+Tests for the archival of soft-deleted rows
+"""
+from datetime import date
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test import TestCase
+
+from apps.accounts.models import Account
+from apps.cases.models import Case, CaseComment
+from apps.products.models import Invoice, InvoiceLineItem
+from core.services.archival import (
+    ARCHIVED_MODELS,
+    archive_inactive_rows,
+    archive_table,
+    count_archivable,
+    with_archive,
+)
+from core.services.synthetic_data import SyntheticDataGenerator
+
+# The generated rows were last updated at the end of June 2025
+RETENTION_DAYS = 30
+
+
+class ArchivalTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        SyntheticDataGenerator(scale=0.01, seed=1, until=date(2025, 6, 30)).load()
+
+    def _archived(self, model):
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT COUNT(*) FROM {archive_table(model)}')
+            return cursor.fetchone()[0]
+
+    def test_archive_moves_inactive_rows(self):
+        expected = count_archivable(RETENTION_DAYS)
+        self.assertTrue(expected['invoice_line_items'])
+
+        counts = archive_inactive_rows(RETENTION_DAYS, batch_size=7)
+        self.assertGreaterEqual(counts['invoice_line_items'], expected['invoice_line_items'])
+        for model, _ in ARCHIVED_MODELS:
+            self.assertEqual(self._archived(model), counts[model._meta.db_table])
+        self.assertFalse(InvoiceLineItem.objects.filter(ili_active=0).exists())
+        self.assertFalse(Invoice.objects.filter(inv_active=0).exists())
+        self.assertFalse(InvoiceLineItem.objects.filter(ili_invoice_id__inv_active=0).exists())
+
+        again = archive_inactive_rows(RETENTION_DAYS)
+        self.assertEqual(sum(again.values()), 0)
+
+    def test_recent_rows_stay(self):
+        counts = archive_inactive_rows(retention_days=10 ** 5)
+        self.assertEqual(sum(counts.values()), 0)
+
+    def test_referenced_parent_stays(self):
+        case = Case.objects.filter(casecomment__isnull=False).first()
+        Case.objects.filter(pk=case.pk).update(cs_active=0)
+        archive_inactive_rows(RETENTION_DAYS, tables=['cases'])
+        self.assertTrue(Case.objects.filter(pk=case.pk).exists())
+
+        archive_inactive_rows(RETENTION_DAYS, tables=['case_comments', 'case_history', 'cases'])
+        self.assertFalse(Case.objects.filter(pk=case.pk).exists())
+        self.assertFalse(CaseComment.objects.filter(cc_case_id=case.pk).exists())
+
+    def test_rearchived_row_replaces_archived_copy(self):
+        line = InvoiceLineItem.objects.filter(ili_active=0).first()
+        archive_inactive_rows(RETENTION_DAYS, tables=['invoice_line_items'])
+        # Synced again, then soft-deleted again
+        columns = ', '.join(field.column for field in InvoiceLineItem._meta.concrete_fields)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'INSERT INTO invoice_line_items ({columns}) '
+                f'SELECT {columns} FROM {archive_table(InvoiceLineItem)} WHERE ili_sf_id = %s',
+                [line.pk],
+            )
+        InvoiceLineItem.objects.filter(pk=line.pk).update(ili_quantity=999)
+
+        counts = archive_inactive_rows(RETENTION_DAYS, tables=['invoice_line_items'])
+        self.assertEqual(counts['invoice_line_items'], 1)
+        archived = with_archive(InvoiceLineItem.objects.filter(pk=line.pk))
+        self.assertEqual(len(archived), 1)
+        self.assertEqual(archived[0].ili_quantity, 999)
+
+    def test_with_archive_reads_through(self):
+        line = InvoiceLineItem.objects.filter(ili_active=0).first()
+        live = InvoiceLineItem.objects.filter(ili_invoice_id=line.ili_invoice_id_id).count()
+        archive_inactive_rows(RETENTION_DAYS, tables=['invoice_line_items'])
+
+        rows = with_archive(InvoiceLineItem.objects.filter(ili_invoice_id=line.ili_invoice_id_id))
+        self.assertEqual(len(rows), live)
+        archived = [row for row in rows if row.archived_at is not None]
+        self.assertIn(line.pk, [row.pk for row in archived])
+        with self.assertRaises(ValueError):
+            with_archive(Account.objects.all())
+
+    def test_with_archive_distinct_queryset(self):
+        Case.objects.filter(pk__in=Case.objects.order_by('pk').values('pk')[:5]).update(cs_active=0)
+        archive_inactive_rows(RETENTION_DAYS)
+        self.assertEqual(self._archived(Case), 5)
+        Case.objects.filter(pk=Case.objects.order_by('pk').values('pk')[:1]).update(cs_active=0)
+
+        rows = with_archive(Case.objects.filter(cs_active=0).distinct())
+        self.assertEqual(len({row.pk for row in rows}), 6)
+        self.assertEqual(sum(row.archived_at is not None for row in rows), 5)
+
+    def test_with_archive_subquery_reads_hot_table(self):
+        archive_inactive_rows(RETENTION_DAYS, tables=['invoice_line_items'])
+        self.assertTrue(self._archived(InvoiceLineItem))
+        # The subquery is not read through, and no inactive line is left in
+        # the hot table
+        inactive = InvoiceLineItem.objects.filter(ili_active=0).values('pk')
+        self.assertEqual(with_archive(InvoiceLineItem.objects.filter(pk__in=inactive)), [])
+        with self.assertRaises(ValueError):
+            with_archive(InvoiceLineItem.objects.all().union(InvoiceLineItem.objects.all()))
+
+    def test_command(self):
+        out = StringIO()
+        call_command('archive_inactive_rows', retention_days=RETENTION_DAYS, dry_run=True, stdout=out)
+        self.assertIn('invoice_line_items:', out.getvalue())
+        self.assertFalse(self._archived(InvoiceLineItem))
+        with self.assertRaisesMessage(CommandError, 'Not archived: accounts'):
+            call_command('archive_inactive_rows', tables=['accounts'], stdout=StringIO())
@@ -0,0 +1,151 @@
+"""
+Tests for the campaign hierarchy endpoint (CampaignHierarchyService)
+
+Campaigns of acc_1: Root -> Child A -> Grandchild, Root -> Child B, an
+inactive campaign under Root, Orphan (its parent is inactive) and the cycle
+Cycle X <-> Cycle Y.
+"""
+from datetime import datetime, timezone
+from decimal import Decimal
+
+from django.test import TestCase
+from rest_framework import status
+
+from apps.accounts.models import Account
+from apps.campaigns.models import Campaign, Task
+from apps.campaigns.services import CampaignHierarchyService
+from apps.users.models import User
+
+URL = '/api/campaigns/hierarchy/'
+
+
+def _dt(y, m, d):
+    return datetime(y, m, d, tzinfo=timezone.utc)
+
+
+class CampaignHierarchyTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        User.objects.create(
+            usr_sf_id='usr_1',
+            usr_username='owner',
+            usr_email='owner@example.com',
+            usr_last_name='Owner',
+            usr_name='Owner',
+            usr_is_active=True,
+            usr_time_zone='UTC',
+            usr_language='en',
+            usr_sf_created_date=_dt(2024, 1, 1),
+            usr_last_modified_date=_dt(2024, 1, 1),
+            usr_last_modified_by_id='usr_1',
+        )
+        for account_id in ['acc_1', 'acc_2']:
+            Account.objects.create(
+                acc_sf_id=account_id,
+                acc_name=account_id,
+                acc_owner_id_id='usr_1',
+                acc_last_modified_date=_dt(2024, 1, 1),
+                acc_last_modified_by_id='usr_1',
+            )
+
+        for campaign_id, name, parent, budget, active in [
+            ('cmp_root', 'Root', None, '100', 1),
+            ('cmp_a', 'Child A', 'cmp_root', '50', 1),
+            ('cmp_b', 'Child B', 'cmp_root', '30', 1),
+            ('cmp_grand', 'Grandchild', 'cmp_a', '20', 1),
+            ('cmp_inactive', 'Inactive', 'cmp_root', '1000', 0),
+            ('cmp_orphan', 'Orphan', 'cmp_inactive', '5', 1),
+            ('cmp_x', 'Cycle X', None, '7', 1),
+            ('cmp_y', 'Cycle Y', 'cmp_x', '3', 1),
+        ]:
+            Campaign.objects.create(
+                cmp_sf_id=campaign_id,
+                cmp_name=name,
+                cmp_parent_id_id=parent,
+                cmp_status='In Progress',
+                cmp_budgeted_cost=Decimal(budget),
+                cmp_owner_id_id='usr_1',
+                cmp_account_id_id='acc_1',
+                cmp_sf_created_date=_dt(2024, 1, 1),
+                cmp_last_modified_date=_dt(2024, 1, 1),
+                cmp_last_modified_by_id='usr_1',
+                cmp_active=active,
+            )
+        Campaign.objects.filter(pk='cmp_x').update(cmp_parent_id='cmp_y')
+
+        for task_id, campaign_id, task_status in [
+            ('tsk_1', 'cmp_root', 'Open'),
+            ('tsk_2', 'cmp_grand', 'Completed'),
+            ('tsk_3', 'cmp_grand', 'Not Started'),
+        ]:
+            Task.objects.create(
+                tsk_sf_id=task_id,
+                tsk_what_id=campaign_id,
+                tsk_status=task_status,
+                tsk_subject=task_id,
+                tsk_owner_id_id='usr_1',
+                tsk_sf_created_date=_dt(2024, 1, 1),
+                tsk_last_modified_date=_dt(2024, 1, 1),
+                tsk_last_modified_by_id='usr_1',
+            )
+
+    def _get(self, **params):
+        return self.client.get(URL, params)
+
+    def test_multi_level_tree(self):
+        response = self._get(campaign_id='cmp_root')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        [root] = response.json()['data']
+
+        self.assertEqual([child['id'] for child in root['children']], ['cmp_a', 'cmp_b'])
+        child_a = root['children'][0]
+        [grandchild] = child_a['children']
+        self.assertEqual((root['depth'], child_a['depth'], grandchild['depth']), (0, 1, 2))
+        self.assertEqual(grandchild['children'], [])
+
+        self.assertEqual(root['budgeted_cost'], 100)
+        self.assertEqual(root['rollup']['budgeted_cost'], 200)
+        self.assertEqual(root['rollup']['descendant_count'], 3)
+        self.assertEqual(root['rollup']['task_count'], 3)
+        self.assertEqual(root['rollup']['completed_task_count'], 1)
+        self.assertEqual(child_a['rollup']['budgeted_cost'], 70)
+        self.assertEqual(child_a['task_count'], 0)
+        self.assertEqual(child_a['rollup']['task_count'], 2)
+        self.assertEqual(grandchild['rollup']['descendant_count'], 0)
+
+    def test_subtree_from_inner_campaign(self):
+        [node] = CampaignHierarchyService.get_hierarchy(campaign_id='cmp_a')
+        self.assertEqual(node['depth'], 0)
+        self.assertEqual(node['parent_id'], 'cmp_root')
+        self.assertEqual([child['id'] for child in node['children']], ['cmp_grand'])
+
+    def test_account_roots(self):
+        response = self._get(account_id='acc_1')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        # The cycle has no root; Orphan's only parent is inactive
+        self.assertEqual([node['id'] for node in response.json()['data']], ['cmp_orphan', 'cmp_root'])
+
+    def test_cycle_is_cut(self):
+        [node] = CampaignHierarchyService.get_hierarchy(campaign_id='cmp_x')
+        self.assertEqual([child['id'] for child in node['children']], ['cmp_y'])
+        self.assertEqual(node['children'][0]['children'], [])
+        self.assertEqual(node['rollup']['descendant_count'], 1)
+        self.assertEqual(node['rollup']['budgeted_cost'], 10)
+
+    def test_missing_root_returns_404(self):
+        for campaign_id in ['cmp_missing', 'cmp_inactive']:
+            with self.subTest(campaign_id=campaign_id):
+                response = self._get(campaign_id=campaign_id)
+                self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_account_without_campaigns_is_empty(self):
+        response = self._get(account_id='acc_2')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['data'], [])
+
+    def test_requires_exactly_one_filter(self):
+        for params in [{}, {'campaign_id': 'cmp_root', 'account_id': 'acc_1'}]:
+            with self.subTest(params=params):
+                response = self._get(**params)
+                self.assertEqual(response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
@@ -0,0 +1,137 @@
+"""
+Tests for tasks embedded in the campaign list (task_counts, tasks_limit)
+
+Campaign Alpha has four tasks (two owned by usr_2, one inactive), Beta has
+one and Gamma none.
+"""
+from datetime import date, datetime, timezone
+
+from django.test import TestCase
+from rest_framework import status
+
+from apps.accounts.models import Account
+from apps.campaigns.models import Campaign, Task
+from apps.campaigns.services import task_counts_by_campaign
+from apps.campaigns.views import MAX_TASKS_LIMIT, _first_tasks
+from apps.users.models import User
+
+URL = '/api/campaigns/'
+
+
+def _dt(y, m, d):
+    return datetime(y, m, d, tzinfo=timezone.utc)
+
+
+class CampaignTasksTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        for user_id in ['usr_1', 'usr_2']:
+            User.objects.create(
+                usr_sf_id=user_id,
+                usr_username=user_id,
+                usr_email=f'{user_id}@example.com',
+                usr_last_name=user_id,
+                usr_name=user_id,
+                usr_is_active=True,
+                usr_time_zone='UTC',
+                usr_language='en',
+                usr_sf_created_date=_dt(2024, 1, 1),
+                usr_last_modified_date=_dt(2024, 1, 1),
+                usr_last_modified_by_id='usr_1',
+            )
+        Account.objects.create(
+            acc_sf_id='acc_1',
+            acc_name='acc_1',
+            acc_owner_id_id='usr_1',
+            acc_last_modified_date=_dt(2024, 1, 1),
+            acc_last_modified_by_id='usr_1',
+        )
+        for campaign_id, name in [('cmp_a', 'Alpha'), ('cmp_b', 'Beta'), ('cmp_g', 'Gamma')]:
+            Campaign.objects.create(
+                cmp_sf_id=campaign_id,
+                cmp_name=name,
+                cmp_status='In Progress',
+                cmp_owner_id_id='usr_1',
+                cmp_account_id_id='acc_1',
+                cmp_sf_created_date=_dt(2024, 1, 1),
+                cmp_last_modified_date=_dt(2024, 1, 1),
+                cmp_last_modified_by_id='usr_1',
+            )
+        for task_id, campaign_id, task_status, activity_date, owner, active in [
+            ('tsk_a3', 'cmp_a', 'Open', date(2024, 3, 1), 'usr_1', 1),
+            ('tsk_a1', 'cmp_a', 'Completed', date(2024, 1, 1), 'usr_2', 1),
+            ('tsk_a2', 'cmp_a', 'Open', date(2024, 2, 1), 'usr_2', 1),
+            ('tsk_a0', 'cmp_a', 'Open', date(2023, 1, 1), 'usr_1', 0),
+            ('tsk_b1', 'cmp_b', 'Not Started', date(2024, 1, 1), 'usr_1', 1),
+        ]:
+            Task.objects.create(
+                tsk_sf_id=task_id,
+                tsk_what_id=campaign_id,
+                tsk_status=task_status,
+                tsk_subject=task_id,
+                tsk_activity_date=activity_date,
+                tsk_owner_id_id=owner,
+                tsk_sf_created_date=_dt(2024, 1, 1),
+                tsk_last_modified_date=_dt(2024, 1, 1),
+                tsk_last_modified_by_id='usr_1',
+                tsk_active=active,
+            )
+
+    def _campaigns(self, **params):
+        response = self.client.get(URL, {'account_id': 'acc_1', **params})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return {item['id']: item for item in response.json()['data']}
+
+    def _task_ids(self, item):
+        return [task['id'] for task in item['tasks']]
+
+    def test_task_counts_by_campaign(self):
+        counts = task_counts_by_campaign(Task.objects.filter(tsk_active=1))
+        self.assertEqual(counts, {
+            'cmp_a': {'total': 3, 'by_status': {'Open': 2, 'Completed': 1}},
+            'cmp_b': {'total': 1, 'by_status': {'Not Started': 1}},
+        })
+
+    def test_first_tasks_per_campaign(self):
+        tasks = _first_tasks(Task.objects.filter(tsk_active=1), 2)
+        self.assertEqual(
+            [(task.tsk_what_id, task.tsk_sf_id) for task in tasks],
+            [('cmp_a', 'tsk_a1'), ('cmp_a', 'tsk_a2'), ('cmp_b', 'tsk_b1')],
+        )
+
+    def test_all_tasks_embedded_by_default(self):
+        items = self._campaigns()
+        self.assertEqual(self._task_ids(items['cmp_a']), ['tsk_a1', 'tsk_a2', 'tsk_a3'])
+        self.assertEqual(items['cmp_a']['task_counts']['total'], 3)
+        self.assertEqual(items['cmp_g']['tasks'], [])
+        self.assertEqual(items['cmp_g']['task_counts'], {'total': 0, 'by_status': {}})
+
+    def test_tasks_limit_keeps_full_counts(self):
+        items = self._campaigns(tasks_limit=1)
+        self.assertEqual(self._task_ids(items['cmp_a']), ['tsk_a1'])
+        self.assertEqual(self._task_ids(items['cmp_b']), ['tsk_b1'])
+        self.assertEqual(items['cmp_a']['task_counts'], {'total': 3, 'by_status': {'Open': 2, 'Completed': 1}})
+
+    def test_tasks_limit_zero_returns_counts_only(self):
+        items = self._campaigns(tasks_limit=0)
+        self.assertEqual([item['tasks'] for item in items.values()], [[], [], []])
+        self.assertEqual(items['cmp_a']['task_counts']['total'], 3)
+        self.assertEqual(items['cmp_b']['task_counts']['total'], 1)
+
+    def test_tasks_limit_upper_bound(self):
+        items = self._campaigns(tasks_limit=MAX_TASKS_LIMIT)
+        self.assertEqual(len(items['cmp_a']['tasks']), 3)
+
+    def test_my_tasks_filter_counts(self):
+        items = self._campaigns(type='my', user_id='usr_2', tasks_limit=1)
+        self.assertEqual(self._task_ids(items['cmp_a']), ['tsk_a1'])
+        self.assertEqual(items['cmp_a']['task_counts'], {'total': 2, 'by_status': {'Open': 1, 'Completed': 1}})
+        self.assertEqual(items['cmp_b']['task_counts']['total'], 0)
+
+    def test_tasks_limit_out_of_range(self):
+        for value in ['-1', str(MAX_TASKS_LIMIT + 1), 'abc']:
+            with self.subTest(tasks_limit=value):
+                response = self.client.get(URL, {'account_id': 'acc_1', 'tasks_limit': value})
+                self.assertEqual(response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+                self.assertEqual(response.json()['errors'][0]['field'], 'tasks_limit')
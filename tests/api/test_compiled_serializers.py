@@ -0,0 +1,169 @@
+"""
+Unit tests for compiled read-only serializers
+"""
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+from django.core.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase
+from rest_framework import serializers
+
+from apps.accounts.models import Account
+from apps.accounts.serializers import ACCOUNT_LIST_COMPILED, AccountListSerializer
+from apps.campaigns.models import Campaign, Task
+from apps.campaigns.serializers import (
+    CAMPAIGN_WITH_TASKS_COMPILED,
+    TASK_LIST_COMPILED,
+    CampaignWithTasksSerializer,
+    TaskListSerializer,
+)
+from apps.cases.models import Case
+from apps.cases.serializers import CASE_LIST_COMPILED, CaseListSerializer
+from apps.users.models import User, UserRole
+from apps.users.serializers import USER_LIST_COMPILED, UserListSerializer
+from core.api.serializers import CompiledSerializer
+
+
+def _row(compiled, values):
+    """values_list() tuple for a {column: value} mapping."""
+    return tuple(values[column] for column in compiled.columns)
+
+
+def account_sample(i, credit_limit=Decimal('1500.50')):
+    values = {
+        'acc_sf_id': f'acc{i:06d}', 'acc_name': f'Account {i}', 'acc_owner_id': 'usr001',
+        'acc_account_number': f'N-{i}', 'acc_currency_iso_code': 'GBP',
+        'acc_credit_limit': credit_limit, 'acc_active': 1,
+    }
+    instance = Account(
+        acc_sf_id=values['acc_sf_id'], acc_name=values['acc_name'], acc_owner_id_id='usr001',
+        acc_account_number=values['acc_account_number'], acc_currency_iso_code='GBP',
+        acc_credit_limit=credit_limit, acc_active=1,
+    )
+    return instance, _row(ACCOUNT_LIST_COMPILED, values)
+
+
+def case_sample(i, created=datetime(2024, 3, 5, 14, 30, tzinfo=timezone.utc)):
+    values = {
+        'cs_sf_id': f'case{i:06d}', 'cs_case_number': f'{i:08d}', 'cs_subject': f'Case {i}',
+        'cs_status': 'New', 'cs_sf_created_date': created, 'comments_count': 3,
+        'timeline_count': 0, 'cs_priority': 'High', 'cs_account_id': 'acc000001',
+        'cs_owner_id': None,
+    }
+    instance = Case(
+        cs_sf_id=values['cs_sf_id'], cs_case_number=values['cs_case_number'],
+        cs_subject=values['cs_subject'], cs_status='New', cs_sf_created_date=created,
+        cs_priority='High', cs_account_id_id='acc000001', cs_owner_id_id=None,
+    )
+    instance.comments_count = 3
+    instance.timeline_count = 0
+    return instance, _row(CASE_LIST_COMPILED, values)
+
+
+def task_sample(i, activity_date=date(2024, 6, 1)):
+    values = {
+        'tsk_sf_id': f'tsk{i:06d}', 'tsk_subject': f'Task {i}', 'tsk_status': 'Open',
+        'tsk_priority': 'Normal', 'tsk_activity_date': activity_date,
+        'tsk_owner_id': 'usr001', 'tsk_what_id': 'cmp000001',
+    }
+    instance = Task(
+        tsk_sf_id=values['tsk_sf_id'], tsk_subject=values['tsk_subject'], tsk_status='Open',
+        tsk_priority='Normal', tsk_activity_date=activity_date, tsk_owner_id_id='usr001',
+        tsk_what_id='cmp000001',
+    )
+    return instance, _row(TASK_LIST_COMPILED, values)
+
+
+def campaign_sample(i, end_date=None):
+    values = {
+        'cmp_sf_id': f'cmp{i:06d}', 'cmp_name': f'Campaign {i}', 'cmp_status': 'Planned',
+        'cmp_type': 'Email', 'cmp_start_date': date(2024, 1, 1), 'cmp_end_date': end_date,
+        'cmp_owner_id': 'usr001', 'cmp_account_id': 'acc000001', 'cmp_is_active': True,
+    }
+    instance = Campaign(
+        cmp_sf_id=values['cmp_sf_id'], cmp_name=values['cmp_name'], cmp_status='Planned',
+        cmp_type='Email', cmp_start_date=date(2024, 1, 1), cmp_end_date=end_date,
+        cmp_owner_id_id='usr001', cmp_account_id_id='acc000001', cmp_is_active=True,
+    )
+    return instance, _row(CAMPAIGN_WITH_TASKS_COMPILED, values)
+
+
+def user_sample(i, role_name='Sales Rep'):
+    role = UserRole(ur_sf_id='role01', ur_name=role_name) if role_name else None
+    values = {
+        'usr_sf_id': f'usr{i:06d}', 'usr_name': f'User {i}', 'usr_email': f'user{i}@example.com',
+        'usr_user_role_id__ur_name': role_name,
+    }
+    instance = User(
+        usr_sf_id=values['usr_sf_id'], usr_name=values['usr_name'],
+        usr_email=values['usr_email'], usr_user_role_id=role,
+    )
+    return instance, _row(USER_LIST_COMPILED, values)
+
+
+class CompiledSerializerTestCase(SimpleTestCase):
+    """Compiled serializers produce the same items as their DRF serializers"""
+
+    def assertSameOutput(self, serializer_class, compiled, samples):
+        instances = [instance for instance, _ in samples]
+        rows = [row for _, row in samples]
+        # Compared as item lists so key order is checked too
+        self.assertEqual(
+            [list(item.items()) for item in compiled.serialize(rows)],
+            [list(item.items()) for item in serializer_class(instances, many=True).data],
+        )
+
+    def test_account_list(self):
+        self.assertSameOutput(
+            AccountListSerializer, ACCOUNT_LIST_COMPILED,
+            [account_sample(1), account_sample(2, credit_limit=None)],
+        )
+
+    def test_case_list(self):
+        self.assertSameOutput(
+            CaseListSerializer, CASE_LIST_COMPILED,
+            [case_sample(1), case_sample(2, created=None)],
+        )
+
+    def test_task_list(self):
+        self.assertSameOutput(
+            TaskListSerializer, TASK_LIST_COMPILED,
+            [task_sample(1), task_sample(2, activity_date=None)],
+        )
+
+    def test_user_list(self):
+        self.assertSameOutput(
+            UserListSerializer, USER_LIST_COMPILED,
+            [user_sample(1), user_sample(2, role_name=None)],
+        )
+
+    def test_campaign_with_tasks(self):
+        campaign, row = campaign_sample(1)
+        task, task_row = task_sample(1)
+        counts = {'total': 1, 'by_status': {'Open': 1}}
+        expected = CampaignWithTasksSerializer(
+            campaign,
+            context={
+                'tasks_by_campaign': {campaign.cmp_sf_id: [task]},
+                'task_counts': {campaign.cmp_sf_id: counts},
+            },
+        ).data
+        item = CAMPAIGN_WITH_TASKS_COMPILED.to_item(
+            row, [TASK_LIST_COMPILED.to_item(task_row)], counts
+        )
+        self.assertEqual(item, expected)
+        self.assertEqual(list(item), list(expected))
+
+    def test_shared_column_selected_once(self):
+        self.assertEqual(TASK_LIST_COMPILED.columns.count('tsk_what_id'), 1)
+
+    def test_method_field_requires_column(self):
+        with self.assertRaises(ImproperlyConfigured):
+            CompiledSerializer(AccountListSerializer)
+
+    def test_custom_date_format_uses_field(self):
+        class DateSerializer(serializers.Serializer):
+            day = serializers.DateField(format='%d/%m/%Y')
+
+        compiled = CompiledSerializer(DateSerializer)
+        self.assertEqual(compiled.to_item((date(2024, 2, 1),)), {'day': '01/02/2024'})
@@ -0,0 +1,98 @@
+"""
+Tests for the concurrent section runner (run_sections)
+
+Sections run on pool threads with their own connections, outside the test
+transaction, so they only run queries that need no test data.
+"""
+import threading
+import time
+
+from django.db import connection
+from django.test import SimpleTestCase, override_settings
+
+from core.services.concurrent_sections import (
+    SECTION_ERROR,
+    SECTION_OK,
+    SECTION_TIMEOUT,
+    SectionDeadlineExceeded,
+    close_section_connections,
+    run_sections,
+)
+
+
+def _query(sql):
+    with connection.cursor() as cursor:
+        cursor.execute(sql)
+        return cursor.fetchone()[0]
+
+
+# The slow-query log would capture the deliberately slow sections in the
+# background, after the test
+@override_settings(SLOW_QUERY_THRESHOLD_MS=0)
+class RunSectionsTests(SimpleTestCase):
+    databases = {'default'}
+
+    @classmethod
+    def tearDownClass(cls):
+        # The test database cannot be copied or dropped while pool threads
+        # are connected to it
+        close_section_connections()
+        super().tearDownClass()
+
+    def test_results_follow_section_order(self):
+        results = run_sections({
+            'b': lambda: _query('SELECT 2'),
+            'a': lambda: _query('SELECT 1'),
+        }, timeout=5)
+        self.assertEqual(list(results), ['b', 'a'])
+        self.assertEqual(results['b']['status'], SECTION_OK)
+        self.assertEqual(results['b']['data'], 2)
+        self.assertEqual(results['a']['data'], 1)
+
+    def test_failing_section_does_not_affect_others(self):
+        def fail():
+            raise ValueError('boom')
+
+        with self.assertLogs('core.services.concurrent_sections', 'ERROR'):
+            results = run_sections({'ok': lambda: _query('SELECT 1'), 'bad': fail}, timeout=5)
+        self.assertEqual(results['ok']['status'], SECTION_OK)
+        self.assertEqual(results['bad']['status'], SECTION_ERROR)
+        self.assertIsNone(results['bad']['data'])
+
+    def test_failed_query_leaves_connection_usable(self):
+        with self.assertLogs('core.services.concurrent_sections', 'ERROR'):
+            results = run_sections({'bad': lambda: _query('SELECT 1/0')}, timeout=5)
+        self.assertEqual(results['bad']['status'], SECTION_ERROR)
+        results = run_sections({'ok': lambda: _query('SELECT 1')}, timeout=5)
+        self.assertEqual(results['ok']['status'], SECTION_OK)
+
+    def test_slow_query_times_out(self):
+        started = time.monotonic()
+        with self.assertLogs('core.services.concurrent_sections', 'WARNING'):
+            results = run_sections({
+                'fast': lambda: _query('SELECT 1'),
+                'slow': lambda: _query('SELECT pg_sleep(5)'),
+            }, timeout=0.5)
+        self.assertLess(time.monotonic() - started, 2)
+        self.assertEqual(results['fast']['status'], SECTION_OK)
+        self.assertEqual(results['slow']['status'], SECTION_TIMEOUT)
+        self.assertIsNone(results['slow']['data'])
+
+    def test_orphaned_section_cannot_query_after_deadline(self):
+        outcome = {}
+        finished = threading.Event()
+
+        def slow_python():
+            time.sleep(0.5)
+            try:
+                outcome['data'] = _query('SELECT 1')
+            except Exception as e:
+                outcome['error'] = e
+            finished.set()
+
+        with self.assertLogs('core.services.concurrent_sections', 'WARNING'):
+            results = run_sections({'slow': slow_python}, timeout=0.2)
+            self.assertEqual(results['slow']['status'], SECTION_TIMEOUT)
+            self.assertTrue(finished.wait(5))
+        self.assertNotIn('data', outcome)
+        self.assertIsInstance(outcome['error'], SectionDeadlineExceeded)
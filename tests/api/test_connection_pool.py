@@ -0,0 +1,116 @@
+"""
+Tests for psycopg connection pooling (DB_POOL_ENABLED) and its stats
+"""
+from unittest import mock
+
+from django.db import OperationalError, connection, connections
+from django.test import TestCase
+from prometheus_client import REGISTRY
+
+from core.services import metrics
+
+ALIAS = 'pool_test'
+
+
+def _sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+def _backend_pid(wrapper):
+    wrapper.ensure_connection()
+    with wrapper.connection.cursor() as cursor:
+        cursor.execute('SELECT pg_backend_pid()')
+        return cursor.fetchone()[0]
+
+
+class ConnectionPoolTestCase(TestCase):
+    """A pooled alias of the test database, configured as settings.py does."""
+
+    def setUp(self):
+        settings_dict = dict(connection.settings_dict)
+        settings_dict.update({
+            'CONN_MAX_AGE': 0,
+            'CONN_HEALTH_CHECKS': True,
+            'OPTIONS': {
+                **settings_dict['OPTIONS'],
+                'pool': {'name': ALIAS, 'min_size': 0, 'max_size': 1, 'timeout': 0.5},
+            },
+        })
+        # Registered for the postgres type handlers, which look the alias up
+        for patcher in (
+            mock.patch.dict(connections.settings, {ALIAS: settings_dict}),
+            mock.patch.object(type(self), 'databases', {'default', ALIAS}),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.wrapper = connections[ALIAS]
+
+    def tearDown(self):
+        self.wrapper.close()
+        self.wrapper.close_pool()
+        del connections[ALIAS]
+
+    def test_connection_is_reused(self):
+        pid = _backend_pid(self.wrapper)
+        self.wrapper.close()
+        self.assertEqual(_backend_pid(self.wrapper), pid)
+        stats = self.wrapper.pool.get_stats()
+        self.assertEqual(stats['connections_num'], 1)
+        self.assertEqual(stats['requests_num'], 2)
+
+    def test_broken_connection_replaced_on_checkout(self):
+        pid = _backend_pid(self.wrapper)
+        self.wrapper.close()
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT pg_terminate_backend(%s)', [pid])
+
+        self.assertNotEqual(_backend_pid(self.wrapper), pid)
+        self.assertEqual(self.wrapper.pool.get_stats()['connections_lost'], 1)
+
+    def test_checkout_times_out_when_exhausted(self):
+        self.wrapper.ensure_connection()
+        # Another thread's connection of the same alias shares the pool
+        other = connections.create_connection(ALIAS)
+        with self.assertRaises(OperationalError):
+            other.ensure_connection()
+        self.assertEqual(self.wrapper.pool.get_stats()['requests_errors'], 1)
+
+
+class PoolStatsTestCase(TestCase):
+
+    STATS = {
+        'pool_min': 2, 'pool_max': 11, 'pool_size': 5, 'pool_available': 3, 'requests_waiting': 1,
+        'requests_num': 40, 'requests_errors': 2, 'requests_wait_ms': 1500,
+        'connections_num': 6, 'connections_errors': 1, 'connections_lost': 1, 'returns_bad': 1,
+    }
+
+    def test_metrics_without_pool_are_untouched(self):
+        before = _sample('db_pool_requests_total', result='ok')
+        metrics.record_pool_stats()
+        self.assertEqual(_sample('db_pool_requests_total', result='ok'), before)
+
+    def test_metrics_record_gauges_and_increments(self):
+        requests_ok = _sample('db_pool_requests_total', result='ok')
+        wait = _sample('db_pool_wait_seconds_total')
+        lost = _sample('db_pool_connections_lost_total')
+        with mock.patch('core.services.metrics.get_pool_stats', return_value=self.STATS) as stats:
+            metrics.record_pool_stats()
+        stats.assert_called_once_with('default', reset=True)
+
+        self.assertEqual(_sample('db_pool_connections', state='idle'), 3)
+        self.assertEqual(_sample('db_pool_connections', state='in_use'), 2)
+        self.assertEqual(_sample('db_pool_max_connections'), 11)
+        self.assertEqual(_sample('db_pool_waiting_requests'), 1)
+        self.assertEqual(_sample('db_pool_requests_total', result='ok'), requests_ok + 38)
+        self.assertEqual(_sample('db_pool_wait_seconds_total'), wait + 1.5)
+        self.assertEqual(_sample('db_pool_connections_lost_total'), lost + 2)
+
+    def test_health_reports_pool(self):
+        with mock.patch('apps.users.auth_views.get_pool_stats', return_value=self.STATS):
+            body = self.client.get('/api/health/').json()
+        self.assertEqual(body['database_pool'], {
+            'pool_min': 2, 'pool_max': 11, 'pool_size': 5, 'pool_available': 3, 'requests_waiting': 1,
+        })
+
+    def test_health_without_pool(self):
+        self.assertNotIn('database_pool', self.client.get('/api/health/').json())
@@ -0,0 +1,93 @@
+"""
+Tests for cursor pagination on the user and account lists
+"""
+from datetime import datetime, timezone
+
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.accounts.models import Account
+from apps.users.models import User
+
+
+def _dt(y, m, d):
+    return datetime(y, m, d, tzinfo=timezone.utc)
+
+
+class UserAccountCursorPaginationAPITests(TestCase):
+    """GET /api/users/ and /api/accounts/ with ?cursor="""
+
+    def setUp(self):
+        self.client = APIClient()
+        # Duplicate names exercise the id tie-breaker
+        for i, name in enumerate(['Bea', 'Ann', 'Ann', 'Cal', 'Ann']):
+            User.objects.create(
+                usr_sf_id=f'usr00{i}',
+                usr_username=f'user{i}',
+                usr_email=f'user{i}@example.com',
+                usr_last_name='User',
+                usr_name=name,
+                usr_is_active=True,
+                usr_time_zone='UTC',
+                usr_language='en',
+                usr_sf_created_date=_dt(2020, 1, 1),
+                usr_last_modified_date=_dt(2020, 1, 1),
+                usr_last_modified_by_id='usr000',
+            )
+        for i, name in enumerate(['Zeta', 'Alpha', 'Alpha', 'Mid']):
+            Account.objects.create(
+                acc_sf_id=f'acc00{i}',
+                acc_name=name,
+                acc_owner_id_id='usr000' if i < 3 else 'usr001',
+                acc_last_modified_date=_dt(2020, 1, 1),
+                acc_last_modified_by_id='usr000',
+            )
+
+    def _walk(self, url, params):
+        """Follow next cursors to the end; return ids per page and the last meta."""
+        pages = []
+        params = dict(params, cursor='')
+        while True:
+            response = self.client.get(url, params)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            body = response.json()
+            pages.append([row['id'] for row in body['data']])
+            meta = body['meta']['pagination']
+            if not meta['has_next']:
+                return pages, meta
+            params['cursor'] = meta['next_cursor']
+
+    def test_users_cursor_walks_name_then_id(self):
+        pages, meta = self._walk('/api/users/', {'page_size': 2})
+        self.assertEqual(pages, [['usr001', 'usr002'], ['usr004', 'usr000'], ['usr003']])
+        self.assertTrue(meta['has_previous'])
+        self.assertNotIn('total_count', meta)
+
+    def test_users_previous_cursor_returns_prior_page(self):
+        first = self.client.get('/api/users/', {'cursor': '', 'page_size': 2}).json()
+        second = self.client.get(
+            '/api/users/', {'cursor': first['meta']['pagination']['next_cursor'], 'page_size': 2}
+        ).json()
+        back = self.client.get(
+            '/api/users/', {'cursor': second['meta']['pagination']['previous_cursor'], 'page_size': 2}
+        ).json()
+        self.assertEqual(back['data'], first['data'])
+        self.assertFalse(back['meta']['pagination']['has_previous'])
+
+    def test_accounts_cursor_walks_name_then_id(self):
+        pages, _ = self._walk('/api/accounts/', {'page_size': 3})
+        self.assertEqual(pages, [['acc001', 'acc002', 'acc003'], ['acc000']])
+
+    def test_accounts_by_user_cursor(self):
+        pages, _ = self._walk('/api/accounts/user/usr000/', {'page_size': 1})
+        self.assertEqual(pages, [['acc001'], ['acc002'], ['acc000']])
+
+    def test_invalid_cursor_is_rejected(self):
+        response = self.client.get('/api/accounts/', {'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_page_numbers_still_supported(self):
+        body = self.client.get('/api/accounts/', {'page': 2, 'page_size': 3}).json()
+        self.assertEqual([row['id'] for row in body['data']], ['acc000'])
+        self.assertEqual(body['meta']['pagination']['total_count'], 4)
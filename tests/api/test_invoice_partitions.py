@@ -0,0 +1,120 @@
+"""
+Tests for the yearly partitions of invoices and invoice_line_items
+"""
+from datetime import date
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import IntegrityError, connection, transaction
+from django.test import TestCase
+
+from apps.products.models import Invoice, InvoiceLineItem
+from apps.products.partition_services import (
+    PER_ACCOUNT_QUERY_SETTINGS, create_year_partitions, partition_years,
+)
+from core.db import local_settings_cursor
+from core.services.synthetic_data import SyntheticDataGenerator
+
+
+class InvoicePartitionTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        SyntheticDataGenerator(scale=0.01, seed=1, until=date(2025, 6, 30)).load()
+        cls.line = InvoiceLineItem.objects.select_related('ili_invoice_id').first()
+        cls.other = Invoice.objects.exclude(
+            inv_invoice_date__year=cls.line.ili_invoice_id.inv_invoice_date.year
+        ).first()
+
+    def _partition_of(self, table, column, value):
+        with connection.cursor() as cursor:
+            # Fire the deferred foreign key checks of the updates so far
+            cursor.execute('SET CONSTRAINTS ALL IMMEDIATE')
+            cursor.execute(f'SELECT tableoid::regclass::text FROM {table} WHERE {column} = %s', [value])
+            return cursor.fetchone()[0]
+
+    def test_line_item_date_filled_by_trigger(self):
+        InvoiceLineItem.objects.filter(pk=self.line.pk).update(ili_invoice_date=None)
+        self.line.refresh_from_db()
+        self.assertEqual(self.line.ili_invoice_date, self.line.ili_invoice_id.inv_invoice_date)
+
+    def test_line_item_follows_new_invoice(self):
+        InvoiceLineItem.objects.filter(pk=self.line.pk).update(ili_invoice_id=self.other.pk)
+        self.line.refresh_from_db()
+        self.assertEqual(self.line.ili_invoice_date, self.other.inv_invoice_date)
+        self.assertEqual(
+            self._partition_of('invoice_line_items', 'ili_sf_id', self.line.pk),
+            f'invoice_line_items_y{self.other.inv_invoice_date.year}',
+        )
+
+    def test_invoice_date_change_cascades(self):
+        invoice = self.line.ili_invoice_id
+        Invoice.objects.filter(pk=invoice.pk).update(inv_invoice_date=self.other.inv_invoice_date)
+        self.line.refresh_from_db()
+        self.assertEqual(self.line.ili_invoice_date, self.other.inv_invoice_date)
+
+    def test_create_partition_moves_default_rows(self):
+        invoice = self.line.ili_invoice_id
+        lines = InvoiceLineItem.objects.filter(ili_invoice_id=invoice.pk).count()
+        Invoice.objects.filter(pk=invoice.pk).update(inv_invoice_date=date(2040, 3, 1))
+        self.assertEqual(self._partition_of('invoices', 'inv_sf_id', invoice.pk), 'invoices_default')
+
+        moved = create_year_partitions(2040)
+        self.assertEqual(moved, {'invoices': 1, 'invoice_line_items': lines})
+        self.assertEqual(self._partition_of('invoices', 'inv_sf_id', invoice.pk), 'invoices_y2040')
+        self.assertEqual(
+            self._partition_of('invoice_line_items', 'ili_sf_id', self.line.pk), 'invoice_line_items_y2040'
+        )
+        self.assertEqual(create_year_partitions(2040), {})
+
+    def _ids(self, table, column, value):
+        with connection.cursor() as cursor:
+            cursor.execute('SET CONSTRAINTS ALL IMMEDIATE')
+            cursor.execute(f'SELECT count(*) FROM {table}_ids WHERE {column} = %s', [value])
+            return cursor.fetchone()[0]
+
+    def test_invoice_id_unique_across_partitions(self):
+        invoice = self.line.ili_invoice_id
+        invoice.inv_invoice_date = self.other.inv_invoice_date
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Invoice.objects.bulk_create([invoice])
+
+    def test_line_item_id_unique_across_partitions(self):
+        line = self.line
+        line.ili_invoice_id = self.other
+        line.ili_unique_line_code = f'{line.ili_unique_line_code}-copy'
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            InvoiceLineItem.objects.bulk_create([line])
+
+    def test_ids_follow_moved_rows(self):
+        invoice = self.line.ili_invoice_id
+        Invoice.objects.filter(pk=invoice.pk).update(inv_invoice_date=date(2040, 3, 1))
+        self.assertEqual(self._ids('invoices', 'inv_sf_id', invoice.pk), 1)
+        create_year_partitions(2040)
+        self.assertEqual(self._ids('invoices', 'inv_sf_id', invoice.pk), 1)
+        self.assertEqual(self._ids('invoice_line_items', 'ili_sf_id', self.line.pk), 1)
+
+        Invoice.objects.filter(pk=invoice.pk).delete()
+        self.assertEqual(self._ids('invoices', 'inv_sf_id', invoice.pk), 0)
+        self.assertEqual(self._ids('invoice_line_items', 'ili_sf_id', self.line.pk), 0)
+
+    def _setting(self, name):
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT current_setting(%s)', [name])
+            return cursor.fetchone()[0]
+
+    def test_per_account_settings_do_not_outlast_query(self):
+        name = 'max_parallel_workers_per_gather'
+        before = self._setting(name)
+        with local_settings_cursor('default', PER_ACCOUNT_QUERY_SETTINGS) as cursor:
+            cursor.execute('SELECT current_setting(%s)', [name])
+            self.assertEqual(cursor.fetchone()[0], PER_ACCOUNT_QUERY_SETTINGS[name])
+        self.assertEqual(self._setting(name), before)
+
+    def test_command_creates_future_years(self):
+        out = StringIO()
+        call_command('create_invoice_partitions', years_ahead=3, stdout=out)
+        this_year = date.today().year
+        for table in ('invoices', 'invoice_line_items'):
+            self.assertIn(this_year + 3, partition_years(table))
+        self.assertIn(f'{this_year + 3}: invoices (0 rows moved)', out.getvalue())
@@ -0,0 +1,137 @@
+"""
+Tests for MetricsMiddleware and the /api/metrics/ endpoint
+"""
+import os
+import tempfile
+from unittest import mock
+
+from django.db import connection
+from django.http import JsonResponse
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import path
+from prometheus_client import REGISTRY
+from prometheus_client.mmap_dict import MmapedDict, mmap_key
+
+from apps.users.auth_views import metrics_view
+from core.services import metrics
+
+
+def _one_query(request, item_id):
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT 1')
+    return JsonResponse({'id': item_id})
+
+
+urlpatterns = [
+    path('items/<str:item_id>/', _one_query),
+    path('metrics/', metrics_view),
+]
+
+ROUTE = 'items/<str:item_id>/'
+
+
+def _sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+@override_settings(ROOT_URLCONF=__name__)
+class MetricsMiddlewareTestCase(TestCase):
+
+    def test_requests_are_labelled_by_route_pattern(self):
+        before = _sample('http_requests_total', method='GET', route=ROUTE, status='200')
+        self.client.get('/items/a/')
+        self.client.get('/items/b/')
+        self.assertEqual(
+            _sample('http_requests_total', method='GET', route=ROUTE, status='200'), before + 2
+        )
+
+    def test_latency_and_db_time_are_observed(self):
+        latency = _sample('http_request_duration_seconds_count', method='GET', route=ROUTE)
+        queries = _sample('http_request_db_queries_sum', method='GET', route=ROUTE)
+        self.client.get('/items/a/')
+        self.assertEqual(
+            _sample('http_request_duration_seconds_count', method='GET', route=ROUTE), latency + 1
+        )
+        self.assertEqual(
+            _sample('http_request_db_queries_sum', method='GET', route=ROUTE), queries + 1
+        )
+        self.assertGreater(
+            _sample('http_request_db_duration_seconds_count', method='GET', route=ROUTE), 0
+        )
+
+    def test_unmatched_paths_share_one_series(self):
+        labels = dict(method='GET', route=metrics.UNMATCHED_ROUTE, status='404')
+        before = _sample('http_requests_total', **labels)
+        self.client.get('/no/such/path/')
+        self.client.get('/another/missing/path/')
+        self.assertEqual(_sample('http_requests_total', **labels), before + 2)
+
+    def test_endpoint_serves_text_format(self):
+        self.client.get('/items/a/')
+        response = self.client.get('/metrics/')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain'))
+        self.assertIn(b'http_request_duration_seconds_bucket', response.content)
+
+    def test_endpoint_is_get_only(self):
+        self.assertEqual(self.client.post('/metrics/').status_code, 405)
+
+
+@override_settings(ROOT_URLCONF=__name__, METRICS_TOKEN='', METRICS_ALLOWED_NETWORKS=['127.0.0.1/32'])
+class MetricsAccessTestCase(TestCase):
+
+    def _status(self, remote_addr='127.0.0.1', **headers):
+        return self.client.get('/metrics/', REMOTE_ADDR=remote_addr, headers=headers).status_code
+
+    def test_allowed_network(self):
+        self.assertEqual(self._status(), 200)
+        self.assertEqual(self._status('203.0.113.5'), 403)
+        with self.settings(METRICS_ALLOWED_NETWORKS=['10.0.0.0/8', '2001:db8::/32']):
+            self.assertEqual(self._status('10.1.2.3'), 200)
+            self.assertEqual(self._status('2001:db8::1'), 200)
+            self.assertEqual(self._status('127.0.0.1'), 403)
+
+    @override_settings(METRICS_TOKEN='scrape-secret')
+    def test_bearer_token(self):
+        remote = '203.0.113.5'
+        self.assertEqual(self._status(remote, Authorization='Bearer scrape-secret'), 200)
+        self.assertEqual(self._status(remote, Authorization='Bearer wrong'), 403)
+        self.assertEqual(self._status(remote, Authorization='Basic scrape-secret'), 403)
+        self.assertEqual(self._status(remote), 403)
+
+    def test_no_token_configured(self):
+        self.assertEqual(self._status('203.0.113.5', Authorization='Bearer '), 403)
+
+
+class CacheMetricsTestCase(SimpleTestCase):
+
+    def test_record_cache(self):
+        hits = _sample('cache_requests_total', cache='test', result=metrics.CACHE_HIT)
+        misses = _sample('cache_requests_total', cache='test', result=metrics.CACHE_MISS)
+        metrics.record_cache('test', True)
+        metrics.record_cache('test', False)
+        metrics.record_cache('test', False)
+        self.assertEqual(_sample('cache_requests_total', cache='test', result='hit'), hits + 1)
+        self.assertEqual(_sample('cache_requests_total', cache='test', result='miss'), misses + 2)
+
+
+class MultiprocessRenderTestCase(SimpleTestCase):
+
+    def test_counters_of_all_workers_are_summed(self):
+        key = mmap_key(
+            'http_requests_total', 'http_requests_total',
+            ['method', 'route', 'status'], ['GET', ROUTE, '200'], '',
+        )
+        with tempfile.TemporaryDirectory() as directory:
+            # Samples as two gunicorn workers write them
+            for pid, value in [(101, 2.0), (102, 3.0)]:
+                values = MmapedDict(os.path.join(directory, f'counter_{pid}.db'))
+                values.write_value(key, value, 0)
+                values.close()
+            with mock.patch.dict(os.environ, {'PROMETHEUS_MULTIPROC_DIR': directory}):
+                body, content_type = metrics.render()
+        self.assertIn(
+            f'http_requests_total{{method="GET",route="{ROUTE}",status="200"}} 5.0'.encode(),
+            body,
+        )
+        self.assertTrue(content_type.startswith('text/plain'))
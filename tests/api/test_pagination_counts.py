@@ -0,0 +1,131 @@
+"""
+Tests for page-number pagination count strategies
+"""
+from datetime import datetime, timezone
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from rest_framework.exceptions import NotFound
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from apps.users.models import User
+from core.api.utils.pagination import (
+    COUNT_CACHED,
+    COUNT_ESTIMATE,
+    COUNT_EXACT,
+    CountingPaginator,
+    LargePagination,
+    StandardPagination,
+    estimate_count,
+)
+
+factory = APIRequestFactory()
+
+
+def _user(i):
+    created = datetime(2020, 1, 1, tzinfo=timezone.utc)
+    return User(
+        usr_sf_id=f'usr{i:03d}', usr_username=f'user{i}', usr_email=f'u{i}@example.com',
+        usr_last_name='User', usr_name=f'User {i}', usr_is_active=True,
+        usr_time_zone='UTC', usr_language='en', usr_sf_created_date=created,
+        usr_last_modified_date=created, usr_last_modified_by_id='usr000',
+    )
+
+
+def _paginate(pagination, queryset, **params):
+    request = Request(factory.get('/', params))
+    page = pagination.paginate_queryset(queryset, request)
+    return page, pagination.get_paginated_response(page).data['meta']['pagination']
+
+
+@override_settings(PAGINATION_ESTIMATE_THRESHOLD=0, PAGINATION_COUNT_CACHE_TIMEOUT=30)
+class PaginationCountStrategyTests(TestCase):
+    """CountingPaginator behind StandardPagination/LargePagination/SmallPagination"""
+
+    def setUp(self):
+        cache.clear()
+        User.objects.bulk_create([_user(i) for i in range(5)])
+        # Planner statistics outlive the rollback of earlier tests that
+        # loaded more users; estimate from these five
+        with connection.cursor() as cursor:
+            cursor.execute(f'ANALYZE {User._meta.db_table}')
+        self.queryset = User.objects.filter(usr_is_active=True).order_by('usr_sf_id')
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_exact_count(self):
+        page, meta = _paginate(StandardPagination(COUNT_EXACT), self.queryset, page_size=2)
+        self.assertEqual(len(page), 2)
+        self.assertEqual(meta['total_count'], 5)
+        self.assertTrue(meta['total_count_exact'])
+        self.assertEqual(meta['total_pages'], 3)
+
+    def test_cached_count_is_reused_until_timeout(self):
+        _, first = _paginate(StandardPagination(COUNT_CACHED), self.queryset)
+        self.assertEqual(first['total_count'], 5)
+        self.assertTrue(first['total_count_exact'])
+
+        _user(99).save()
+        _, second = _paginate(StandardPagination(COUNT_CACHED), self.queryset)
+        self.assertEqual(second['total_count'], 5)
+        self.assertFalse(second['total_count_exact'])
+
+        # Different filters are cached separately
+        _, other = _paginate(
+            StandardPagination(COUNT_CACHED), self.queryset.filter(usr_sf_id__gte='usr003')
+        )
+        self.assertEqual(other['total_count'], 3)
+
+    def test_estimate_above_threshold_is_not_exact(self):
+        page, meta = _paginate(StandardPagination(COUNT_ESTIMATE), self.queryset, page_size=2)
+        self.assertEqual(len(page), 2)
+        self.assertFalse(meta['total_count_exact'])
+        self.assertGreaterEqual(meta['total_count'], 0)
+
+    @override_settings(PAGINATION_ESTIMATE_THRESHOLD=10 ** 9)
+    def test_estimate_below_threshold_counts_exactly(self):
+        _, meta = _paginate(LargePagination(COUNT_ESTIMATE), self.queryset)
+        self.assertEqual(meta['total_count'], 5)
+        self.assertTrue(meta['total_count_exact'])
+
+    def test_page_past_estimated_end_is_empty_not_404(self):
+        page, meta = _paginate(
+            StandardPagination(COUNT_ESTIMATE), self.queryset, page=10 ** 6, page_size=2
+        )
+        self.assertEqual(page, [])
+        self.assertFalse(meta['total_count_exact'])
+
+    def test_underestimated_count_does_not_cut_off_pages(self):
+        with mock.patch('core.api.utils.pagination.estimate_count', return_value=1):
+            pages = [
+                _paginate(StandardPagination(COUNT_ESTIMATE), self.queryset, page=number, page_size=2)
+                for number in (1, 2, 3, 4)
+            ]
+        self.assertEqual([len(page) for page, _ in pages], [2, 2, 1, 0])
+        self.assertEqual([meta['has_next'] for _, meta in pages], [True, True, False, False])
+        rows = [row.usr_sf_id for page, _ in pages for row in page]
+        self.assertEqual(rows, [f'usr{i:03d}' for i in range(5)])
+
+    def test_overestimated_count_has_no_next_at_real_end(self):
+        with mock.patch('core.api.utils.pagination.estimate_count', return_value=1000):
+            page, meta = _paginate(StandardPagination(COUNT_ESTIMATE), self.queryset, page=3, page_size=2)
+        self.assertEqual(len(page), 1)
+        self.assertFalse(meta['has_next'])
+        self.assertEqual(meta['total_count'], 1000)
+
+    def test_page_past_exact_end_is_404(self):
+        with self.assertRaises(NotFound):
+            _paginate(StandardPagination(COUNT_EXACT), self.queryset, page=4, page_size=2)
+
+    def test_unfiltered_estimate_reads_reltuples(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f'ANALYZE {User._meta.db_table}')
+        self.assertEqual(estimate_count(User.objects.all()), 5)
+
+    def test_unknown_strategy_is_rejected(self):
+        with self.assertRaises(ValueError):
+            CountingPaginator(self.queryset, 10, count_strategy='guess')
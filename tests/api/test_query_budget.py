@@ -0,0 +1,109 @@
+"""
+Tests for QueryBudgetMiddleware
+"""
+from datetime import datetime, timezone
+
+from django.db import connection
+from django.http import JsonResponse
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import path
+from rest_framework.test import APIClient
+
+from apps.users.models import User
+from core.middleware.query_budget_middleware import (
+    DUPLICATE_QUERIES_HEADER,
+    QUERY_COUNT_HEADER,
+    QueryBudgetExceeded,
+    fingerprint,
+    query_budget,
+)
+
+
+def _run_queries(request):
+    """Runs ?n= copies of the same statement, then one distinct statement."""
+    with connection.cursor() as cursor:
+        for i in range(int(request.GET.get('n', '1'))):
+            cursor.execute('SELECT %s', [i])
+        cursor.execute('SELECT 1 + 1')
+    return JsonResponse({})
+
+
+@query_budget(3)
+def _budgeted(request):
+    return _run_queries(request)
+
+
+urlpatterns = [
+    path('unbudgeted/', _run_queries),
+    path('budgeted/', _budgeted),
+]
+
+
+class FingerprintTestCase(SimpleTestCase):
+
+    def test_in_lists_of_any_length_share_a_fingerprint(self):
+        self.assertEqual(
+            fingerprint('SELECT * FROM cases WHERE cs_sf_id IN (%s, %s)'),
+            fingerprint('SELECT * FROM cases WHERE cs_sf_id IN (%s, %s, %s, %s)'),
+        )
+        self.assertNotEqual(fingerprint('SELECT 1'), fingerprint('SELECT 2'))
+
+
+@override_settings(ROOT_URLCONF=__name__, QUERY_BUDGET_HEADERS=True, QUERY_BUDGET_REPEAT_THRESHOLD=3)
+class QueryBudgetMiddlewareTestCase(TestCase):
+
+    def test_headers_report_count_and_duplicates(self):
+        response = self.client.get('/unbudgeted/', {'n': 3})
+        # Savepoints of ATOMIC_REQUESTS are not counted
+        self.assertEqual(response[QUERY_COUNT_HEADER], '4')
+        self.assertEqual(response[DUPLICATE_QUERIES_HEADER], '2')
+
+    @override_settings(QUERY_BUDGET_HEADERS=False)
+    def test_headers_off(self):
+        response = self.client.get('/unbudgeted/')
+        self.assertNotIn(QUERY_COUNT_HEADER, response)
+
+    def test_repeated_statement_is_logged(self):
+        with self.assertLogs('core.middleware.query_budget_middleware', 'WARNING') as logs:
+            self.client.get('/unbudgeted/', {'n': 3})
+        self.assertIn('possible N+1', logs.output[0])
+
+    def test_within_budget(self):
+        response = self.client.get('/budgeted/', {'n': 2})
+        self.assertEqual(response.status_code, 200)
+
+    def test_over_budget_fails_under_test_runner(self):
+        with self.assertRaises(QueryBudgetExceeded):
+            self.client.get('/budgeted/', {'n': 3})
+
+    @override_settings(QUERY_BUDGET_ENFORCE=False)
+    def test_over_budget_is_logged_when_not_enforced(self):
+        with self.assertLogs('core.middleware.query_budget_middleware', 'WARNING') as logs:
+            response = self.client.get('/budgeted/', {'n': 3})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('ran 4 queries, budget is 3', logs.output[-1])
+
+
+class DeclaredBudgetsTestCase(TestCase):
+    """Paginated list endpoints stay within their query_budget"""
+
+    def setUp(self):
+        created = datetime(2020, 1, 1, tzinfo=timezone.utc)
+        User.objects.create(
+            usr_sf_id='usr001', usr_username='user', usr_email='user@example.com',
+            usr_last_name='User', usr_name='User', usr_is_active=True, usr_time_zone='UTC',
+            usr_language='en', usr_sf_created_date=created, usr_last_modified_date=created,
+            usr_last_modified_by_id='usr001',
+        )
+        self.client = APIClient()
+
+    def test_paginated_lists(self):
+        for url, params in [
+            ('/api/users/', {'page': 1}),
+            ('/api/accounts/', {'page': 1}),
+            ('/api/accounts/user/usr001/', {'page': 1, 'scope': 'territory'}),
+            ('/api/complaints-cases/', {'page': 1}),
+            ('/api/campaigns/', {'account_id': 'acc001', 'page': 1}),
+            ('/api/campaigns/tasks/', {'campaign_id': 'cmp001', 'page': 1}),
+        ]:
+            self.assertEqual(self.client.get(url, params).status_code, 200, url)
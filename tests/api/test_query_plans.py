@@ -0,0 +1,197 @@
+"""
+Query-plan regression tests for the hand-written analytics SQL
+
+Each hot query of SalesAnalyticsService and ProductPerformanceService is run
+once against synthetic data to capture its SQL, then EXPLAINed. The tests
+assert on plan shape rather than timings: invoice_line_items and the other
+large tables must be reached through an index on the expected column, and
+the estimated total cost must stay under a bound. Dropping an index, or
+rewriting a query so it no longer uses one, fails here. Product performance
+without an account aggregates every invoice and is not covered.
+
+invoices and invoice_line_items are partitioned by year, so plans name the
+partitions and their indexes; both are mapped back to the partitioned table
+and index before asserting. A separate test checks that the date predicates
+prune both tables to the requested years.
+
+The data has to be large enough for the planner to prefer indexes at all:
+below scale 0.6 a sequential scan of the yearly invoice_line_items partitions
+is the cheaper plan. Cost bounds hold for that data (scale 0.6, seed 1) with
+roughly 2x headroom over the plans at the time of writing. A bound that trips after an intended
+change should be raised together with the plan change that explains it.
+"""
+import json
+from datetime import date
+
+from django.db import connection
+from django.db.models import Count
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from apps.products.analytics_services import SalesAnalyticsService
+from apps.products.models import Invoice, InvoiceLineItem, OrderLineItem
+from apps.products.partition_services import PARTITIONED_TABLES, PER_ACCOUNT_QUERY_SETTINGS, partition_name
+from apps.products.services import ProductPerformanceService
+from core.db import local_settings_cursor
+from core.services.slow_queries import iter_plan_nodes
+from core.services.synthetic_data import SyntheticDataGenerator
+
+FROM_DATE = '2024-01-01'
+TO_DATE = '2025-06-30'
+
+# Tables that must never be read with a sequential scan by these queries
+LARGE_TABLES = ('invoice_line_items', 'invoices', 'orders', 'order_items', 'arf_rolling_forecasts')
+
+
+def _busiest(queryset, column):
+    return queryset.values(column).annotate(n=Count('*')).order_by('-n', column).first()[column]
+
+
+class QueryPlanTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        SyntheticDataGenerator(scale=0.6, seed=1, until=date(2025, 6, 30)).load()
+        cls.account_id = _busiest(Invoice.objects.filter(inv_active=1), 'inv_account_id')
+        cls.product_id = _busiest(
+            InvoiceLineItem.objects.filter(ili_invoice_id__inv_account_id=cls.account_id), 'ili_product_id'
+        )
+        cls.family = InvoiceLineItem.objects.filter(ili_product_id=cls.product_id).values_list(
+            'ili_product_id__prd_family', flat=True
+        ).first()
+        cls.order_id = _busiest(
+            OrderLineItem.objects.filter(ori_order_id__ord_account_id=cls.account_id), 'ori_order_id'
+        )
+
+    def _plans(self, func, *args):
+        """
+        EXPLAIN (FORMAT JSON) of every query ``func(*args)`` executes, under
+        the settings the services use for one account's invoices.
+        """
+        with CaptureQueriesContext(connection) as captured:
+            func(*args)
+        queries = [
+            query['sql'] for query in captured.captured_queries
+            if query['sql'].lstrip().startswith(('SELECT', 'WITH')) and 'set_config' not in query['sql']
+        ]
+        self.assertTrue(queries)
+        plans = []
+        with local_settings_cursor('default', PER_ACCOUNT_QUERY_SETTINGS) as cursor:
+            for sql in queries:
+                cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}')
+                plan = cursor.fetchone()[0]
+                plans.append(json.loads(plan) if isinstance(plan, str) else plan)
+        return plans
+
+    def _parents(self):
+        """Partition or partition index name -> its partitioned table or index."""
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT inhrelid::regclass::text, inhparent::regclass::text FROM pg_inherits')
+            return dict(cursor.fetchall())
+
+    def _index_columns(self, tables):
+        """Index name -> its columns, for the indexes of ``tables``."""
+        columns = {}
+        with connection.cursor() as cursor:
+            for table in tables:
+                for name, constraint in connection.introspection.get_constraints(cursor, table).items():
+                    if constraint['index']:
+                        columns[name] = constraint['columns']
+        return columns
+
+    def assertPlan(self, plans, indexed, max_cost):
+        """
+        Assert every plan avoids sequential scans of LARGE_TABLES, reads each
+        table in ``indexed`` through an index whose leading column is the
+        given one, and has an estimated total cost of at most ``max_cost``.
+        """
+        index_columns = self._index_columns(indexed)
+        parents = self._parents()
+        for plan in plans:
+            nodes = list(iter_plan_nodes(plan))
+            seq_scans = {
+                parents.get(node['Relation Name'], node['Relation Name']) for node in nodes
+                if node['Node Type'] == 'Seq Scan'
+            }.intersection(LARGE_TABLES)
+            self.assertFalse(seq_scans, f'Sequential scan of {sorted(seq_scans)}')
+            cost = plan[0]['Plan']['Total Cost']
+            self.assertLessEqual(cost, max_cost, f'Estimated cost {cost} over {max_cost}')
+
+        used_indexes = {
+            parents.get(node['Index Name'], node['Index Name'])
+            for plan in plans
+            for node in iter_plan_nodes(plan)
+            if 'Index Name' in node
+        }
+        used = {tuple(index_columns[name][:1]) for name in used_indexes if name in index_columns}
+        for table, column in indexed.items():
+            self.assertIn((column,), used, f'{table} not read through an index on {column}')
+
+    def test_product_family_analytics(self):
+        plans = self._plans(
+            SalesAnalyticsService.get_product_family_analytics, self.account_id, FROM_DATE, TO_DATE
+        )
+        self.assertPlan(plans, {
+            'invoices': 'inv_account_id',
+            'invoice_line_items': 'ili_invoice_id',
+            'orders': 'ord_account_id',
+            'order_items': 'ori_order_id',
+            'arf_rolling_forecasts': 'arf_account_id',
+        }, max_cost=7500)
+
+    def test_product_analytics(self):
+        plans = self._plans(
+            SalesAnalyticsService.get_product_analytics, self.account_id, self.family, FROM_DATE, TO_DATE
+        )
+        self.assertPlan(plans, {
+            'invoices': 'inv_account_id',
+            'invoice_line_items': 'ili_invoice_id',
+            'orders': 'ord_account_id',
+            'order_items': 'ori_order_id',
+            'arf_rolling_forecasts': 'arf_account_id',
+        }, max_cost=7500)
+
+    def test_invoice_partitions_pruned(self):
+        """Only the requested years and the year before are read."""
+        plans = self._plans(
+            SalesAnalyticsService.get_product_family_analytics, self.account_id, FROM_DATE, TO_DATE
+        )
+        scanned = {
+            node['Relation Name']
+            for plan in plans
+            for node in iter_plan_nodes(plan)
+            if node.get('Relation Name', '').startswith(('invoices', 'invoice_line_items'))
+        }
+        self.assertEqual(scanned, {
+            partition_name(table, year)
+            for table in PARTITIONED_TABLES
+            for year in (2023, 2024, 2025)
+        })
+
+    def test_order_contribution(self):
+        plans = self._plans(
+            SalesAnalyticsService.get_order_contribution, self.account_id, self.product_id, FROM_DATE, TO_DATE
+        )
+        self.assertPlan(plans, {
+            'orders': 'ord_account_id',
+            'order_items': 'ori_order_id',
+        }, max_cost=1300)
+
+    def test_order_details(self):
+        plans = self._plans(
+            SalesAnalyticsService.get_order_details, self.account_id, self.order_id, FROM_DATE, TO_DATE
+        )
+        self.assertPlan(plans, {
+            'orders': 'ord_sf_id',
+            'order_items': 'ori_order_id',
+        }, max_cost=80)
+
+    def test_product_performance_for_account(self):
+        plans = self._plans(
+            ProductPerformanceService.get_product_performance, FROM_DATE, TO_DATE, self.account_id
+        )
+        self.assertPlan(plans, {
+            'invoices': 'inv_account_id',
+            'invoice_line_items': 'ili_invoice_id',
+            'arf_rolling_forecasts': 'arf_account_id',
+        }, max_cost=3400)
@@ -0,0 +1,100 @@
+"""
+Tests for read_only_requests (reads outside the ATOMIC_REQUESTS transaction)
+"""
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, URLResolver, get_resolver, path
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from core.db import read_only_requests
+
+
+@read_only_requests
+class _ItemsView(APIView):
+    permission_classes = [AllowAny]
+
+    def get(self, request):
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+        if request.query_params.get('fail'):
+            raise ValidationError('fail')
+        return Response({})
+
+    def post(self, request):
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+        if request.data.get('fail'):
+            raise ValidationError('fail')
+        return Response({}, status=201)
+
+
+urlpatterns = [
+    path('items/', _ItemsView.as_view()),
+]
+
+
+def _savepoints(queries):
+    return [query['sql'].split()[0] for query in queries if 'SAVEPOINT' in query['sql']]
+
+
+@override_settings(ROOT_URLCONF=__name__)
+class ReadOnlyRequestsTestCase(TestCase):
+    """Under TestCase, ATOMIC_REQUESTS shows up as a savepoint per request."""
+
+    def _request(self, method, **kwargs):
+        with CaptureQueriesContext(connection) as queries:
+            response = getattr(self.client, method)('/items/', **kwargs)
+        return response, _savepoints(queries.captured_queries)
+
+    def test_get_runs_outside_transaction(self):
+        response, savepoints = self._request('get')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(savepoints, [])
+
+    def test_post_still_atomic(self):
+        response, savepoints = self._request('post')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(savepoints, ['SAVEPOINT', 'RELEASE'])
+
+    def test_handled_exception_rolls_back_post(self):
+        response, savepoints = self._request('post', data={'fail': '1'}, content_type='application/json')
+        self.assertEqual(response.status_code, 422)
+        self.assertIn('ROLLBACK', savepoints)
+
+    def test_handled_exception_in_get_leaves_transaction_alone(self):
+        # The open atomic block is the TestCase's, not a request transaction
+        response, _ = self._request('get', data={'fail': '1'})
+        self.assertEqual(response.status_code, 422)
+        self.assertFalse(connection.needs_rollback)
+        response, _ = self._request('get')
+        self.assertEqual(response.status_code, 200)
+
+
+class ReadEndpointErrorsTestCase(TestCase):
+
+    def test_invalid_request_then_valid_request(self):
+        self.assertEqual(self.client.get('/api/accounts/', {'fields': 'bogus'}).status_code, 422)
+        self.assertEqual(self.client.get('/api/accounts/').status_code, 200)
+
+
+class ReadEndpointsTestCase(SimpleTestCase):
+
+    def _api_views(self, patterns=None, prefix=''):
+        for pattern in get_resolver().url_patterns if patterns is None else patterns:
+            route = prefix + str(pattern.pattern)
+            if isinstance(pattern, URLResolver):
+                yield from self._api_views(pattern.url_patterns, route)
+            elif isinstance(pattern, URLPattern) and route.startswith('api/') and 'schema' not in route:
+                yield route, pattern.callback
+
+    def test_read_endpoints_skip_request_transaction(self):
+        for route, view in self._api_views():
+            view_class = getattr(view, 'cls', None)
+            if view_class is not None and not hasattr(view_class, 'get'):
+                continue
+            with self.subTest(route=route):
+                self.assertIn('default', getattr(view, '_non_atomic_requests', set()))
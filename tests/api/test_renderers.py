@@ -0,0 +1,94 @@
+"""
+Unit tests for the orjson-backed JSON renderer
+"""
+import json
+import uuid
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import Decimal
+
+from django.test import SimpleTestCase
+from django.utils.translation import gettext_lazy
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.serializer_helpers import ReturnDict
+
+from core.api.renderers import FastJSONRenderer
+from core.api.responses import APIResponse
+
+
+def sample_payload():
+    """Envelope with every value type the API emits."""
+    return {
+        "success": True,
+        "message": gettext_lazy("Data retrieved successfully"),
+        "data": [
+            ReturnDict({
+                "id": "acc000001",
+                "name": "Café Ünïcode   line",
+                "credit_limit": "1500.50",
+                "amount": Decimal("1234.5600"),
+                "zero": Decimal("0"),
+                "rate": 0.1,
+                "count": 3,
+                "active": True,
+                "missing": None,
+                "created": datetime(2024, 3, 5, 14, 30, 15, 123456, tzinfo=timezone.utc),
+                "modified": datetime(2024, 3, 5, 14, 30, tzinfo=timezone(timedelta(hours=2))),
+                "naive": datetime(2024, 3, 5, 14, 30),
+                "day": date(2024, 3, 5),
+                "at": time(9, 15),
+                "uuid": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+                "by_status": {"Open": 2, "Closed": 0},
+                "tags": ("a", "b"),
+            }, serializer=None),
+        ],
+        "meta": {"pagination": {"current_page": 1, "has_next": False}},
+    }
+
+
+class FastJSONRendererTestCase(SimpleTestCase):
+    """FastJSONRenderer output matches rest_framework's JSONRenderer"""
+
+    def test_same_bytes_as_json_renderer(self):
+        payload = sample_payload()
+        self.assertEqual(
+            FastJSONRenderer().render(payload),
+            JSONRenderer().render(payload),
+        )
+
+    def test_line_separators_escaped(self):
+        rendered = FastJSONRenderer().render({"text": "a b c"})
+        self.assertEqual(rendered, b'{"text":"a\\u2028b\\u2029c"}')
+
+    def test_none_renders_empty(self):
+        self.assertEqual(FastJSONRenderer().render(None), b'')
+
+    def test_indent_falls_back_to_json_renderer(self):
+        payload = {"a": [1, 2]}
+        self.assertEqual(
+            FastJSONRenderer().render(payload, 'application/json; indent=2'),
+            JSONRenderer().render(payload, 'application/json; indent=2'),
+        )
+
+    def test_big_int_falls_back_to_json_renderer(self):
+        self.assertEqual(FastJSONRenderer().render({"n": 2 ** 70}), b'{"n":1180591620717411303424}')
+
+    def test_non_string_keys_fall_back_to_json_renderer(self):
+        self.assertEqual(FastJSONRenderer().render({3: "a", None: "b"}), b'{"3":"a","null":"b"}')
+
+    def test_non_finite_floats_raise_value_error(self):
+        for value in [float("nan"), float("inf"), float("-inf"), Decimal("NaN"), Decimal("-Infinity")]:
+            with self.subTest(value=value):
+                with self.assertRaisesMessage(ValueError, "Out of range float values are not JSON compliant"):
+                    FastJSONRenderer().render({"data": [{"id": 1, "rank": None}, {"id": 2, "rank": value}]})
+
+    def test_non_strict_falls_back_to_json_renderer(self):
+        renderer = FastJSONRenderer()
+        renderer.strict = False
+        self.assertEqual(renderer.render({"rank": float("nan"), "n": None}), b'{"rank":NaN,"n":null}')
+
+    def test_streamed_matches_success(self):
+        items = sample_payload()["data"] * 3
+        streamed = b''.join(APIResponse.streamed(iter(items), message="ok").streaming_content)
+        rendered = FastJSONRenderer().render(APIResponse.success(data=items, message="ok").data)
+        self.assertEqual(streamed, rendered)
+        self.assertEqual(json.loads(streamed)["data"][0]["amount"], 1234.56)
@@ -0,0 +1,114 @@
+"""
+Tests for read replica routing (ReplicaRouter, @replica_reads)
+
+The replica is a second local database copied from the empty test database
+before the test data is loaded into the primary: a routed read finds no
+rows, a read from the primary finds the synthetic data.
+"""
+import time
+from datetime import date
+from unittest import mock
+
+from django.db import OperationalError, connection, connections
+from django.test import TestCase
+
+from apps.cases.models import Case
+from apps.users.models import User
+from core import db_router
+from core.db_router import PRIMARY_UNTIL_COOKIE, REPLICA_ALIAS, ReplicaRouter, read_alias
+from core.services.synthetic_data import SyntheticDataGenerator
+
+
+class ReplicaRoutingTestCase(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        settings_dict = connection.settings_dict
+        replica_name = f'{settings_dict["NAME"]}_replica'
+        # The template must have no other sessions
+        connection.close()
+        with connection._nodb_cursor() as cursor:
+            cursor.execute(f'DROP DATABASE IF EXISTS "{replica_name}"')
+            cursor.execute(f'CREATE DATABASE "{replica_name}" TEMPLATE "{settings_dict["NAME"]}"')
+
+        patcher = mock.patch.dict(connections.settings, {REPLICA_ALIAS: {
+            **settings_dict,
+            'NAME': replica_name,
+            'ATOMIC_REQUESTS': False,
+            'TEST': {**settings_dict['TEST'], 'MIRROR': None},
+        }})
+        patcher.start()
+        cls.addClassCleanup(patcher.stop)
+        cls.addClassCleanup(cls._drop_replica, replica_name)
+        cls.databases = {'default', REPLICA_ALIAS}
+        super().setUpClass()
+
+    @classmethod
+    def _drop_replica(cls, replica_name):
+        connections[REPLICA_ALIAS].close()
+        del connections[REPLICA_ALIAS]
+        with connection._nodb_cursor() as cursor:
+            cursor.execute(f'DROP DATABASE IF EXISTS "{replica_name}"')
+
+    @classmethod
+    def setUpTestData(cls):
+        SyntheticDataGenerator(scale=0.01, seed=1, until=date(2025, 6, 30)).load()
+        cls.account_id = Case.objects.values_list('cs_account_id', flat=True).first()
+        cls.sales = {'accountId': cls.account_id, 'from': '2024-01', 'to': '2025-06'}
+
+    def setUp(self):
+        db_router._lag['checked_at'] = float('-inf')
+
+    def _cases(self):
+        response = self.client.get('/api/complaints-cases/', {'account_id': self.account_id})
+        self.assertEqual(response.status_code, 200)
+        return response.json()['data']
+
+    def _families(self):
+        response = self.client.get('/api/sales/family/', self.sales)
+        self.assertEqual(response.status_code, 200)
+        return response.json()['data']
+
+    def test_marked_views_read_from_replica(self):
+        self.assertEqual(self._cases(), [])
+        self.assertEqual(self._families(), [])
+
+    def test_other_views_read_from_primary(self):
+        response = self.client.get('/api/accounts/')
+        self.assertTrue(response.json()['data'])
+
+    def test_own_write_pins_reads_to_primary(self):
+        response = self.client.post(
+            f'/api/complaints-cases/{Case.objects.first().pk}/comments/',
+            {'comment_body': 'Called back', 'created_by_id': User.objects.first().pk},
+            content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 201)
+        cookie = response.cookies[PRIMARY_UNTIL_COOKIE]
+        self.assertGreater(float(cookie.value), time.time())
+        self.assertTrue(self._cases())
+        self.assertTrue(self._families())
+
+        # Once the staleness window is over, reads go back to the replica
+        self.client.cookies[PRIMARY_UNTIL_COOKIE] = str(time.time() - 1)
+        self.assertEqual(self._cases(), [])
+
+    def test_lagging_replica_falls_back_to_primary(self):
+        with mock.patch('core.db_router.replica_lag', return_value=60.0):
+            self.assertTrue(self._cases())
+
+    def test_unreachable_replica_falls_back_to_primary(self):
+        replica = connections[REPLICA_ALIAS]
+        with mock.patch.object(replica, 'cursor', side_effect=OperationalError('connection refused')), \
+                self.assertLogs('core.db_router', 'WARNING'):
+            self.assertTrue(self._cases())
+            # Not retried on every request
+            self.assertTrue(self._cases())
+            self.assertEqual(replica.cursor.call_count, 1)
+
+    def test_reads_outside_views_use_primary(self):
+        self.assertEqual(read_alias(), 'default')
+        router = ReplicaRouter()
+        self.assertIsNone(router.db_for_read(Case))
+        self.assertEqual(router.db_for_write(Case), 'default')
+        self.assertFalse(router.allow_migrate(REPLICA_ALIAS, 'cases'))
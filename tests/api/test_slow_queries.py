@@ -0,0 +1,113 @@
+"""
+Tests for the slow-query log and the slow_queries command
+"""
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.http import JsonResponse
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import path
+
+from core.services import slow_queries
+
+
+def _sleep(request):
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT pg_sleep(%s)', [float(request.GET.get('seconds', '0.05'))])
+        cursor.execute('SELECT 1')
+    return JsonResponse({})
+
+
+urlpatterns = [
+    path('sleep/', _sleep),
+]
+
+
+class _LogFileMixin:
+
+    def setUp(self):
+        super().setUp()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'slow.jsonl')
+        slow_queries._last_explained.clear()
+
+
+@override_settings(ROOT_URLCONF=__name__, SLOW_QUERY_THRESHOLD_MS=20)
+class SlowQueryRecorderTestCase(_LogFileMixin, TestCase):
+
+    def _get(self, seconds='0.05'):
+        with override_settings(SLOW_QUERY_LOG_PATH=self.path):
+            self.client.get('/sleep/', {'seconds': seconds})
+            slow_queries.wait_idle(timeout=10)
+        return list(slow_queries.read_records(self.path))
+
+    def test_slow_statement_is_recorded_with_plan(self):
+        records = self._get()
+        self.assertEqual(len(records), 1)
+        record = records[0]
+        self.assertEqual(record['sql'], 'SELECT pg_sleep(%s)')
+        self.assertEqual(record['params'], [0.05])
+        self.assertEqual(record['source'], 'GET /sleep/')
+        self.assertGreaterEqual(record['duration_ms'], 20)
+        self.assertIn('Execution Time', record['plan'][0])
+        self.assertIn('Shared Hit Blocks', record['plan'][0]['Plan'])
+
+    def test_fast_statements_are_not_recorded(self):
+        self.assertEqual(self._get(seconds='0'), [])
+
+    def test_fingerprint_is_explained_once_per_interval(self):
+        self._get()
+        records = self._get()
+        self.assertEqual([record['explained'] for record in records], [True, False])
+        self.assertNotIn('plan', records[1])
+
+    @override_settings(SLOW_QUERY_THRESHOLD_MS=0)
+    def test_disabled(self):
+        self.assertEqual(self._get(), [])
+
+
+class SlowQueryLogTestCase(_LogFileMixin, SimpleTestCase):
+
+    def test_writes_are_not_explained(self):
+        with override_settings(SLOW_QUERY_LOG_PATH=self.path):
+            slow_queries.record_slow_query('default', 'UPDATE users SET usr_name = %s', ['x'], 1.0)
+            slow_queries.wait_idle(timeout=10)
+        record, = slow_queries.read_records(self.path)
+        self.assertFalse(record['explained'])
+
+    @override_settings(SLOW_QUERY_LOG_MAX_BYTES=300)
+    def test_log_rotates_and_stays_bounded(self):
+        for i in range(10):
+            slow_queries.write_record({'fingerprint': str(i), 'sql': 'x' * 100}, self.path)
+        self.assertTrue(os.path.exists(f'{self.path}.1'))
+        kept = [record['fingerprint'] for record in slow_queries.read_records(self.path)]
+        self.assertLess(len(kept), 10)
+        self.assertEqual(kept[-1], '9')
+        self.assertEqual(kept, sorted(kept))
+
+    def test_command_lists_top_offenders(self):
+        plan = [{'Plan': {'Node Type': 'Seq Scan', 'Relation Name': 'invoices'}, 'Execution Time': 812.5}]
+        for fingerprint, duration, extra in [
+            ('aaa', 100.0, {}),
+            ('bbb', 900.0, {'plan': plan, 'params': ['acc001']}),
+            ('aaa', 150.0, {}),
+        ]:
+            slow_queries.write_record(dict({
+                'at': '2026-01-01T00:00:00+00:00', 'fingerprint': fingerprint,
+                'duration_ms': duration, 'source': 'GET /api/sales/', 'sql': f'SELECT {fingerprint}',
+            }, **extra), self.path)
+
+        out = StringIO()
+        call_command('slow_queries', path=self.path, sort='count', stdout=out)
+        lines = out.getvalue().splitlines()
+        self.assertTrue(lines[1].startswith('aaa'))
+        self.assertIn('250.0', lines[1])
+
+        out = StringIO()
+        call_command('slow_queries', path=self.path, fingerprint='bbb', stdout=out)
+        self.assertIn('seq scans: invoices', out.getvalue())
+        self.assertIn('["acc001"]', out.getvalue())
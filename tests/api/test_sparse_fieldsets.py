@@ -0,0 +1,145 @@
+"""
+Tests for sparse fieldsets (?fields=) on list serializers and endpoints
+"""
+from datetime import datetime, timezone
+
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework import serializers, status
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+
+from apps.accounts.models import Account
+from apps.accounts.serializers import ACCOUNT_LIST_COMPILED, AccountListSerializer
+from apps.campaigns.models import Campaign, Task
+from apps.cases.serializers import CASE_LIST_COMPILED, CaseListSerializer
+from apps.users.models import User
+from core.api.serializers import requested_fields
+
+from .test_compiled_serializers import account_sample, case_sample
+
+factory = APIRequestFactory()
+
+
+def _request(**params):
+    return Request(factory.get('/', params))
+
+
+def _project_row(compiled, projection, row):
+    """Row of ``compiled`` reduced to the columns of ``projection``."""
+    values = dict(zip(compiled.columns, row))
+    return tuple(values[column] for column in projection.columns)
+
+
+class SparseFieldsetTestCase(SimpleTestCase):
+    """requested_fields, SparseFieldsetMixin and CompiledSerializer.project"""
+
+    def test_requested_fields_in_declaration_order(self):
+        fields = requested_fields(_request(fields='status, id,title'), CaseListSerializer)
+        self.assertEqual(fields, ('id', 'title', 'status'))
+
+    def test_requested_fields_absent_or_blank_means_all(self):
+        self.assertIsNone(requested_fields(_request(), CaseListSerializer))
+        self.assertIsNone(requested_fields(_request(fields=' , '), CaseListSerializer))
+
+    def test_unknown_field_is_rejected(self):
+        with self.assertRaises(serializers.ValidationError) as ctx:
+            requested_fields(_request(fields='id,secret'), AccountListSerializer)
+        self.assertIn('fields', ctx.exception.detail)
+
+    def test_mixin_and_projection_produce_same_items(self):
+        fields = ('id', 'title', 'opened_at')
+        projection = CASE_LIST_COMPILED.project(fields)
+        instance, row = case_sample(1)
+        expected = CaseListSerializer(instance, fields=fields).data
+        item = projection.to_item(_project_row(CASE_LIST_COMPILED, projection, row))
+        self.assertEqual(list(item.items()), list(expected.items()))
+        self.assertEqual(projection.columns, ('cs_sf_id', 'cs_subject', 'cs_sf_created_date'))
+
+    def test_mixin_reads_fields_from_context(self):
+        instance, _ = account_sample(1)
+        data = AccountListSerializer(instance, context={'fields': ('name',)}).data
+        self.assertEqual(dict(data), {'name': 'Account 1'})
+
+    def test_projection_is_cached_and_none_is_full(self):
+        self.assertIs(ACCOUNT_LIST_COMPILED.project(None), ACCOUNT_LIST_COMPILED)
+        self.assertIs(
+            ACCOUNT_LIST_COMPILED.project(('id', 'name')),
+            ACCOUNT_LIST_COMPILED.project(('name', 'id')),
+        )
+
+
+def _dt(y, m, d):
+    return datetime(y, m, d, tzinfo=timezone.utc)
+
+
+class SparseFieldsetAPITests(TestCase):
+    """?fields= on account, case and campaign lists"""
+
+    def setUp(self):
+        self.client = APIClient()
+        user = User.objects.create(
+            usr_sf_id='usr001', usr_username='testuser', usr_email='test@example.com',
+            usr_last_name='User', usr_name='Test User', usr_is_active=True,
+            usr_time_zone='UTC', usr_language='en', usr_sf_created_date=_dt(2020, 1, 1),
+            usr_last_modified_date=_dt(2020, 1, 1), usr_last_modified_by_id='usr001',
+        )
+        self.account = Account.objects.create(
+            acc_sf_id='acc001', acc_name='Test Account', acc_owner_id=user,
+            acc_credit_limit=100, acc_last_modified_date=_dt(2020, 1, 1),
+            acc_last_modified_by_id='usr001',
+        )
+        campaign = Campaign.objects.create(
+            cmp_sf_id='cmp001', cmp_name='Campaign', cmp_status='Planned',
+            cmp_account_id=self.account, cmp_owner_id=user, cmp_active=1,
+            cmp_sf_created_date=_dt(2020, 1, 1),
+            cmp_last_modified_date=_dt(2020, 1, 1), cmp_last_modified_by_id='usr001',
+        )
+        Task.objects.create(
+            tsk_sf_id='tsk001', tsk_subject='Task', tsk_status='Open',
+            tsk_what_id=campaign.cmp_sf_id, tsk_owner_id=user, tsk_active=1,
+            tsk_sf_created_date=_dt(2020, 1, 1),
+            tsk_last_modified_date=_dt(2020, 1, 1), tsk_last_modified_by_id='usr001',
+        )
+
+    def test_account_list_selects_requested_columns(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/accounts/', {'fields': 'id,name'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['data'], [{'id': 'acc001', 'name': 'Test Account'}])
+        sql = ' '.join(q['sql'] for q in queries.captured_queries)
+        self.assertNotIn('acc_credit_limit', sql)
+
+    def test_account_list_invalid_field_is_422(self):
+        response = self.client.get('/api/accounts/', {'fields': 'id,password'})
+        self.assertEqual(response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+        self.assertEqual(response.json()['errors'][0]['field'], 'fields')
+
+    def test_case_list_drops_count_subqueries(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/complaints-cases/', {'fields': 'id,status'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        sql = ' '.join(q['sql'] for q in queries.captured_queries)
+        self.assertNotIn('case_comments', sql)
+
+    def test_campaign_list_skips_task_queries(self):
+        params = {'account_id': 'acc001'}
+        with CaptureQueriesContext(connection) as full:
+            self.client.get('/api/campaigns/', params)
+        with CaptureQueriesContext(connection) as sparse:
+            response = self.client.get('/api/campaigns/', dict(params, fields='id,name,status'))
+        self.assertEqual(
+            response.json()['data'],
+            [{'id': 'cmp001', 'name': 'Campaign', 'status': 'Planned'}],
+        )
+        self.assertEqual(len(sparse), len(full) - 2)
+
+    def test_campaign_list_task_counts_only(self):
+        response = self.client.get(
+            '/api/campaigns/', {'account_id': 'acc001', 'fields': 'id,task_counts'}
+        )
+        self.assertEqual(
+            response.json()['data'],
+            [{'id': 'cmp001', 'task_counts': {'total': 1, 'by_status': {'Open': 1}}}],
+        )
@@ -0,0 +1,63 @@
+"""
+Tests for the synthetic data generator
+"""
+from datetime import date
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+
+from apps.accounts.models import Account
+from apps.products.models import InvoiceLineItem
+from core.services.synthetic_data import SyntheticDataGenerator, clear_synthetic_data
+
+UNTIL = date(2025, 6, 30)
+
+
+class SyntheticDataGeneratorTestCase(SimpleTestCase):
+
+    def _rows(self, generator):
+        """All rows of every table without touching the database."""
+        return {model._meta.db_table: list(rows()) for model, rows in generator.tables()}
+
+    def test_same_seed_same_rows(self):
+        first = self._rows(SyntheticDataGenerator(scale=0.01, seed=7, until=UNTIL))
+        second = self._rows(SyntheticDataGenerator(scale=0.01, seed=7, until=UNTIL))
+        self.assertEqual(first['invoice_line_items'], second['invoice_line_items'])
+        other = self._rows(SyntheticDataGenerator(scale=0.01, seed=8, until=UNTIL))
+        self.assertNotEqual(first['invoices'], other['invoices'])
+
+    def test_scale_and_factors(self):
+        generator = SyntheticDataGenerator(scale=2, factors={'invoices': 3})
+        self.assertEqual(generator.volume('accounts'), 2000)
+        self.assertEqual(generator.volume('invoices'), 72)
+        with self.assertRaises(ValueError):
+            SyntheticDataGenerator(factors={'nope': 2})
+
+    def test_history_ends_at_until(self):
+        rows = self._rows(SyntheticDataGenerator(scale=0.01, until=UNTIL))
+        self.assertLessEqual(max(row['inv_invoice_date'] for row in rows['invoices']), UNTIL)
+
+    def test_load_time_is_not_in_the_future(self):
+        rows = self._rows(SyntheticDataGenerator(scale=0.01))
+        self.assertLessEqual(max(row['cs_updated_at'] for row in rows['cases']), timezone.now())
+        self.assertTrue(all(row['cs_last_modified_date'] >= row['cs_sf_created_date'] for row in rows['cases']))
+
+
+class SyntheticDataLoadTestCase(TestCase):
+
+    def test_load_and_clear(self):
+        counts = SyntheticDataGenerator(scale=0.01, seed=1, until=UNTIL).load()
+        self.assertEqual(Account.objects.count(), counts['accounts'])
+        self.assertEqual(InvoiceLineItem.objects.count(), counts['invoice_line_items'])
+        self.assertTrue(Account.objects.filter(acc_sf_id__startswith='001SYN').exists())
+
+        deleted = clear_synthetic_data()
+        self.assertEqual(deleted['invoice_line_items'], counts['invoice_line_items'])
+        self.assertFalse(Account.objects.exists())
+
+    @override_settings(DEBUG=False)
+    def test_command_refuses_without_debug(self):
+        with self.assertRaisesMessage(Exception, '--force'):
+            call_command('generate_synthetic_data', stdout=StringIO())
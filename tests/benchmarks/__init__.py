@@ -0,0 +1 @@
+# Benchmarks module (run explicitly, not part of the test suite)
@@ -0,0 +1,232 @@
+"""
+Endpoint benchmark: p50/p95 latency and query count of every GET API view
+
+Runs the views in-process through the full middleware stack with Django's
+test client, against the configured database. Load it first with
+``manage.py generate_synthetic_data`` (request parameters are picked from
+that data: the busiest account, its top product, latest order, ...).
+
+Results are written as JSON; pass an earlier file to --compare to see the
+change per endpoint, e.g. before and after an index or query change.
+
+Usage:
+    python manage.py generate_synthetic_data --scale 1 --seed 1
+    python -m tests.benchmarks.bench_endpoints [--repeat 20] [--output FILE]
+    python -m tests.benchmarks.bench_endpoints --compare tests/benchmarks/baselines/endpoints.json [--fail-over 25]
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import date, datetime, timezone
+
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+django.setup()
+
+from django.db import connection  # noqa: E402
+from django.db.models import Count, Max  # noqa: E402
+from django.test import Client  # noqa: E402
+from django.test.utils import override_settings, setup_test_environment  # noqa: E402
+
+from apps.accounts.models import Account  # noqa: E402
+from apps.campaigns.models import Task  # noqa: E402
+from apps.cases.models import CaseComment  # noqa: E402
+from apps.products.models import Invoice, InvoiceLineItem, OrderLineItem, Product  # noqa: E402
+from core.middleware.query_budget_middleware import QUERY_COUNT_HEADER  # noqa: E402
+
+DEFAULT_OUTPUT = os.path.join(os.path.dirname(__file__), 'baselines', 'endpoints.json')
+
+
+def _busiest(queryset, column):
+    row = queryset.values(column).annotate(n=Count('*')).order_by('-n', column).first()
+    return row[column] if row else None
+
+
+def _fixtures():
+    """Ids and periods the requests use, picked from the loaded data."""
+    account_id = _busiest(Invoice.objects.filter(inv_active=1), 'inv_account_id')
+    if account_id is None:
+        sys.exit('No invoices found; run "manage.py generate_synthetic_data" first')
+    account = Account.objects.get(acc_sf_id=account_id)
+    product_id = _busiest(
+        InvoiceLineItem.objects.filter(ili_invoice_id__inv_account_id=account_id), 'ili_product_id'
+    )
+    latest = Invoice.objects.filter(inv_account_id=account_id).aggregate(d=Max('inv_invoice_date'))['d']
+    since = date(latest.year - 1, 1, 1)
+    order_id = _busiest(
+        OrderLineItem.objects.filter(
+            ori_order_id__ord_account_id=account_id,
+            ori_order_id__ord_effective_date__range=(since, latest),
+            ori_order_id__ord_active=1,
+            ori_active=1,
+            ori_product_id__prd_active=1,
+        ),
+        'ori_order_id',
+    )
+    return {
+        'account_id': account_id,
+        'user_id': account.acc_owner_id_id,
+        'product_id': product_id,
+        'family': Product.objects.get(prd_sf_id=product_id).prd_family,
+        'order_id': order_id,
+        'case_id': _busiest(CaseComment.objects.all(), 'cc_case_id'),
+        'campaign_id': _busiest(Task.objects.all(), 'tsk_what_id'),
+        'year': latest.year,
+        'from': since.strftime('%Y-%m'),
+        'to': f'{latest.year}-{latest.month:02d}',
+    }
+
+
+def _endpoints(f):
+    """(name, path, params) of every GET endpoint; POST /api/products/update-rfc/ is left out."""
+    period = {'from': f['from'], 'to': f['to']}
+    sales = {'accountId': f['account_id'], **period}
+    case = f'/api/complaints-cases/{f["case_id"]}'
+    return [
+        ('health', '/api/health/', {}),
+        ('users.list', '/api/users/', {'page': 1}),
+        ('users.list.cursor', '/api/users/', {'cursor': ''}),
+        ('accounts.list', '/api/accounts/', {'page': 1}),
+        ('accounts.list.cursor', '/api/accounts/', {'cursor': ''}),
+        ('accounts.by_user', f'/api/accounts/user/{f["user_id"]}/', {'page': 1}),
+        ('accounts.by_user.territory', f'/api/accounts/user/{f["user_id"]}/', {'page': 1, 'scope': 'territory'}),
+        ('accounts.overview', f'/api/accounts/{f["account_id"]}/overview/', {'year': f['year'], **period}),
+        ('cases.summary', '/api/complaints-cases/summary/', {'account_id': f['account_id']}),
+        ('cases.list', '/api/complaints-cases/', {'page': 1}),
+        ('cases.list.account', '/api/complaints-cases/', {'account_id': f['account_id'], 'status': 'all'}),
+        ('cases.list.cursor', '/api/complaints-cases/', {'cursor': ''}),
+        ('cases.search', '/api/complaints-cases/search/', {'q': 'delivery'}),
+        ('cases.detail', f'{case}/', {}),
+        ('cases.comments', f'{case}/comments/', {}),
+        ('cases.timeline', f'{case}/timeline/', {}),
+        ('cases.bundle', f'{case}/bundle/', {}),
+        ('campaigns.list', '/api/campaigns/', {'account_id': f['account_id']}),
+        ('campaigns.tasks', '/api/campaigns/tasks/', {'campaign_id': f['campaign_id']}),
+        ('campaigns.hierarchy', '/api/campaigns/hierarchy/', {'account_id': f['account_id']}),
+        ('products.achieved', '/api/products/performance/achieved/', {'account_id': f['account_id'], 'year': f['year']}),
+        ('products.deviation', '/api/products/performance/deviation/', {'account_id': f['account_id'], **period}),
+        ('products.rfc_by_month', '/api/products/rfc-by-month/', {
+            'account_id': f['account_id'], 'product_ids': f['product_id'], **period,
+        }),
+        ('sales.family', '/api/sales/family/', sales),
+        ('sales.product', '/api/sales/product/', {**sales, 'family': f['family']}),
+        ('sales.orders', '/api/sales/orders/', {**sales, 'productId': f['product_id']}),
+        ('sales.order_details', '/api/sales/order-details/', {**sales, 'orderId': f['order_id']}),
+    ]
+
+
+def _percentile(samples, percent):
+    if len(samples) < 2:
+        return samples[0]
+    return statistics.quantiles(samples, n=100, method='inclusive')[percent - 1]
+
+
+def _measure(client, path, params, repeat, warmup):
+    for _ in range(warmup):
+        client.get(path, params)
+    timings, queries, status = [], 0, None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        response = client.get(path, params)
+        timings.append((time.perf_counter() - started) * 1000)
+        status = response.status_code
+        queries = max(queries, int(response.get(QUERY_COUNT_HEADER, 0)))
+    return {
+        'status': status,
+        'p50_ms': round(statistics.median(timings), 2),
+        'p95_ms': round(_percentile(timings, 95), 2),
+        'queries': queries,
+    }
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _compare(results, baseline_path, fail_over):
+    """Print changes against an earlier run; True when a regression exceeds fail_over percent."""
+    with open(baseline_path) as fh:
+        baseline = json.load(fh)
+    print(f'\nCompared with {baseline.get("commit")} ({baseline_path})')
+    print(f'{"endpoint":<28} {"p50 ms":>18} {"change":>8} {"p95 ms":>18} {"queries":>9}')
+    failed = False
+    for name, now in results['endpoints'].items():
+        before = baseline['endpoints'].get(name)
+        if before is None:
+            print(f'{name:<28} {"new":>18}')
+            continue
+        change = (now['p50_ms'] - before['p50_ms']) / before['p50_ms'] * 100 if before['p50_ms'] else 0.0
+        flag = ''
+        if fail_over is not None and (change > fail_over or now['queries'] > before['queries']):
+            flag, failed = '  <-- regression', True
+        print(
+            f'{name:<28} {before["p50_ms"]:>8.2f} -> {now["p50_ms"]:>7.2f} {change:>+7.1f}% '
+            f'{before["p95_ms"]:>8.2f} -> {now["p95_ms"]:>7.2f} '
+            f'{before["queries"]:>3} -> {now["queries"]:<3}{flag}'
+        )
+    return failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=20, help='Timed requests per endpoint')
+    parser.add_argument('--warmup', type=int, default=2, help='Untimed requests per endpoint first')
+    parser.add_argument('--only', help='Run endpoints whose name starts with this prefix')
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help='Where to write the results')
+    parser.add_argument('--compare', help='Earlier results file to compare against')
+    parser.add_argument(
+        '--fail-over',
+        type=float,
+        help='With --compare: exit 1 if a p50 grew by more than this percent or queries grew',
+    )
+    args = parser.parse_args()
+
+    setup_test_environment()
+    client = Client()
+    fixtures = _fixtures()
+    results = {
+        'commit': _git_commit(),
+        'created_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'machine': f'{platform.platform()} / Python {platform.python_version()}',
+        'database': connection.settings_dict['NAME'],
+        'invoice_line_items': InvoiceLineItem.objects.count(),
+        'repeat': args.repeat,
+        'fixtures': {key: str(value) for key, value in fixtures.items()},
+        'endpoints': {},
+    }
+
+    print(f'{"endpoint":<28} {"status":>6} {"p50 ms":>9} {"p95 ms":>9} {"queries":>8}')
+    with override_settings(QUERY_BUDGET_HEADERS=True):
+        for name, path, params in _endpoints(fixtures):
+            if args.only and not name.startswith(args.only):
+                continue
+            result = _measure(client, path, params, args.repeat, args.warmup)
+            results['endpoints'][name] = dict(result, path=path, params=params)
+            print(
+                f'{name:<28} {result["status"]:>6} {result["p50_ms"]:>9.2f} '
+                f'{result["p95_ms"]:>9.2f} {result["queries"]:>8}'
+            )
+
+    failed = args.compare and _compare(results, args.compare, args.fail_over)
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, 'w') as fh:
+            json.dump(results, fh, indent=2, default=str)
+            fh.write('\n')
+        print(f'\nResults written to {args.output}')
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""
+Micro-benchmark: DRF JSONRenderer vs FastJSONRenderer
+
+Renders the largest response envelopes the API produces (unpaginated case
+and account lists, campaigns with embedded tasks, raw analytics rows with
+Decimal/date values) and reports throughput of both renderers.
+
+Usage:
+    python -m tests.benchmarks.bench_renderer [--rows 10000] [--repeat 5]
+"""
+import argparse
+import os
+import timeit
+from datetime import date, timedelta
+from decimal import Decimal
+
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+django.setup()
+
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+
+from apps.accounts.serializers import ACCOUNT_LIST_COMPILED  # noqa: E402
+from apps.campaigns.serializers import CAMPAIGN_WITH_TASKS_COMPILED, TASK_LIST_COMPILED  # noqa: E402
+from apps.cases.serializers import CASE_LIST_COMPILED  # noqa: E402
+from core.api.renderers import FastJSONRenderer  # noqa: E402
+from core.api.responses import APIResponse  # noqa: E402
+from tests.api.test_compiled_serializers import (  # noqa: E402
+    account_sample,
+    campaign_sample,
+    case_sample,
+    task_sample,
+)
+
+TASKS_PER_CAMPAIGN = 10
+
+
+def _envelope(items):
+    return APIResponse.success(data=items, message='Data retrieved successfully').data
+
+
+def _payloads(rows):
+    tasks = [TASK_LIST_COMPILED.to_item(row) for _, row in (task_sample(i) for i in range(TASKS_PER_CAMPAIGN))]
+    counts = {'total': TASKS_PER_CAMPAIGN, 'by_status': {'Open': TASKS_PER_CAMPAIGN}}
+    analytics = [
+        {
+            'productId': f'prd{i:06d}',
+            'month': date(2024, 1, 1) + timedelta(days=31 * (i % 12)),
+            'actualSales': Decimal('12345.67') + i,
+            'openSales': Decimal('890.12'),
+            'rfc': Decimal('15000.00'),
+            'deviationPercent': Decimal('-17.70'),
+        }
+        for i in range(rows)
+    ]
+    return {
+        'cases': _envelope(CASE_LIST_COMPILED.serialize(row for _, row in (case_sample(i) for i in range(rows)))),
+        'accounts': _envelope(ACCOUNT_LIST_COMPILED.serialize(row for _, row in (account_sample(i) for i in range(rows)))),
+        'campaigns+tasks': _envelope([
+            CAMPAIGN_WITH_TASKS_COMPILED.to_item(row, tasks, counts)
+            for _, row in (campaign_sample(i) for i in range(rows // TASKS_PER_CAMPAIGN))
+        ]),
+        'analytics (Decimal/date)': _envelope(analytics),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    renderers = {'JSONRenderer': JSONRenderer(), 'FastJSONRenderer': FastJSONRenderer()}
+    print(f'{"payload":<26} {"MB":>6} {"JSONRenderer":>14} {"FastJSONRenderer":>18} {"speedup":>8}')
+    for name, payload in _payloads(args.rows).items():
+        size_mb = len(renderers['JSONRenderer'].render(payload)) / 1e6
+        timings = {
+            key: min(timeit.repeat(lambda: renderer.render(payload), number=1, repeat=args.repeat))
+            for key, renderer in renderers.items()
+        }
+        slow, fast = timings['JSONRenderer'], timings['FastJSONRenderer']
+        print(
+            f'{name:<26} {size_mb:>6.2f} {size_mb / slow:>9.0f} MB/s {size_mb / fast:>13.0f} MB/s '
+            f'{slow / fast:>7.1f}x'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+"""
+Micro-benchmark: DRF list serializers vs their compiled fast path
+
+Measures serialization CPU only (rows are built in memory, no database):
+``Serializer(instances, many=True).data`` against
+``CompiledSerializer.serialize(values_list rows)``.
+
+Usage:
+    python -m tests.benchmarks.bench_serializers [--rows 5000] [--repeat 5]
+"""
+import argparse
+import os
+import timeit
+
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+django.setup()
+
+from apps.accounts.serializers import ACCOUNT_LIST_COMPILED, AccountListSerializer  # noqa: E402
+from apps.campaigns.serializers import (  # noqa: E402
+    CAMPAIGN_WITH_TASKS_COMPILED,
+    TASK_LIST_COMPILED,
+    CampaignWithTasksSerializer,
+    TaskListSerializer,
+)
+from apps.cases.serializers import CASE_LIST_COMPILED, CaseListSerializer  # noqa: E402
+from apps.users.serializers import USER_LIST_COMPILED, UserListSerializer  # noqa: E402
+from tests.api.test_compiled_serializers import (  # noqa: E402
+    account_sample,
+    campaign_sample,
+    case_sample,
+    task_sample,
+    user_sample,
+)
+
+# Tasks embedded per campaign in the campaign benchmark
+TASKS_PER_CAMPAIGN = 5
+
+
+def _campaign_cases(count):
+    """(drf callable, compiled callable) for campaigns with embedded tasks."""
+    campaigns = [campaign_sample(i) for i in range(count)]
+    tasks = [task_sample(i) for i in range(TASKS_PER_CAMPAIGN)]
+    counts = {'total': TASKS_PER_CAMPAIGN, 'by_status': {'Open': TASKS_PER_CAMPAIGN}}
+    instances = [instance for instance, _ in campaigns]
+    context = {
+        'tasks_by_campaign': {c.cmp_sf_id: [t for t, _ in tasks] for c in instances},
+        'task_counts': {c.cmp_sf_id: counts for c in instances},
+    }
+    task_rows = [row for _, row in tasks]
+
+    def drf():
+        return CampaignWithTasksSerializer(instances, many=True, context=context).data
+
+    def compiled():
+        to_item = CAMPAIGN_WITH_TASKS_COMPILED.to_item
+        return [
+            to_item(row, TASK_LIST_COMPILED.serialize(task_rows), counts)
+            for _, row in campaigns
+        ]
+
+    return drf, compiled
+
+
+def _list_cases(serializer_class, compiled, sample, count):
+    samples = [sample(i) for i in range(count)]
+    instances = [instance for instance, _ in samples]
+    rows = [row for _, row in samples]
+    return (
+        lambda: serializer_class(instances, many=True).data,
+        lambda: compiled.serialize(rows),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    cases = {
+        'AccountListSerializer': _list_cases(
+            AccountListSerializer, ACCOUNT_LIST_COMPILED, account_sample, args.rows),
+        'CaseListSerializer': _list_cases(
+            CaseListSerializer, CASE_LIST_COMPILED, case_sample, args.rows),
+        'TaskListSerializer': _list_cases(
+            TaskListSerializer, TASK_LIST_COMPILED, task_sample, args.rows),
+        'UserListSerializer': _list_cases(
+            UserListSerializer, USER_LIST_COMPILED, user_sample, args.rows),
+        'CampaignWithTasksSerializer': _campaign_cases(args.rows // TASKS_PER_CAMPAIGN),
+    }
+
+    print(f'{"serializer":<30} {"rows":>6} {"drf ms":>9} {"compiled ms":>12} {"speedup":>8}')
+    for name, (drf, compiled) in cases.items():
+        drf_ms = min(timeit.repeat(drf, number=1, repeat=args.repeat)) * 1000
+        compiled_ms = min(timeit.repeat(compiled, number=1, repeat=args.repeat)) * 1000
+        rows = args.rows // TASKS_PER_CAMPAIGN if name.startswith('Campaign') else args.rows
+        print(
+            f'{name:<30} {rows:>6} {drf_ms:>9.1f} {compiled_ms:>12.1f} '
+            f'{drf_ms / compiled_ms:>7.1f}x'
+        )
+
+
+if __name__ == '__main__':
+    main()